@@ -0,0 +1,103 @@
+"""Command-line entry points.
+
+Usage:
+    python -m app.cli generate --urls urls.txt [--checkpoint bulk.jsonl]
+    python -m app.cli generate --category-file category.json [--language en]
+
+``generate`` pre-seeds quizzes for many articles through the bulk pipeline
+(see ``app.services.bulk_service``). Articles that already have a quiz are
+skipped, and rerunning with the same ``--checkpoint`` resumes an interrupted
+run; URLs that failed are retried.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+from app.services.bulk_service import (
+    BulkGenerator,
+    BulkOptions,
+    Checkpoint,
+    read_category_file,
+    read_url_file,
+)
+from app.services.http_client import close_http_client
+
+
+async def _generate(urls: List[str], options: BulkOptions, checkpoint: Checkpoint) -> Dict[str, int]:
+    try:
+        return dict(await BulkGenerator(options, checkpoint).run(urls))
+    finally:
+        await close_http_client()
+
+
+def generate(args: argparse.Namespace) -> int:
+    urls: List[str] = []
+    for path in args.urls or []:
+        urls.extend(read_url_file(path))
+    for path in args.category_file or []:
+        urls.extend(read_category_file(path, language=args.language))
+    if not urls:
+        print("No URLs to generate.")
+        return 1
+
+    options = BulkOptions(
+        fetch_concurrency=args.fetch_concurrency,
+        fetch_rate=args.fetch_rate,
+        extract_workers=args.extract_workers,
+        llm_concurrency=args.llm_concurrency,
+        batch_size=args.batch_size,
+        flush_seconds=args.flush_seconds,
+    )
+    counts = asyncio.run(_generate(urls, options, Checkpoint(args.checkpoint)))
+    print(", ".join(f"{status}: {count}" for status, count in sorted(counts.items())))
+    return 1 if counts.get("failed") else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    defaults = BulkOptions()
+    bulk = commands.add_parser("generate", help="generate quizzes for many articles")
+    bulk.add_argument("--urls", type=Path, action="append", help="file with one article URL per line")
+    bulk.add_argument(
+        "--category-file",
+        type=Path,
+        action="append",
+        help="saved category members (API JSON or one title per line)",
+    )
+    bulk.add_argument("--language", default="en", help="Wikipedia edition of category titles")
+    bulk.add_argument("--checkpoint", type=Path, help="JSON Lines file recording finished URLs")
+    bulk.add_argument("--fetch-concurrency", type=int, default=defaults.fetch_concurrency)
+    bulk.add_argument(
+        "--fetch-rate",
+        type=float,
+        default=defaults.fetch_rate,
+        help="Wikipedia requests per second (0 for no limit)",
+    )
+    bulk.add_argument(
+        "--extract-workers",
+        type=int,
+        default=defaults.extract_workers,
+        help="threads extracting entities",
+    )
+    bulk.add_argument("--llm-concurrency", type=int, default=defaults.llm_concurrency)
+    bulk.add_argument("--batch-size", type=int, default=defaults.batch_size)
+    bulk.add_argument(
+        "--flush-seconds",
+        type=float,
+        default=defaults.flush_seconds,
+        help="write a partial batch after this long without new results",
+    )
+    bulk.set_defaults(handler=generate)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
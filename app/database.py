@@ -1,56 +1,72 @@
+import time
 from contextlib import contextmanager
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from .config import get_settings
+from .services.metrics import DB_POOL_WAIT_SECONDS
 
 
 settings = get_settings()
 
-engine = create_engine(settings.DATABASE_URL, echo=False, future=True)
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, expire_on_commit=False)
 
-Base = declarative_base()
+class _TimedPoolMixin:
+    """Records how long each pool checkout waited for a connection."""
 
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT_SECONDS.observe(time.perf_counter() - started)
 
-def get_db() -> Generator[Session, None, None]:
-    """FastAPI dependency that yields a SQLAlchemy session."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
 
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
 
-@contextmanager
-def db_session() -> Generator[Session, None, None]:
-    """Context manager for non-FastAPI usage."""
-    session = SessionLocal()
-    try:
-        yield session
-        session.commit()
-    except Exception:
-        session.rollback()
-        raise
-    finally:
-        session.close()
 
-from contextlib import contextmanager
-from typing import Generator
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker, Session
 
-from .config import get_settings
+def _async_database_url() -> str:
+    """``ASYNC_DATABASE_URL``, or ``DATABASE_URL`` with the asyncpg driver."""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    if url.get_backend_name() == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
 
 
-settings = get_settings()
+def _pool_options(poolclass) -> dict:
+    if settings.DATABASE_URL.startswith("sqlite"):
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
 
-engine = create_engine(settings.DATABASE_URL, echo=False, future=True)
+
+engine = create_engine(settings.DATABASE_URL, echo=False, future=True, **_pool_options(TimedQueuePool))
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, expire_on_commit=False)
 
+# Request-path reads run on the event loop through asyncpg instead of
+# occupying a threadpool thread each.
+async_engine = create_async_engine(
+    _async_database_url(), echo=False, **_pool_options(TimedAsyncQueuePool)
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
@@ -63,6 +79,12 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency that yields an async SQLAlchemy session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 @contextmanager
 def db_session() -> Generator[Session, None, None]:
     """Context manager for non-FastAPI usage."""
@@ -75,4 +97,3 @@ def db_session() -> Generator[Session, None, None]:
         raise
     finally:
         session.close()
-
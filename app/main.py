@@ -1,10 +1,21 @@
-from fastapi import FastAPI
+import logging
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.config import get_settings
-from app.database import Base, engine
+from app.database import async_engine
 from app.routers.history_router import router as history_router
+from app.routers.job_router import router as job_router
 from app.routers.quiz_router import router as quiz_router
+from app.routers.search_router import router as search_router
+from app.services.http_client import close_http_client
+from app.services.job_service import start_job_workers, stop_job_workers
+from app.services.metrics import REQUEST_SECONDS, end_trace, render_metrics, start_trace
+
+logger = logging.getLogger(__name__)
 
 
 def create_app() -> FastAPI:
@@ -20,14 +31,49 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    @app.middleware("http")
+    async def record_request_timing(request: Request, call_next):
+        # Streaming responses are timed until their headers are sent.
+        trace, token = start_trace()
+        started = time.perf_counter()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            elapsed = time.perf_counter() - started
+            end_trace(token)
+            route = request.scope.get("route")
+            REQUEST_SECONDS.observe(
+                elapsed,
+                method=request.method,
+                route=getattr(route, "path", "unmatched"),
+                status=str(status_code),
+            )
+            if elapsed >= settings.SLOW_REQUEST_SECONDS:
+                logger.warning(
+                    "Slow request %s %s took %.3fs: %s",
+                    request.method,
+                    request.url.path,
+                    elapsed,
+                    trace.breakdown() or "no stages recorded",
+                )
+
     # Include routers
     app.include_router(quiz_router)
     app.include_router(history_router)
+    app.include_router(job_router)
+    app.include_router(search_router)
 
     @app.get("/health", tags=["health"])
     def health_check():
         return {"status": "ok"}
 
+    @app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+    def metrics():
+        return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
     return app
 
 
@@ -35,7 +81,12 @@ app = create_app()
 
 
 @app.on_event("startup")
-def on_startup() -> None:
-    # For this project we use simple metadata.create_all instead of Alembic migrations.
-    Base.metadata.create_all(bind=engine)
+async def start_workers() -> None:
+    await start_job_workers()
+
 
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await stop_job_workers()
+    await close_http_client()
+    await async_engine.dispose()
@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+
+from app.database import Base
+
+
+class ArticleAlias(Base):
+    """Maps every seen URL variant (mobile host, redirect title, ...) to its article."""
+
+    __tablename__ = "article_aliases"
+
+    id = Column(Integer, primary_key=True, index=True)
+    alias = Column(String(500), unique=True, nullable=False, index=True)
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,7 +1,19 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Integer, String, Text
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Computed,
+    DateTime,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    func,
+)
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred
 
 from app.database import Base
 
@@ -15,6 +27,35 @@ class Article(Base):
     summary = Column(Text, nullable=True)
     sections = Column(JSONB, nullable=True)
     entities = Column(JSONB, nullable=True)
-    raw_html = Column(Text, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # The scraped page is large and only needed for re-processing, so it is
+    # compressed (see services.html_store) and never loaded unless undeferred.
+    raw_html_compressed = deferred(Column(LargeBinary, nullable=True), raiseload=True)
+    raw_html_ref = deferred(Column(String(64), nullable=True), raiseload=True)
+    # MediaWiki revision and hash of summary/sections at the last scrape, and
+    # when the live revision was last compared against them.
+    revision_id = Column(BigInteger, nullable=True)
+    content_hash = Column(String(64), nullable=True)
+    checked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    # Full-text search document maintained by Postgres; title terms outrank summary terms.
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(summary, '')), 'B')",
+                persisted=True,
+            ),
+        ),
+        raiseload=True,
+    )
 
+    __table_args__ = (
+        # Serves case-insensitive "title starts with" filters in the history view.
+        Index(
+            "ix_articles_title_lower_prefix",
+            func.lower(title).label("title_lower"),
+            postgresql_ops={"title_lower": "text_pattern_ops"},
+        ),
+        Index("ix_articles_search_vector", search_vector, postgresql_using="gin"),
+    )
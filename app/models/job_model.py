@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+
+from app.database import Base
+
+
+class GenerationJob(Base):
+    """A queued quiz generation, claimed by workers with ``FOR UPDATE SKIP LOCKED``."""
+
+    __tablename__ = "generation_jobs"
+
+    id = Column(String(32), primary_key=True)
+    url = Column(String(500), nullable=False)
+    status = Column(String(20), nullable=False, default="queued")
+    stage = Column(String(40), nullable=True)
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="SET NULL"), nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    worker_id = Column(String(100), nullable=True)
+    # Set on jobs queued together through POST /generate-quiz/batch.
+    batch_id = Column(String(32), nullable=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (Index("ix_generation_jobs_status_created_at", "status", "created_at"),)
@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.database import Base
+
+
+class Question(Base):
+    """One generated question of an article, normalized out of ``Quiz.quiz_data``.
+
+    Questions asked in several quizzes of the same article are stored once
+    (keyed on a hash of their normalized text), so quizzes can be assembled
+    from the bank without calling the LLM.
+    """
+
+    __tablename__ = "questions"
+
+    id = Column(Integer, primary_key=True)
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), nullable=False)
+    # The quiz the question first appeared in.
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="SET NULL"), nullable=True, index=True)
+    difficulty = Column(String(16), nullable=False)
+    text_hash = Column(String(64), nullable=False)
+    question = Column(Text, nullable=False)
+    # Option texts, in order.
+    options = Column(JSONB, nullable=False)
+    correct_answer = Column(Text, nullable=False)
+    explanation = Column(Text, nullable=True)
+    # MinHash signature of the question and its answer, for near-duplicate
+    # detection (see app/services/dedup.py).
+    signature = Column(LargeBinary, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # Also serves the per-article bank lookups.
+        UniqueConstraint("article_id", "text_hash", name="uq_questions_article_text_hash"),
+    )
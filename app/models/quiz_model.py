@@ -1,6 +1,6 @@
-from sqlalchemy import Column, ForeignKey, Integer
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy import BigInteger, Column, Computed, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
 from app.database import Base
 
@@ -12,6 +12,23 @@ class Quiz(Base):
     article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), nullable=False, index=True)
     quiz_data = Column(JSONB, nullable=False)
     related_topics = Column(JSONB, nullable=True)
+    # The article revision/content this quiz was generated from.
+    revision_id = Column(BigInteger, nullable=True)
+    content_hash = Column(String(64), nullable=True)
+    # Full-text search document of the question texts, maintained by Postgres.
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('english', "
+                "jsonb_path_query_array(quiz_data, '$.questions[*].question')), 'C')",
+                persisted=True,
+            ),
+        ),
+        raiseload=True,
+    )
 
     article = relationship("Article", backref="quizzes")
 
+    __table_args__ = (Index("ix_quizzes_search_vector", search_vector, postgresql_using="gin"),)
+
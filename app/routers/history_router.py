@@ -1,20 +1,33 @@
-from typing import List
+from datetime import datetime
+from typing import Optional
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.schemas.quiz_schema import QuizSummary
+from app.database import get_async_db
+from app.schemas.quiz_schema import QuizPage
 from app.services.quiz_service import QuizService
 
 
 router = APIRouter(prefix="/quizzes", tags=["history"])
 
 
-@router.get("", response_model=List[QuizSummary])
-def list_quizzes(db: Session = Depends(get_db)):
-    """Return a list of all previous quizzes."""
-    service = QuizService(db)
-    items = service.list_quizzes()
-    return items
-
+@router.get("", response_model=QuizPage)
+async def list_quizzes(
+    after_id: Optional[int] = Query(None, ge=1, description="Cursor returned as next_cursor by the previous page."),
+    limit: int = Query(20, ge=1, le=100),
+    title_prefix: Optional[str] = Query(None, max_length=200),
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Return a page of previous quizzes, newest first."""
+    service = QuizService(async_db=db)
+    page = await service.alist_quizzes(
+        after_id=after_id,
+        limit=limit,
+        title_prefix=title_prefix,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    return page
@@ -0,0 +1,74 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database import get_async_db, get_db
+from app.schemas.job_schema import JobCreated, JobStatus
+from app.schemas.quiz_schema import GenerateQuizRequest
+from app.services.job_service import (
+    enqueue_job,
+    get_job,
+    job_events,
+    load_job_status,
+    notify_job_workers,
+)
+from app.services.quiz_service import QuizService
+from app.services.scraper_service import InvalidWikipediaURLError, normalize_article_url
+
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.post("", response_model=JobCreated, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(
+    payload: GenerateQuizRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    async_db: AsyncSession = Depends(get_async_db),
+):
+    """Queue quiz generation for a Wikipedia article URL and return immediately.
+
+    If the article already has a current quiz, no job is queued and the quiz
+    is returned inline with ``200``.
+    """
+    try:
+        url = normalize_article_url(str(payload.url))
+    except InvalidWikipediaURLError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+    quiz = await QuizService(db, async_db=async_db).get_current_quiz(url)
+    if quiz is not None:
+        response.status_code = status.HTTP_200_OK
+        return {"status": "succeeded", "quiz": quiz}
+    job = await asyncio.to_thread(enqueue_job, db, url)
+    notify_job_workers()
+    return {"job_id": job.id, "status": job.status}
+
+
+@router.get("/{job_id}", response_model=JobStatus)
+def get_job_status(
+    job_id: str,
+    db: Session = Depends(get_db),
+):
+    """Return the current status and stage of a generation job."""
+    job = get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """Stream stage-by-stage progress of a job as Server-Sent Events."""
+    if await asyncio.to_thread(load_job_status, job_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return StreamingResponse(
+        job_events(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
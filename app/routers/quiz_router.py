@@ -1,40 +1,165 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+import math
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.schemas.quiz_schema import GenerateQuizRequest, GenerateQuizResponse, QuizDetail
+from app.database import SessionLocal, get_async_db, get_db
+from app.schemas.job_schema import BatchCreated, BatchStatus
+from app.schemas.quiz_schema import (
+    AssembleQuizRequest,
+    BatchGenerateRequest,
+    GenerateQuizRequest,
+    GenerateQuizResponse,
+    QuizDetail,
+)
+from app.services.job_service import get_batch_status, submit_batch
 from app.services.quiz_service import QuizService
+from app.services.rate_limiter import RateLimitTimeout
+from app.services.response_cache import json_response
+from app.services.scraper_service import InvalidWikipediaURLError, normalize_article_url
+from app.services.singleflight import GenerationLockTimeout
 
 
 router = APIRouter(prefix="/generate-quiz", tags=["quiz"])
 
 
 @router.post("", response_model=GenerateQuizResponse)
-def generate_quiz(
+async def generate_quiz(
     payload: GenerateQuizRequest,
+    refresh: bool = Query(False, description="Re-check the article and regenerate if it changed."),
     db: Session = Depends(get_db),
+    async_db: AsyncSession = Depends(get_async_db),
 ):
     """Generate a quiz from a Wikipedia article URL."""
-    service = QuizService(db)
+    service = QuizService(db, async_db=async_db)
     try:
-        result = service.generate_quiz(payload)
+        result = await service.generate_quiz(payload, refresh=refresh)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         ) from e
+    except GenerationLockTimeout as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        ) from e
+    except RateLimitTimeout as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        ) from e
     return result
 
 
+@router.post("/assemble", response_model=GenerateQuizResponse)
+async def assemble_quiz(
+    payload: AssembleQuizRequest,
+    db: Session = Depends(get_db),
+    async_db: AsyncSession = Depends(get_async_db),
+):
+    """Build a new quiz for an article from its question bank."""
+    service = QuizService(db, async_db=async_db)
+    try:
+        result = await service.assemble_quiz(payload)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+    except GenerationLockTimeout as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        ) from e
+    except RateLimitTimeout as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        ) from e
+    return result
+
+
+@router.post("/stream")
+async def stream_quiz(
+    payload: GenerateQuizRequest,
+    refresh: bool = Query(False, description="Re-check the article and regenerate if it changed."),
+):
+    """Generate a quiz, streaming each question as NDJSON as soon as it is ready."""
+    try:
+        normalize_article_url(str(payload.url))
+    except InvalidWikipediaURLError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+
+    async def ndjson():
+        # The stream outlives the request's dependencies, so it owns its session.
+        db = SessionLocal()
+        try:
+            async for event in QuizService(db).stream_quiz(payload, refresh=refresh):
+                yield json.dumps(jsonable_encoder(event)) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        ndjson(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/batch", response_model=BatchCreated, status_code=status.HTTP_202_ACCEPTED)
+async def generate_quiz_batch(
+    payload: BatchGenerateRequest,
+    db: Session = Depends(get_db),
+):
+    """Queue generation for many article URLs, skipping articles that already have a quiz.
+
+    Each URL becomes a background job (see ``/jobs``), generated through
+    the bulk pipeline; track the batch with ``GET /generate-quiz/batch/{batch_id}``.
+    """
+    urls, invalid = {}, []
+    for raw_url in payload.urls:
+        try:
+            urls.setdefault(normalize_article_url(raw_url))
+        except InvalidWikipediaURLError:
+            invalid.append(raw_url)
+    result = await submit_batch(db, list(urls))
+    return {**result, "invalid": invalid}
+
+
+@router.get("/batch/{batch_id}", response_model=BatchStatus)
+def get_quiz_batch(
+    batch_id: str,
+    db: Session = Depends(get_db),
+):
+    """Return job counts by status for a batch."""
+    batch = get_batch_status(db, batch_id)
+    if batch is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Batch not found")
+    return batch
+
+
 @router.get("/{quiz_id}", response_model=QuizDetail)
-def get_quiz(
+async def get_quiz(
     quiz_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    if_none_match: Optional[str] = Header(default=None),
 ):
-    """Fetch a single quiz by ID."""
-    service = QuizService(db)
-    result = service.get_quiz_by_id(quiz_id)
-    if not result:
+    """Fetch a single quiz by ID (supports ``If-None-Match``)."""
+    service = QuizService(async_db=db)
+    body = await service.aget_quiz_body(quiz_id)
+    if body is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Quiz not found")
-    return result
+    return json_response(body, if_none_match)
 
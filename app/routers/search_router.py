@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.schemas.quiz_schema import QuizSearchPage
+from app.services.quiz_service import QuizService
+
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+# Deeper pages cost a full ranking of every match; refine the query instead.
+MAX_SEARCH_OFFSET = 1000
+
+
+@router.get("", response_model=QuizSearchPage)
+async def search_quizzes(
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms (web search syntax)."),
+    offset: int = Query(0, ge=0, le=MAX_SEARCH_OFFSET, description="Returned as next_offset by the previous page."),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Return a page of existing quizzes matching ``q``, best match first."""
+    service = QuizService(async_db=db)
+    return await service.asearch_quizzes(q, offset=offset, limit=limit)
@@ -18,6 +18,8 @@ class ScrapedArticleContent(BaseModel):
     text: str
     raw_html: str
     entities: EntitySummary
+    revision_id: Optional[int] = None
+    content_hash: Optional[str] = None
 
 
 class ArticleBase(BaseModel):
@@ -30,6 +32,8 @@ class ArticleCreate(ArticleBase):
     sections: Optional[Dict[str, Any]] = None
     entities: Optional[Dict[str, Any]] = None
     raw_html: str
+    revision_id: Optional[int] = None
+    content_hash: Optional[str] = None
 
 
 class ArticleInDB(ArticleBase):
@@ -38,6 +42,9 @@ class ArticleInDB(ArticleBase):
     summary: Optional[str] = None
     sections: Optional[Dict[str, Any]] = None
     entities: Optional[Dict[str, Any]] = None
+    revision_id: Optional[int] = None
+    content_hash: Optional[str] = None
+    checked_at: Optional[datetime] = None
     created_at: datetime
 
     class Config:
@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.schemas.quiz_schema import GenerateQuizResponse
+
+
+class JobCreated(BaseModel):
+    # No job is queued when the quiz already exists; it is returned as ``quiz``.
+    job_id: Optional[str] = None
+    status: str
+    quiz: Optional[GenerateQuizResponse] = None
+
+
+class BatchCreated(BaseModel):
+    batch_id: Optional[str] = None
+    queued: int
+    skipped: List[str]
+    invalid: List[str]
+
+
+class BatchStatus(BaseModel):
+    batch_id: str
+    total: int
+    queued: int = 0
+    running: int = 0
+    succeeded: int = 0
+    failed: int = 0
+
+
+class JobStatus(BaseModel):
+    id: str
+    url: str
+    status: str
+    stage: Optional[str] = None
+    quiz_id: Optional[int] = None
+    error: Optional[str] = None
+    batch_id: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
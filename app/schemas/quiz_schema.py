@@ -1,7 +1,14 @@
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Annotated, Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl
+
+# Largest number of URLs accepted by one POST /generate-quiz/batch request.
+MAX_BATCH_URLS = 5000
+# Largest quiz POST /generate-quiz/assemble builds from the question bank.
+MAX_ASSEMBLED_QUESTIONS = 30
+
+Difficulty = Literal["easy", "medium", "hard"]
 
 
 class MCQOption(BaseModel):
@@ -24,7 +31,19 @@ class GenerateQuizRequest(BaseModel):
     url: HttpUrl
 
 
+class BatchGenerateRequest(BaseModel):
+    urls: List[str] = Field(min_length=1, max_length=MAX_BATCH_URLS)
+
+
+class AssembleQuizRequest(BaseModel):
+    url: HttpUrl
+    count: int = Field(10, ge=1, le=MAX_ASSEMBLED_QUESTIONS)
+    # Relative weights, e.g. {"easy": 2, "hard": 1}; empty splits evenly.
+    difficulty_mix: Dict[Difficulty, Annotated[float, Field(ge=0)]] = Field(default_factory=dict)
+
+
 class GenerateQuizResponse(BaseModel):
+    id: Optional[int] = None
     article: Dict[str, Any]
     quiz: QuizData
     related_topics: List[str]
@@ -38,6 +57,20 @@ class QuizSummary(BaseModel):
     created_at: datetime
 
 
+class QuizPage(BaseModel):
+    items: List[QuizSummary]
+    next_cursor: Optional[int] = None
+
+
+class QuizSearchResult(QuizSummary):
+    rank: float
+
+
+class QuizSearchPage(BaseModel):
+    items: List[QuizSearchResult]
+    next_offset: Optional[int] = None
+
+
 class QuizDetail(BaseModel):
     id: int
     article: Dict[str, Any]
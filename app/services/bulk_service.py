@@ -0,0 +1,337 @@
+"""Pipelined bulk generation for pre-seeding quizzes from URL lists or categories.
+
+Articles flow through bounded queues between stages: fetch (paced scrape),
+extract (entities, in threads), generate (LLM) and write (batched inserts),
+so fetching the next articles overlaps the LLM calls of earlier ones. Every
+finished URL is appended to a checkpoint file, and a rerun with the same
+checkpoint resumes where the last one stopped.
+"""
+import asyncio
+import json
+import logging
+from collections import Counter
+from pathlib import Path
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from app.database import SessionLocal
+from app.schemas.article_schema import ScrapedArticleContent
+from app.services.entity_extractor import extract_entities
+from app.services.llm_service import agenerate_quiz_and_topics
+from app.services.quiz_service import GeneratedQuiz, QuizService
+from app.services.scraper_service import (
+    InvalidWikipediaURLError,
+    normalize_article_url,
+    resolve_canonical_url,
+    scrape_wikipedia_article,
+    title_to_url,
+)
+
+logger = logging.getLogger(__name__)
+
+# Checkpoint statuses that are not retried on resume.
+FINISHED_STATUSES = {"done", "skipped"}
+
+
+# ---------------------------
+# Inputs
+# ---------------------------
+
+
+def read_url_file(path: Path) -> List[str]:
+    """One URL per line; blank lines and ``#`` comments are ignored."""
+    lines = path.read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.strip().startswith("#")]
+
+
+def _category_members(document: Any) -> Iterator[Dict[str, Any]]:
+    if isinstance(document, list):
+        for item in document:
+            yield from _category_members(item)
+    elif isinstance(document, dict):
+        if "query" in document:
+            yield from _category_members(document["query"].get("categorymembers", []))
+        elif "title" in document:
+            yield document
+
+
+def read_category_file(path: Path, language: str = "en") -> List[str]:
+    """Article URLs of the members of a category saved to ``path``.
+
+    Accepts MediaWiki API ``list=categorymembers`` responses (one JSON
+    document, or one per line for continued queries) or plain text with one
+    page title per line. Members outside the article namespace, such as
+    subcategories and files, are skipped.
+    """
+    text = path.read_text(encoding="utf-8")
+    try:
+        documents = [json.loads(text)]
+    except json.JSONDecodeError:
+        documents = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                document = json.loads(line)
+            except json.JSONDecodeError:
+                document = None
+            # A bare title can happen to be valid JSON (e.g. "1984").
+            documents.append(document if isinstance(document, (dict, list)) else {"title": line})
+
+    urls = []
+    for member in _category_members(documents):
+        if member.get("ns", 0) == 0 and str(member["title"]).strip():
+            urls.append(title_to_url(str(member["title"]), language))
+    return urls
+
+
+# ---------------------------
+# Checkpoint and pacing
+# ---------------------------
+
+
+class Checkpoint:
+    """Append-only JSON Lines record of the URLs a bulk run has finished with."""
+
+    def __init__(self, path: Optional[Path]) -> None:
+        self.path = path
+        self.finished: Set[str] = set()
+        if path is None or not path.exists():
+            return
+        for line in path.read_text(encoding="utf-8").splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line torn by an interrupted run
+            if entry.get("status") in FINISHED_STATUSES:
+                self.finished.add(entry["url"])
+
+    def record(self, url: str, status: str, **details: Any) -> None:
+        if self.path is None:
+            return
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps({"url": url, "status": status, **details}) + "\n")
+
+
+class _Pacer:
+    """Spaces calls out to at most ``rate`` per second (0 disables pacing)."""
+
+    def __init__(self, rate: float) -> None:
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self._interval:
+            return
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            delay = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# ---------------------------
+# Pipeline
+# ---------------------------
+
+
+class BulkOptions(NamedTuple):
+    fetch_concurrency: int = 4
+    # Wikipedia requests per second (redirect lookups and page fetches).
+    fetch_rate: float = 5.0
+    extract_workers: int = 2
+    llm_concurrency: int = 4
+    batch_size: int = 25
+    # Write a partial batch after this long without new results.
+    flush_seconds: float = 10.0
+
+
+class _Item(NamedTuple):
+    url: str
+    canonical_url: str
+    scraped: Optional[ScrapedArticleContent] = None
+    llm_result: Optional[Dict[str, Any]] = None
+
+
+def _cached_urls(urls: List[str]) -> Set[str]:
+    with SessionLocal() as db:
+        return QuizService(db).cached_urls(urls)
+
+
+def _persist_batch(items: List[GeneratedQuiz]) -> List[Dict[str, Any]]:
+    with SessionLocal() as db:
+        return QuizService(db).persist_batch(items)
+
+
+class BulkGenerator:
+    """Generates quizzes for many URLs through a staged worker pipeline."""
+
+    def __init__(self, options: BulkOptions, checkpoint: Checkpoint) -> None:
+        self.options = options
+        self.checkpoint = checkpoint
+        self.counts: Counter = Counter()
+        self._pacer = _Pacer(options.fetch_rate)
+        # Canonical URLs taken by an item of this run.
+        self._claimed: Set[str] = set()
+
+    async def run(self, urls: Iterable[str]) -> Counter:
+        """Process ``urls`` and return counts by outcome."""
+        pending = await self._pending(urls)
+        logger.info("%d articles to generate (%s)", len(pending), dict(self.counts))
+
+        stages: List[Tuple[Callable[[_Item], Awaitable[Optional[_Item]]], int]] = [
+            (self._fetch, self.options.fetch_concurrency),
+            (self._extract, self.options.extract_workers),
+            (self._generate, self.options.llm_concurrency),
+        ]
+        queues = [asyncio.Queue(maxsize=2 * max(workers, 1)) for _, workers in stages]
+        queues.append(asyncio.Queue(maxsize=2 * self.options.batch_size))
+
+        async def feed() -> None:
+            for item in pending:
+                await queues[0].put(item)
+            for _ in range(max(stages[0][1], 1)):
+                await queues[0].put(None)
+
+        tasks = [feed()]
+        for index, (handler, workers) in enumerate(stages):
+            downstream = stages[index + 1][1] if index + 1 < len(stages) else 1
+            tasks.append(self._run_stage(handler, workers, queues[index], queues[index + 1], downstream))
+        tasks.append(self._write(queues[-1]))
+        await asyncio.gather(*tasks)
+        return self.counts
+
+    async def _pending(self, urls: Iterable[str]) -> List[_Item]:
+        """Normalized, de-duplicated URLs that are neither checkpointed nor known."""
+        normalized: Dict[str, None] = {}
+        for raw_url in urls:
+            try:
+                url = normalize_article_url(raw_url)
+            except InvalidWikipediaURLError as exc:
+                self._finish(raw_url, "failed", error=str(exc))
+                continue
+            if url in self.checkpoint.finished:
+                self.counts["resumed"] += 1
+            else:
+                normalized.setdefault(url)
+
+        cached = await asyncio.to_thread(_cached_urls, list(normalized))
+        pending = []
+        for url in normalized:
+            if url in cached:
+                self._finish(url, "skipped")
+            else:
+                pending.append(_Item(url, url))
+        self._claimed.update(item.url for item in pending)
+        return pending
+
+    async def _run_stage(
+        self,
+        handler: Callable[[_Item], Awaitable[Optional[_Item]]],
+        workers: int,
+        inbox: asyncio.Queue,
+        outbox: asyncio.Queue,
+        downstream_workers: int,
+    ) -> None:
+        async def worker() -> None:
+            while (item := await inbox.get()) is not None:
+                try:
+                    result = await handler(item)
+                except Exception as exc:
+                    self._fail(item, exc)
+                    continue
+                if result is not None:
+                    await outbox.put(result)
+
+        await asyncio.gather(*(worker() for _ in range(max(workers, 1))))
+        for _ in range(max(downstream_workers, 1)):
+            await outbox.put(None)
+
+    async def _fetch(self, item: _Item) -> Optional[_Item]:
+        await self._pacer.wait()
+        canonical_url = await resolve_canonical_url(item.url)
+        if canonical_url != item.url:
+            # A redirect to an article that is known or handled by another item.
+            if canonical_url in self._claimed or await asyncio.to_thread(
+                _cached_urls, [canonical_url]
+            ):
+                self._finish(item.url, "skipped")
+                return None
+            self._claimed.add(canonical_url)
+        await self._pacer.wait()
+        scraped = await scrape_wikipedia_article(canonical_url)
+        return item._replace(canonical_url=canonical_url, scraped=scraped)
+
+    async def _extract(self, item: _Item) -> _Item:
+        item.scraped.entities = await asyncio.to_thread(extract_entities, item.scraped.text)
+        return item
+
+    async def _generate(self, item: _Item) -> _Item:
+        return item._replace(llm_result=await agenerate_quiz_and_topics(item.scraped))
+
+    async def _write(self, inbox: asyncio.Queue) -> None:
+        batch: List[_Item] = []
+        while True:
+            try:
+                item = await asyncio.wait_for(inbox.get(), timeout=self.options.flush_seconds)
+            except asyncio.TimeoutError:
+                await self._flush(batch)
+                batch = []
+                continue
+            if item is None:
+                break
+            batch.append(item)
+            if len(batch) >= self.options.batch_size:
+                await self._flush(batch)
+                batch = []
+        await self._flush(batch)
+
+    async def _flush(self, batch: List[_Item]) -> None:
+        """Insert ``batch`` in one transaction; on failure, retry its items one by one."""
+        if not batch:
+            return
+        generated = [
+            GeneratedQuiz(
+                scraped=item.scraped,
+                quiz=item.llm_result["quiz"],
+                related_topics=item.llm_result["related_topics"],
+                aliases={item.url, item.canonical_url},
+            )
+            for item in batch
+        ]
+        try:
+            responses = await asyncio.to_thread(_persist_batch, generated)
+        except Exception as exc:
+            if len(batch) == 1:
+                self._fail(batch[0], exc)
+                return
+            logger.warning("Writing %d quizzes failed (%s); retrying one by one", len(batch), exc)
+            for item in batch:
+                await self._flush([item])
+            return
+
+        for item, response in zip(batch, responses):
+            self._finish(item.url, "done", quiz_id=response["id"])
+        logger.info("Saved %d quizzes (%s)", len(batch), dict(self.counts))
+
+    def _finish(self, url: str, status: str, **details: Any) -> None:
+        self.counts[status] += 1
+        self.checkpoint.record(url, status, **details)
+
+    def _fail(self, item: _Item, exc: Exception) -> None:
+        logger.warning("Generating %s failed: %s", item.url, exc)
+        self._finish(item.url, "failed", error=str(exc) or repr(exc))
@@ -0,0 +1,238 @@
+"""Near-duplicate detection of quiz questions with MinHash and LSH.
+
+A question is reduced to a set of shingles (its content words plus one token
+for the normalized answer), and the set to a MinHash signature of
+``NUM_PERM`` 32-bit values, stored with the question in the bank. Similar
+signatures estimate similar shingle sets. An ``LSHIndex`` buckets signatures
+by bands so a lookup only compares against a few candidates. Per-article
+indexes are cached and topped up with rows added since their last load, so
+a check costs one small query plus microseconds of hashing however long the
+article's history is.
+"""
+import hashlib
+import re
+import struct
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.question_model import Question
+from app.schemas.quiz_schema import MCQQuestion, QuizData
+
+NUM_PERM = 64
+# 32 bands of 2 rows: pairs down to about 0.2 similarity become candidates,
+# and candidates are then checked against the real threshold.
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_SIGNATURE_FORMAT = f"<{NUM_PERM}I"
+_WORD_RE = re.compile(r"\w+")
+
+# Words that carry no meaning of their own in a question.
+STOPWORDS = frozenset(
+    """a an and are as at be by did do does for from has have how in is it its of on or
+    the that this to was were what when where which who whom whose why with""".split()
+)
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+# Permutations derived from fixed strings, so signatures stored by one process
+# stay comparable with those computed by any other.
+_PERMUTATIONS = [
+    (_hash64(f"minhash-a-{i}") % (_MERSENNE_PRIME - 1) + 1, _hash64(f"minhash-b-{i}") % _MERSENNE_PRIME)
+    for i in range(NUM_PERM)
+]
+
+
+def normalize_answer(answer: str) -> str:
+    return " ".join(answer.casefold().split())
+
+
+def shingles(question: str, answer: str) -> Set[str]:
+    """Content words of ``question`` plus one token for the whole ``answer``."""
+    words = _WORD_RE.findall(question.casefold())
+    tokens = {word for word in words if word not in STOPWORDS} or set(words)
+    tokens.add("=" + normalize_answer(answer))
+    return tokens
+
+
+def minhash(tokens: Iterable[str]) -> Tuple[int, ...]:
+    hashes = [_hash64(token) for token in tokens]
+    return tuple(
+        min((a * value + b) % _MERSENNE_PRIME for value in hashes) & _MAX_HASH
+        for a, b in _PERMUTATIONS
+    )
+
+
+def question_signature(question: MCQQuestion) -> Tuple[int, ...]:
+    return minhash(shingles(question.question, question.correct_answer))
+
+
+def encode_signature(signature: Sequence[int]) -> bytes:
+    return struct.pack(_SIGNATURE_FORMAT, *signature)
+
+
+def decode_signature(data: bytes) -> Tuple[int, ...]:
+    return struct.unpack(_SIGNATURE_FORMAT, data)
+
+
+def similarity(left: Sequence[int], right: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return sum(1 for a, b in zip(left, right) if a == b) / NUM_PERM
+
+
+def _bands(signature: Sequence[int], answer: str) -> List[Tuple[str, int, Tuple[int, ...]]]:
+    # Only questions with the same answer can be duplicates, so the answer is
+    # part of every bucket key and other questions never become candidates.
+    return [
+        (answer, band, tuple(signature[band * ROWS : (band + 1) * ROWS])) for band in range(BANDS)
+    ]
+
+
+class LSHIndex:
+    """Banded MinHash index of question signatures, bucketed by answer."""
+
+    def __init__(self) -> None:
+        self._buckets: Dict[Tuple[str, int, Tuple[int, ...]], List[int]] = defaultdict(list)
+        self._entries: Dict[int, Tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key: int, signature: Sequence[int], answer: str) -> None:
+        if key in self._entries:
+            return
+        answer = normalize_answer(answer)
+        self._entries[key] = tuple(signature)
+        for band in _bands(signature, answer):
+            self._buckets[band].append(key)
+
+    def find(self, signature: Sequence[int], answer: str, threshold: float) -> Optional[int]:
+        """Key of the most similar entry with the same answer, if at least ``threshold`` similar."""
+        best_key, best = None, threshold
+        seen: Set[int] = set()
+        for band in _bands(signature, normalize_answer(answer)):
+            for key in self._buckets.get(band, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                score = similarity(signature, self._entries[key])
+                if score >= best:
+                    best_key, best = key, score
+        return best_key
+
+
+class ArticleIndexes:
+    """LRU cache of per-article LSH indexes over the question bank.
+
+    Each lookup first loads the article's rows with ids above the last one
+    seen, so rows written by other processes are picked up incrementally.
+    (A row committed after a higher id was already loaded is missed; that
+    only lets a near-duplicate through, exact repeats are still refused by
+    the table's unique constraint.)
+    """
+
+    def __init__(self, max_articles: int) -> None:
+        self.max_articles = max_articles
+        self._lock = threading.Lock()
+        self._indexes: "OrderedDict[int, Tuple[LSHIndex, int]]" = OrderedDict()
+
+    def get_many(self, db: Session, article_ids: Iterable[int]) -> Dict[int, LSHIndex]:
+        article_ids = set(article_ids)
+        if not article_ids:
+            return {}
+        with self._lock:
+            last_ids = {
+                article_id: self._indexes[article_id][1] if article_id in self._indexes else 0
+                for article_id in article_ids
+            }
+        stmt = (
+            select(
+                Question.id,
+                Question.article_id,
+                Question.signature,
+                Question.question,
+                Question.correct_answer,
+            )
+            .where(Question.article_id.in_(article_ids), Question.id > min(last_ids.values()))
+            .order_by(Question.id)
+        )
+        rows = db.execute(stmt).all()
+
+        with self._lock:
+            indexes = {}
+            for article_id in article_ids:
+                index, last_id = self._indexes.pop(article_id, (LSHIndex(), 0))
+                for row in rows:
+                    if row.article_id != article_id or row.id <= last_id:
+                        continue
+                    # Rows banked before signatures were stored.
+                    signature = (
+                        decode_signature(row.signature)
+                        if row.signature
+                        else minhash(shingles(row.question, row.correct_answer))
+                    )
+                    index.add(row.id, signature, row.correct_answer)
+                    last_id = row.id
+                self._indexes[article_id] = (index, last_id)
+                indexes[article_id] = index
+            while len(self._indexes) > self.max_articles:
+                self._indexes.popitem(last=False)
+        return indexes
+
+    def get(self, db: Session, article_id: int) -> LSHIndex:
+        return self.get_many(db, [article_id])[article_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+
+
+class DedupResult(NamedTuple):
+    # The quiz to store.
+    quiz: QuizData
+    # Questions of ``quiz`` to add to the bank, with their signatures.
+    novel: List[Tuple[MCQQuestion, Tuple[int, ...]]]
+    # Near-duplicates found among the new questions.
+    duplicates: int
+
+
+def dedupe_quiz(index: LSHIndex, quiz: QuizData, threshold: float, reject: bool) -> DedupResult:
+    """Split ``quiz`` into questions new to the article and near-duplicates.
+
+    A question is a near-duplicate when it has the same answer as a banked
+    question in ``index``, or an earlier question of ``quiz``, and their
+    signatures are at least ``threshold`` similar. Near-duplicates are never
+    banked; with ``reject`` they are dropped from the quiz as well, unless
+    that would leave it empty. ``index`` itself is not changed.
+    """
+    seen = LSHIndex()
+    kept: List[MCQQuestion] = []
+    novel: List[Tuple[MCQQuestion, Tuple[int, ...]]] = []
+    duplicates = 0
+    for position, question in enumerate(quiz.questions):
+        signature = question_signature(question)
+        if (
+            index.find(signature, question.correct_answer, threshold) is not None
+            or seen.find(signature, question.correct_answer, threshold) is not None
+        ):
+            duplicates += 1
+            if not reject:
+                kept.append(question)
+            continue
+        seen.add(-1 - position, signature, question.correct_answer)
+        kept.append(question)
+        novel.append((question, signature))
+    if not kept:
+        kept = list(quiz.questions)
+    if len(kept) == len(quiz.questions):
+        return DedupResult(quiz, novel, duplicates)
+    return DedupResult(QuizData(questions=kept), novel, duplicates)
@@ -0,0 +1,188 @@
+"""Deterministic local stand-in for the Groq chat model, used for benchmarks.
+
+Enabled with ``LLM_PROVIDER=fake``. Replies are derived from the article title
+in the prompt, so the same article always gets the same quiz, and each call
+takes ``FAKE_LLM_LATENCY_SECONDS`` (spread over the chunks when streaming).
+Entries in ``LLM_PROVIDERS`` can inject a latency tail and failures, e.g.
+``fake?tail_probability=0.1&tail_latency_seconds=5``, to exercise hedging and
+failover locally.
+"""
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+from app.config import get_settings
+
+settings = get_settings()
+
+_TITLE_RE = re.compile(r"ARTICLE TITLE:\s*\n(.*)")
+_SECTION_RE = re.compile(r"^## (.+)$", re.MULTILINE)
+_CHUNK_SIZE = 64
+
+# Options an ``LLM_PROVIDERS`` entry may set on a fake backend.
+FAKE_OPTIONS = (
+    "latency_seconds",
+    "questions",
+    "topics",
+    "tail_probability",
+    "tail_latency_seconds",
+    "failure_probability",
+    "seed",
+)
+
+
+class FakeProviderError(RuntimeError):
+    """Injected failure of a fake backend."""
+
+
+def _prompt_text(messages: List[BaseMessage]) -> str:
+    return "\n".join(str(message.content) for message in messages)
+
+
+def _words(seed: str, count: int) -> List[str]:
+    digest = hashlib.sha256(seed.encode("utf-8")).hexdigest()
+    return [digest[i * 6 : i * 6 + 6] for i in range(count)]
+
+
+def fake_reply(prompt: str, questions: int, topics: int) -> Dict[str, Any]:
+    """The JSON object a well-behaved model would return for ``prompt``."""
+    match = _TITLE_RE.search(prompt)
+    title = match.group(1).strip() if match else "Unknown"
+    # Section chunks of one article get distinct questions.
+    section = _SECTION_RE.search(prompt)
+    subject = f"{title}, {section.group(1).strip()}" if section else title
+    wants_questions = "multiple choice" in prompt
+    wants_topics = "related" in prompt and "topics" in prompt
+
+    reply: Dict[str, Any] = {}
+    if wants_questions:
+        reply["questions"] = []
+        for index in range(questions):
+            options = [f"{title} option {word}" for word in _words(f"{subject}:{index}", 4)]
+            reply["questions"].append(
+                {
+                    "question": f"Question {index + 1} about {subject}?",
+                    "options": [{"text": option} for option in options],
+                    "correct_answer": options[index % 4],
+                    "explanation": f"Stated in the article on {title}.",
+                    "difficulty": ("easy", "medium", "hard")[index % 3],
+                }
+            )
+    if wants_topics or not wants_questions:
+        reply["topics"] = [f"{title} topic {word}" for word in _words(f"{title}:topics", topics)]
+    return reply
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers quiz/topic prompts locally after a fixed delay.
+
+    With ``tail_probability`` a call takes ``tail_latency_seconds`` instead,
+    and with ``failure_probability`` it raises ``FakeProviderError`` at once.
+    ``seed`` makes the sequence of slow and failing calls repeatable.
+    """
+
+    latency_seconds: float = 1.0
+    questions: int = 8
+    topics: int = 6
+    tail_probability: float = 0.0
+    tail_latency_seconds: float = 0.0
+    failure_probability: float = 0.0
+    seed: Optional[int] = None
+
+    _rng: random.Random = PrivateAttr(default_factory=random.Random)
+
+    def model_post_init(self, __context: Any) -> None:
+        super().model_post_init(__context)
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-wikiquiz"
+
+    def _call_latency(self) -> float:
+        """Latency of the next call; raises for an injected failure."""
+        if self.failure_probability and self._rng.random() < self.failure_probability:
+            raise FakeProviderError("Injected failure of the fake LLM provider")
+        if self.tail_probability and self._rng.random() < self.tail_probability:
+            return self.tail_latency_seconds
+        return self.latency_seconds
+
+    def _reply(self, messages: List[BaseMessage]) -> str:
+        return json.dumps(fake_reply(_prompt_text(messages), self.questions, self.topics), indent=2)
+
+    def _usage(self, messages: List[BaseMessage], content: str) -> Dict[str, int]:
+        # Roughly four characters per token, like real tokenizers on English text.
+        input_tokens = len(_prompt_text(messages)) // 4
+        output_tokens = len(content) // 4
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        content = self._reply(messages)
+        message = AIMessage(content=content, usage_metadata=self._usage(messages, content))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(
+        self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any
+    ) -> ChatResult:
+        time.sleep(self._call_latency())
+        return self._result(messages)
+
+    async def _agenerate(
+        self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any
+    ) -> ChatResult:
+        await asyncio.sleep(self._call_latency())
+        return self._result(messages)
+
+    def _chunks(self, messages: List[BaseMessage]) -> List[AIMessageChunk]:
+        content = self._reply(messages)
+        pieces = [content[i : i + _CHUNK_SIZE] for i in range(0, len(content), _CHUNK_SIZE)]
+        chunks = [AIMessageChunk(content=piece) for piece in pieces]
+        chunks[-1] = AIMessageChunk(
+            content=pieces[-1], usage_metadata=self._usage(messages, content)
+        )
+        return chunks
+
+    def _stream(
+        self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        latency = self._call_latency()
+        chunks = self._chunks(messages)
+        for chunk in chunks:
+            time.sleep(latency / len(chunks))
+            yield ChatGenerationChunk(message=chunk)
+
+    async def _astream(
+        self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        latency = self._call_latency()
+        chunks = self._chunks(messages)
+        for chunk in chunks:
+            await asyncio.sleep(latency / len(chunks))
+            yield ChatGenerationChunk(message=chunk)
+
+
+def build_fake_llm(**options: Any) -> FakeChatModel:
+    """Fake model with the ``FAKE_LLM_*`` settings, overridden by ``options``."""
+    unknown = set(options) - set(FAKE_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown fake LLM options: {', '.join(sorted(unknown))}")
+    values: Dict[str, Any] = {
+        "latency_seconds": settings.FAKE_LLM_LATENCY_SECONDS,
+        "questions": settings.FAKE_LLM_QUESTIONS,
+        "topics": settings.FAKE_LLM_TOPICS,
+    }
+    values.update(options)
+    return FakeChatModel(**values)
@@ -0,0 +1,78 @@
+import hashlib
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Optional, Tuple
+
+from app.config import get_settings
+
+try:  # Optional: better ratio and much faster decompression than zlib.
+    import zstandard
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
+
+settings = get_settings()
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def compress_html(html: str) -> bytes:
+    """Compress HTML with zstd when configured and available, otherwise zlib."""
+    data = html.encode("utf-8")
+    if settings.HTML_COMPRESSION == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return zlib.compress(data, 6)
+
+
+def decompress_html(blob: bytes) -> str:
+    """Decompress a body written by ``compress_html``; the codec is detected from its header."""
+    if blob.startswith(_ZSTD_MAGIC):
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed article HTML.")
+        return zstandard.ZstdDecompressor().decompress(blob).decode("utf-8")
+    return zlib.decompress(blob).decode("utf-8")
+
+
+class HtmlBlobStore:
+    """Content-addressed store of compressed HTML files on local disk."""
+
+    def __init__(self, root: str) -> None:
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def put(self, html: str) -> str:
+        key = hashlib.sha256(html.encode("utf-8")).hexdigest()
+        path = self._path(key)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # A temp file per write, so concurrent writers of one key never share one.
+            with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as temp:
+                temp.write(compress_html(html))
+            try:
+                os.replace(temp.name, path)
+            except OSError:
+                os.unlink(temp.name)
+                raise
+        return key
+
+    def get(self, key: str) -> str:
+        return decompress_html(self._path(key).read_bytes())
+
+
+def store_html(html: str) -> Tuple[Optional[bytes], Optional[str]]:
+    """Return ``(compressed_blob, blob_ref)`` for the configured storage backend."""
+    if settings.HTML_STORAGE_BACKEND == "disk":
+        return None, HtmlBlobStore(settings.HTML_BLOB_DIR).put(html)
+    return compress_html(html), None
+
+
+def load_html(blob: Optional[bytes], ref: Optional[str]) -> str:
+    """Inverse of ``store_html``."""
+    if ref:
+        return HtmlBlobStore(settings.HTML_BLOB_DIR).get(ref)
+    if blob is None:
+        return ""
+    return decompress_html(blob)
@@ -0,0 +1,276 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncGenerator, Dict, List, Mapping, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import get_settings
+from app.services.html_store import compress_html, decompress_html
+from app.services.metrics import record_cache
+from app.services.rate_limiter import http_limiter, retry_after_delay
+
+try:  # HTTP/2 support is optional; httpx falls back to HTTP/1.1 keep-alive.
+    import h2  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on environment
+    _HTTP2_AVAILABLE = False
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse(NamedTuple):
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+# Pruning deletes least recently used entries down to this share of the limit,
+# so the directory is only rescanned after it has grown by the rest again.
+PRUNE_TARGET = 0.9
+# Temp files left this long (by a crashed writer) are removed when pruning.
+STALE_TEMP_SECONDS = 3600
+
+
+class HttpCache:
+    """On-disk cache of response bodies keyed by URL, with their validators.
+
+    With ``max_bytes`` set, the least recently used entries are deleted once
+    the directory grows past it.
+    """
+
+    def __init__(self, root: str, max_bytes: int = 0) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Bytes on disk, estimated from writes since the last scan.
+        self._size: Optional[int] = None
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = self.root / key[:2] / key
+        return base.with_suffix(".json"), base.with_suffix(".body")
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            blob = body_path.read_bytes()
+            # Concurrent writers may leave one response's body next to another's metadata.
+            if meta.get("body_sha256") != hashlib.sha256(blob).hexdigest():
+                return None
+            body = decompress_html(blob)
+            # Pruning goes by metadata mtime, so a hit marks the entry as recently used.
+            os.utime(meta_path)
+        except (OSError, ValueError):
+            return None
+        return CachedResponse(body, meta.get("etag"), meta.get("last_modified"))
+
+    def put(self, url: str, entry: CachedResponse) -> None:
+        """Store ``entry``; a failed write only costs a future cache miss."""
+        meta_path, body_path = self._paths(url)
+        blob = compress_html(entry.body)
+        meta = json.dumps(
+            {
+                "url": url,
+                "etag": entry.etag,
+                "last_modified": entry.last_modified,
+                "body_sha256": hashlib.sha256(blob).hexdigest(),
+            }
+        ).encode("utf-8")
+        temp_paths = []
+        try:
+            meta_path.parent.mkdir(parents=True, exist_ok=True)
+            # Unique temp files, so concurrent writes of one URL never share one.
+            for data in (blob, meta):
+                with tempfile.NamedTemporaryFile(
+                    dir=meta_path.parent, suffix=".tmp", delete=False
+                ) as temp:
+                    temp_paths.append(temp.name)
+                    temp.write(data)
+            # Body first: a reader that sees new metadata usually finds a matching
+            # body, and otherwise the digest check turns the mismatch into a miss.
+            os.replace(temp_paths[0], body_path)
+            os.replace(temp_paths[1], meta_path)
+            self._grew(len(blob) + len(meta))
+        except OSError as exc:
+            logger.warning("Could not cache %s: %s", url, exc)
+            for path in temp_paths:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+    def _grew(self, added: int) -> None:
+        if self.max_bytes <= 0:
+            return
+        with self._lock:
+            if self._size is not None:
+                # Overwrites are counted in full; the next scan corrects that.
+                self._size += added
+                if self._size <= self.max_bytes:
+                    return
+            self._size = self.prune()
+
+    def prune(self) -> int:
+        """Delete least recently used entries beyond the size limit; return the bytes kept."""
+        entries: Dict[str, Tuple[float, int, List[Path]]] = {}
+        now = time.time()
+        for path in self.root.glob("*/*"):
+            try:
+                stat = path.stat()
+                if path.suffix == ".tmp":
+                    if now - stat.st_mtime > STALE_TEMP_SECONDS:
+                        path.unlink()
+                    continue
+            except OSError:
+                continue
+            used, size, paths = entries.get(path.stem, (0.0, 0, []))
+            if path.suffix == ".json":
+                used = stat.st_mtime
+            entries[path.stem] = (used, size + stat.st_size, paths + [path])
+
+        total = sum(size for _, size, _ in entries.values())
+        if total <= self.max_bytes:
+            return total
+        target = self.max_bytes * PRUNE_TARGET
+        for used, size, paths in sorted(entries.values(), key=lambda entry: entry[0]):
+            if total <= target:
+                break
+            # Metadata first: a reader never finds metadata without its body.
+            for path in sorted(paths, key=lambda path: path.suffix != ".json"):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            total -= size
+        return total
+
+
+class _LoopState(NamedTuple):
+    client: httpx.AsyncClient
+    # Closes ``client`` when its loop shuts down; see ``_close_at_loop_shutdown``.
+    closer: AsyncGenerator[None, None]
+
+
+# One client per event loop: connections are bound to the loop that opened them.
+_states: Dict[asyncio.AbstractEventLoop, _LoopState] = {}
+_cache = HttpCache(settings.HTTP_CACHE_DIR, settings.HTTP_CACHE_MAX_BYTES)
+_transport: Optional[httpx.AsyncBaseTransport] = None
+
+
+def install_transport(transport: Optional[httpx.AsyncBaseTransport]) -> None:
+    """Send requests of clients created from now on through ``transport``.
+
+    Benchmarks use this to serve saved pages instead of the network;
+    ``None`` restores the default network transport.
+    """
+    global _transport
+    _transport = transport
+
+async def _close_at_loop_shutdown(client: httpx.AsyncClient) -> AsyncGenerator[None, None]:
+    # The loop finalizes async generators it has seen before closing
+    # (``asyncio.run`` does, via ``shutdown_asyncgens``), so the pool of a loop
+    # that is not closed explicitly is still closed on that loop.
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+def _get_state() -> _LoopState:
+    """Return the pooled client for the running loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    state = _states.get(loop)
+    if state is None:
+        for other in [other for other in _states if other.is_closed()]:
+            del _states[other]
+        client = httpx.AsyncClient(
+            http2=settings.HTTP2_ENABLED and _HTTP2_AVAILABLE,
+            timeout=settings.HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            follow_redirects=True,
+            transport=_transport,
+        )
+        closer = _close_at_loop_shutdown(client)
+        # Run it up to its ``yield``, which registers it with the running loop.
+        try:
+            closer.asend(None).send(None)
+        except StopIteration:
+            pass
+        state = _states[loop] = _LoopState(client, closer)
+    return state
+
+
+async def get_text(
+    url: str,
+    *,
+    headers: Optional[Mapping[str, str]] = None,
+    params: Optional[Mapping[str, Any]] = None,
+    use_cache: bool = True,
+) -> str:
+    """GET ``url`` through the shared client and return the body.
+
+    With caching enabled, a previously seen response is revalidated with
+    ``If-None-Match`` / ``If-Modified-Since`` and a 304 is served from disk.
+    Requests go through the host's rate limiter, which backs off on 429/503.
+    Raises ``httpx.HTTPError`` on transport errors and non-2xx statuses, and
+    ``RateLimitTimeout`` if the limiter cannot admit the request in time.
+    """
+    state = _get_state()
+    use_cache = use_cache and settings.HTTP_CACHE_ENABLED and params is None
+    request_headers = dict(headers or {})
+
+    cached = await asyncio.to_thread(_cache.get, url) if use_cache else None
+    if cached is not None:
+        if cached.etag:
+            request_headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            request_headers["If-Modified-Since"] = cached.last_modified
+
+    limiter = http_limiter(urlsplit(url).hostname or "")
+    async with limiter.slot():
+        response = await state.client.get(url, headers=request_headers, params=params)
+    backoff = retry_after_delay(response.status_code, response.headers.get("Retry-After"))
+    if backoff is not None:
+        limiter.throttled(backoff)
+    else:
+        limiter.succeeded()
+
+    if response.status_code == httpx.codes.NOT_MODIFIED and cached is not None:
+        record_cache("http", hit=True)
+        return cached.body
+    response.raise_for_status()
+    if use_cache:
+        record_cache("http", hit=False)
+
+    body = response.text
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if use_cache and (etag or last_modified):
+        await asyncio.to_thread(_cache.put, url, CachedResponse(body, etag, last_modified))
+    return body
+
+
+async def get_json(url: str, **kwargs: Any) -> Any:
+    """GET ``url`` and decode the body as JSON."""
+    return json.loads(await get_text(url, **kwargs))
+
+
+async def close_http_client() -> None:
+    """Close the running loop's pooled client (called on application shutdown)."""
+    state = _states.pop(asyncio.get_running_loop(), None)
+    if state is not None:
+        await state.closer.aclose()
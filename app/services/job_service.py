@@ -0,0 +1,451 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import and_, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import SessionLocal, db_session
+from app.models.job_model import GenerationJob
+from app.schemas.job_schema import JobStatus
+from app.schemas.quiz_schema import GenerateQuizRequest
+from app.services.bulk_service import BulkGenerator, BulkOptions, Checkpoint
+from app.services.quiz_service import QuizService
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+TERMINAL_STATUSES = {"succeeded", "failed"}
+
+
+# ---------------------------
+# Queue operations
+# ---------------------------
+
+
+def enqueue_job(db: Session, url: str) -> GenerationJob:
+    """Insert a queued generation job for ``url``."""
+    now = datetime.utcnow()
+    job = GenerationJob(
+        id=uuid.uuid4().hex,
+        url=url,
+        status="queued",
+        stage="queued",
+        attempts=0,
+        created_at=now,
+        updated_at=now,
+    )
+    db.add(job)
+    db.commit()
+    return job
+
+
+def get_job(db: Session, job_id: str) -> Optional[GenerationJob]:
+    return db.get(GenerationJob, job_id)
+
+
+def enqueue_batch(db: Session, urls: Sequence[str], worker_id: Optional[str] = None) -> Dict[str, Any]:
+    """Queue one job per URL under a shared batch id, with a single INSERT.
+
+    URLs of known articles and URLs that already have a queued or running
+    job are skipped. With ``worker_id`` the jobs are created already claimed
+    by that worker instead of queued.
+    """
+    skipped = QuizService(db).cached_urls(urls)
+    for start in range(0, len(urls), 1000):
+        chunk = list(urls[start : start + 1000])
+        skipped.update(
+            db.scalars(
+                select(GenerationJob.url).where(
+                    GenerationJob.url.in_(chunk), GenerationJob.status.in_(("queued", "running"))
+                )
+            )
+        )
+    pending = [url for url in urls if url not in skipped]
+    if not pending:
+        return {"batch_id": None, "queued": 0, "skipped": [url for url in urls if url in skipped]}
+
+    batch_id = uuid.uuid4().hex
+    now = datetime.utcnow()
+    state = (
+        {"status": "running", "stage": "claimed", "attempts": 1, "worker_id": worker_id}
+        if worker_id
+        else {"status": "queued", "stage": "queued", "attempts": 0}
+    )
+    db.execute(
+        insert(GenerationJob),
+        [
+            {
+                "id": uuid.uuid4().hex,
+                "url": url,
+                **state,
+                "batch_id": batch_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for url in pending
+        ],
+    )
+    db.commit()
+    return {
+        "batch_id": batch_id,
+        "queued": len(pending),
+        "skipped": [url for url in urls if url in skipped],
+    }
+
+
+def get_batch_status(db: Session, batch_id: str) -> Optional[Dict[str, Any]]:
+    """Job counts by status for a batch, or ``None`` if it does not exist."""
+    rows = db.execute(
+        select(GenerationJob.status, func.count())
+        .where(GenerationJob.batch_id == batch_id)
+        .group_by(GenerationJob.status)
+    ).all()
+    if not rows:
+        return None
+    counts = {status: count for status, count in rows}
+    return {"batch_id": batch_id, "total": sum(counts.values()), **counts}
+
+
+def _claim_next_job(worker_id: str) -> Optional[Tuple[str, str]]:
+    """Atomically claim the oldest runnable job; safe across processes and nodes."""
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=settings.JOB_STALE_SECONDS)
+    with db_session() as session:
+        # Orphaned jobs that already used up their attempts are given up on.
+        session.execute(
+            update(GenerationJob)
+            .where(
+                GenerationJob.status == "running",
+                GenerationJob.updated_at < stale_before,
+                GenerationJob.attempts >= settings.JOB_MAX_ATTEMPTS,
+            )
+            .values(status="failed", stage="failed", error="Job abandoned by its worker.", updated_at=now)
+        )
+        next_id = (
+            select(GenerationJob.id)
+            .where(
+                or_(
+                    GenerationJob.status == "queued",
+                    and_(
+                        GenerationJob.status == "running",
+                        GenerationJob.updated_at < stale_before,
+                    ),
+                )
+            )
+            .order_by(GenerationJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        row = session.execute(
+            update(GenerationJob)
+            .where(GenerationJob.id == next_id)
+            .values(
+                status="running",
+                stage="claimed",
+                worker_id=worker_id,
+                attempts=GenerationJob.attempts + 1,
+                updated_at=now,
+            )
+            .returning(GenerationJob.id, GenerationJob.url)
+        ).first()
+    return (row[0], row[1]) if row else None
+
+
+def _update_job(job_id: str, worker_id: str, **values: Any) -> bool:
+    """Update a running job claimed by ``worker_id``.
+
+    Returns ``False`` once the job was reclaimed by another worker (or
+    finished), so a worker never overwrites the outcome of a later attempt.
+    """
+    with db_session() as session:
+        result = session.execute(
+            update(GenerationJob)
+            .where(
+                GenerationJob.id == job_id,
+                GenerationJob.worker_id == worker_id,
+                GenerationJob.status == "running",
+            )
+            .values(updated_at=datetime.utcnow(), **values)
+        )
+    return result.rowcount > 0
+
+
+def _batch_jobs(batch_id: str, worker_id: str) -> Dict[str, str]:
+    """Job ids by URL of the running jobs of a batch claimed by ``worker_id``."""
+    with db_session() as session:
+        rows = session.execute(
+            select(GenerationJob.url, GenerationJob.id).where(
+                GenerationJob.batch_id == batch_id,
+                GenerationJob.worker_id == worker_id,
+                GenerationJob.status == "running",
+            )
+        ).all()
+    return {url: job_id for url, job_id in rows}
+
+
+def _touch_batch(batch_id: str, worker_id: str) -> bool:
+    """Refresh the running jobs of a batch claimed by ``worker_id``; ``False`` if none are left."""
+    with db_session() as session:
+        result = session.execute(
+            update(GenerationJob)
+            .where(
+                GenerationJob.batch_id == batch_id,
+                GenerationJob.worker_id == worker_id,
+                GenerationJob.status == "running",
+            )
+            .values(updated_at=datetime.utcnow())
+        )
+    return result.rowcount > 0
+
+
+def load_job_status(job_id: str) -> Optional[Dict[str, Any]]:
+    """Return a JSON-ready snapshot of a job using a short-lived session."""
+    session = SessionLocal()
+    try:
+        job = session.get(GenerationJob, job_id)
+        return JobStatus.model_validate(job).model_dump(mode="json") if job else None
+    finally:
+        session.close()
+
+
+# ---------------------------
+# Worker pool
+# ---------------------------
+
+
+class _JobCheckpoint(Checkpoint):
+    """Records the outcome of each URL of a bulk run on its job row."""
+
+    def __init__(self, jobs: Dict[str, str], worker_id: str) -> None:
+        super().__init__(None)
+        self.jobs = jobs
+        self.worker_id = worker_id
+        self._writes: Set[asyncio.Task] = set()
+
+    def record(self, url: str, status: str, **details: Any) -> None:
+        job_id = self.jobs.get(url)
+        if job_id is None:
+            return
+        if status == "failed":
+            values = {"status": "failed", "stage": "failed", "error": details.get("error")}
+        else:
+            # "skipped": the article got its quiz from another job or request.
+            values = {
+                "status": "succeeded",
+                "stage": "done" if status == "done" else "skipped",
+                "quiz_id": details.get("quiz_id"),
+                "error": None,
+            }
+        task = asyncio.create_task(asyncio.to_thread(_update_job, job_id, self.worker_id, **values))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def drain(self) -> None:
+        await asyncio.gather(*self._writes)
+
+
+class JobWorkerPool:
+    """A bounded set of asyncio workers that claim and run generation jobs."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._tasks: List[asyncio.Task] = []
+        self._batches: Set[asyncio.Task] = set()
+        self._wakeup = asyncio.Event()
+        self._name = f"{socket.gethostname()}:{os.getpid()}"
+
+    def start(self) -> None:
+        for index in range(self.size):
+            self._tasks.append(asyncio.create_task(self._run(f"{self._name}:{index}")))
+
+    async def stop(self) -> None:
+        tasks = [*self._tasks, *self._batches]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def batch_worker_id(self) -> str:
+        return f"{self._name}:batch:{uuid.uuid4().hex[:8]}"
+
+    def start_batch(self, batch_id: str, worker_id: str) -> None:
+        """Run the jobs of a batch claimed by ``worker_id`` through the bulk pipeline."""
+        task = asyncio.create_task(self._run_batch(batch_id, worker_id))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    def notify(self) -> None:
+        """Wake idle workers after a job was enqueued in this process."""
+        self._wakeup.set()
+
+    async def _run(self, worker_id: str) -> None:
+        while True:
+            try:
+                claimed = await asyncio.to_thread(_claim_next_job, worker_id)
+            except Exception:
+                logger.exception("Failed to claim a generation job")
+                claimed = None
+
+            if claimed is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), settings.JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._execute(worker_id, *claimed)
+
+    async def _heartbeat(self, touch: Callable[..., bool], *args: Any) -> None:
+        """Keep running jobs from looking stale while they are being generated.
+
+        ``touch(*args)`` refreshes them and returns ``False`` once none are left.
+        """
+        while True:
+            await asyncio.sleep(settings.JOB_HEARTBEAT_SECONDS)
+            try:
+                if not await asyncio.to_thread(touch, *args):
+                    return
+            except Exception:
+                logger.exception("Failed to refresh generation jobs %s", args[0])
+
+    async def _run_batch(self, batch_id: str, worker_id: str) -> None:
+        heartbeat = asyncio.create_task(self._heartbeat(_touch_batch, batch_id, worker_id))
+        try:
+            jobs = await asyncio.to_thread(_batch_jobs, batch_id, worker_id)
+            checkpoint = _JobCheckpoint(jobs, worker_id)
+            try:
+                await BulkGenerator(BulkOptions(), checkpoint).run(list(jobs))
+            finally:
+                await checkpoint.drain()
+        except asyncio.CancelledError:
+            # Shutting down: unfinished jobs go stale and are picked up one by one.
+            raise
+        except Exception:
+            logger.exception("Generation batch %s failed", batch_id)
+        finally:
+            heartbeat.cancel()
+
+    async def _execute(self, worker_id: str, job_id: str, url: str) -> None:
+        async def progress(stage: str) -> None:
+            await asyncio.to_thread(_update_job, job_id, worker_id, stage=stage)
+
+        heartbeat = asyncio.create_task(self._heartbeat(_update_job, job_id, worker_id))
+        session = SessionLocal()
+        try:
+            result = await QuizService(session).generate_quiz(
+                GenerateQuizRequest(url=url), progress=progress
+            )
+        except asyncio.CancelledError:
+            # Shutting down: leave the job "running" so it is picked up again once stale.
+            raise
+        except Exception as exc:
+            logger.exception("Generation job %s failed", job_id)
+            await asyncio.to_thread(
+                _update_job,
+                job_id,
+                worker_id,
+                status="failed",
+                stage="failed",
+                error=str(exc) or repr(exc),
+            )
+        else:
+            await asyncio.to_thread(
+                _update_job,
+                job_id,
+                worker_id,
+                status="succeeded",
+                stage="done",
+                quiz_id=result["id"],
+                error=None,
+            )
+        finally:
+            heartbeat.cancel()
+            await asyncio.to_thread(session.close)
+
+
+_pool: Optional[JobWorkerPool] = None
+
+
+async def start_job_workers() -> None:
+    global _pool
+    if settings.JOB_WORKERS > 0 and _pool is None:
+        _pool = JobWorkerPool(settings.JOB_WORKERS)
+        _pool.start()
+
+
+async def stop_job_workers() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.stop()
+        _pool = None
+
+
+def notify_job_workers() -> None:
+    if _pool is not None:
+        _pool.notify()
+
+
+async def submit_batch(db: Session, urls: Sequence[str]) -> Dict[str, Any]:
+    """Create the jobs of a batch and start generating them.
+
+    With local workers the batch runs through the bulk pipeline in this
+    process (see ``app.services.bulk_service``), with results written in
+    batches; its jobs are created claimed by the run and report its outcome
+    per URL. Without local workers they are queued for workers on other
+    nodes. Jobs of a run that stops early go stale and are retried one by
+    one by the regular workers.
+    """
+    worker_id = _pool.batch_worker_id() if _pool is not None else None
+    result = await asyncio.to_thread(enqueue_batch, db, urls, worker_id)
+    if result["queued"] and _pool is not None:
+        _pool.start_batch(result["batch_id"], worker_id)
+    return result
+
+
+# ---------------------------
+# Progress streaming
+# ---------------------------
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def job_events(job_id: str) -> AsyncIterator[str]:
+    """Yield Server-Sent Events for each stage change until the job finishes.
+
+    Progress is read from the job row, so this works regardless of which
+    node's worker is running the job.
+    """
+    last_seen: Optional[Tuple[str, Optional[str]]] = None
+    idle_polls = 0
+    keepalive_every = max(1, int(15 / settings.JOB_EVENTS_POLL_SECONDS))
+    while True:
+        snapshot = await asyncio.to_thread(load_job_status, job_id)
+        if snapshot is None:
+            yield _sse("error", {"detail": "Job not found"})
+            return
+
+        state = (snapshot["status"], snapshot["stage"])
+        if state != last_seen:
+            last_seen = state
+            idle_polls = 0
+            if snapshot["status"] in TERMINAL_STATUSES:
+                yield _sse("done" if snapshot["status"] == "succeeded" else "failed", snapshot)
+                return
+            yield _sse("progress", snapshot)
+        else:
+            idle_polls += 1
+            if idle_polls % keepalive_every == 0:
+                yield ": keep-alive\n\n"
+
+        await asyncio.sleep(settings.JOB_EVENTS_POLL_SECONDS)
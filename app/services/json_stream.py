@@ -0,0 +1,72 @@
+import json
+from typing import Any, List, Optional
+
+
+class JsonArrayStreamParser:
+    """Incrementally extract the elements of one top-level JSON array.
+
+    Feed it chunks of a JSON document as they arrive (e.g. LLM tokens) and it
+    returns every object element of ``{"<key>": [ ... ]}`` as soon as that
+    element's closing brace is seen. Text before the document (such as a
+    Markdown code fence) is ignored. Elements that fail to decode are skipped;
+    the caller validates the complete document at the end anyway.
+    """
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key: Optional[str] = None
+        self._array_depth: Optional[int] = None
+        self._element_start: Optional[int] = None
+        self._done = False
+
+    def feed(self, chunk: str) -> List[Any]:
+        self._buffer += chunk
+        elements: List[Any] = []
+        buffer = self._buffer
+        for i in range(self._pos, len(buffer)):
+            c = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_key = buffer[self._string_start + 1 : i]
+                continue
+
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+            elif c in "{[":
+                self._depth += 1
+                if self._done:
+                    continue
+                if c == "[" and self._array_depth is None and self._depth == 2 and self._last_key == self.key:
+                    self._array_depth = 2
+                elif c == "{" and self._array_depth is not None and self._depth == self._array_depth + 1:
+                    self._element_start = i
+            elif c in "}]":
+                if (
+                    c == "}"
+                    and self._element_start is not None
+                    and self._depth == self._array_depth + 1
+                ):
+                    try:
+                        elements.append(json.loads(buffer[self._element_start : i + 1]))
+                    except ValueError:
+                        pass
+                    self._element_start = None
+                elif c == "]" and self._array_depth is not None and self._depth == self._array_depth:
+                    # The array is complete; ignore anything that follows.
+                    self._done = True
+                self._depth -= 1
+        self._pos = len(buffer)
+        return elements
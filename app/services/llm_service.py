@@ -1,15 +1,41 @@
+import asyncio
 import json
+import math
+import re
+import sys
+import threading
+import time
+from collections import deque
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+from urllib.parse import parse_qsl
 
-from google.api_core.exceptions import GoogleAPIError
-from langchain_core.prompts import PromptTemplate
-from langchain_core.runnables import RunnableSerializable
-from langchain_groq import ChatGroq
+from pydantic import ValidationError
 
 from app.config import get_settings
 from app.schemas.article_schema import ScrapedArticleContent
-from app.schemas.quiz_schema import QuizData
+from app.schemas.quiz_schema import MCQQuestion, QuizData
+from app.services.dedup import LSHIndex, dedupe_quiz
+from app.services.json_stream import JsonArrayStreamParser
+from app.services.metrics import LLM_CALLS, LLM_HEDGES, LLM_REASKS, LLM_TOKENS, stage
+from app.services.rate_limiter import RateLimitTimeout, limited_call, llm_limiter, throttle_delay
+from app.services.section_chunker import SectionChunk, plan_chunks
+
+# LangChain and the provider SDKs take most of a second to import, so they are
+# imported when the first client or chain is built rather than at startup.
+if TYPE_CHECKING:
+    from langchain_core.runnables import RunnableSerializable
 
 settings = get_settings()
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -26,83 +52,793 @@ def _load_prompt(name: str) -> str:
     return prompt_path.read_text(encoding="utf-8")
 
 
-def _build_llm():
+DEFAULT_GROQ_MODEL = "llama-3.3-70b-versatile"
+
+
+class ProviderConfig(NamedTuple):
+    """One LLM backend: a provider, optionally a model, and provider options."""
+
+    name: str
+    provider: str
+    model: Optional[str] = None
+    options: Dict[str, str] = {}
+
+
+def parse_provider_specs(specs: str) -> List[ProviderConfig]:
+    """Backends from an ``LLM_PROVIDERS`` value, in order of preference.
+
+    Entries look like ``groq:llama-3.1-8b-instant`` or
+    ``fake?latency_seconds=0.2``; an entry is named by everything before
+    ``?``, with ``#2``, ``#3``... appended to repeated names.
+    """
+    configs: List[ProviderConfig] = []
+    for spec in specs.split(","):
+        base, _, query = spec.strip().partition("?")
+        if not base:
+            continue
+        provider, _, model = base.partition(":")
+        name = base
+        repeats = sum(1 for config in configs if config.name.split("#")[0] == base)
+        if repeats:
+            name = f"{base}#{repeats + 1}"
+        configs.append(
+            ProviderConfig(name, provider.strip().lower(), model.strip() or None, dict(parse_qsl(query)))
+        )
+    return configs
+
+
+def _provider_configs() -> List[ProviderConfig]:
+    configs = parse_provider_specs(settings.LLM_PROVIDERS or settings.LLM_PROVIDER)
+    if not configs:
+        raise ValueError("No LLM provider configured")
+    return configs
+
+
+def _build_llm(config: ProviderConfig):
+    if config.provider == "fake":
+        from app.services.fake_llm import build_fake_llm
+
+        return build_fake_llm(**config.options)
+    if config.provider != "groq":
+        raise ValueError(f"Unknown LLM provider: {config.provider}")
+    from langchain_groq import ChatGroq
+
     return ChatGroq(
-        model="llama-3.3-70b-versatile",
+        model=config.model or DEFAULT_GROQ_MODEL,
         groq_api_key=settings.GROQ_API_KEY,
         temperature=0.3,
+        # Throttling is retried by the rate limiter, which backs off for all callers.
+        max_retries=0,
     )
 
 
+ARTICLE_SUFFIX = "\n\nARTICLE TITLE:\n{title}\n\nSUMMARY:\n{summary}\n"
+SECTIONS_SUFFIX = "\n\nARTICLE TITLE:\n{title}\n\nSECTIONS:\n{sections}\n"
+
+QUIZ_PROMPT = "quiz_prompt.txt"
+TOPICS_PROMPT = "related_topics_prompt.txt"
+COMBINED_PROMPT = "quiz_and_topics_prompt.txt"
+SECTION_QUIZ_PROMPT = "quiz_section_prompt.txt"
+
+# Prompts fed something other than the title and summary.
+PROMPT_SUFFIXES = {SECTION_QUIZ_PROMPT: SECTIONS_SUFFIX}
+
+# Below this many valid questions the quiz part is re-asked once.
+MIN_QUESTIONS = 5
+# Latencies kept per backend and chain for the hedging deadline.
+LATENCY_WINDOW = 200
+# A backend failing this many calls in a row goes to the back of the pool
+# for PROVIDER_COOLDOWN_SECONDS.
+DEMOTE_AFTER_FAILURES = 3
+PROVIDER_COOLDOWN_SECONDS = 30.0
+# Section-mode quizzes are cut down to this many after merging the chunks.
+MAX_QUESTIONS = 10
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+
+
+class ChainRegistry:
+    """Process-level cache of the LLM clients, prompt templates and built chains.
+
+    Each configured backend's client (and with it the provider's HTTP
+    connection pool) is built once and shared by every chain. Chains are
+    rebuilt only when their prompt file changes on disk (checked by mtime
+    when ``PROMPT_HOT_RELOAD`` is on).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._providers: Optional[List[ProviderConfig]] = None
+        self._llms: Dict[str, Any] = {}
+        self._chains: Dict[Tuple[str, str, bool], Tuple[int, "RunnableSerializable"]] = {}
+
+    def providers(self) -> List[ProviderConfig]:
+        """The configured backends, in order of preference."""
+        if self._providers is None:
+            with self._lock:
+                if self._providers is None:
+                    self._providers = _provider_configs()
+        return self._providers
+
+    def get_llm(self, provider: Optional[str] = None):
+        """Client of the backend named ``provider`` (default: the first one)."""
+        configs = self.providers()
+        name = provider or configs[0].name
+        llm = self._llms.get(name)
+        if llm is None:
+            config = next((config for config in configs if config.name == name), None)
+            if config is None:
+                raise ValueError(f"Unknown LLM backend: {name}")
+            with self._lock:
+                llm = self._llms.get(name)
+                if llm is None:
+                    llm = self._llms[name] = _build_llm(config)
+        return llm
+
+    def get_chain(
+        self, prompt_name: str, json_mode: bool = False, provider: Optional[str] = None
+    ) -> "RunnableSerializable":
+        """Chain for ``prompt_name`` on backend ``provider``.
+
+        ``json_mode`` asks the provider for a JSON object.
+        """
+        provider = provider or self.providers()[0].name
+        key = (provider, prompt_name, json_mode)
+        cached = self._chains.get(key)
+        if cached is not None and not settings.PROMPT_HOT_RELOAD:
+            return cached[1]
+
+        mtime = (PROMPTS_DIR / prompt_name).stat().st_mtime_ns
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        llm = self.get_llm(provider)
+        if json_mode:
+            llm = llm.bind(response_format={"type": "json_object"})
+        with self._lock:
+            cached = self._chains.get(key)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            from langchain_core.prompts import PromptTemplate
+
+            suffix = PROMPT_SUFFIXES.get(prompt_name, ARTICLE_SUFFIX)
+            prompt = PromptTemplate.from_template(_load_prompt(prompt_name) + suffix)
+            chain = prompt | llm
+            self._chains[key] = (mtime, chain)
+        return chain
+
+    def clear(self) -> None:
+        """Drop cached chains and clients, e.g. after changing settings."""
+        with self._lock:
+            self._providers = None
+            self._llms.clear()
+            self._chains.clear()
+
+
+chain_registry = ChainRegistry()
+
+
+class ProviderPool:
+    """Health and latency bookkeeping for the configured backends.
+
+    Keeps a window of recent successful latencies per backend and chain, from
+    which the hedging deadline is taken, and moves a backend that keeps
+    failing behind the others for a while.
+    """
+
+    def __init__(self) -> None:
+        self._latencies: Dict[Tuple[str, str], Deque[float]] = {}
+        self._failures: Dict[str, int] = {}
+        self._demoted_until: Dict[str, float] = {}
 
-def build_quiz_chain() -> RunnableSerializable:
+    def order(self) -> List[str]:
+        """Backend names to try, healthy ones first, otherwise in configured order."""
+        now = time.monotonic()
+        names = [config.name for config in chain_registry.providers()]
+        return sorted(names, key=lambda name: self._demoted_until.get(name, 0.0) > now)
+
+    def hedge_delay(self, provider: str, chain_name: str) -> float:
+        """Seconds to wait for ``provider`` before asking the next backend too."""
+        samples = self._latencies.get((provider, chain_name))
+        if not samples or len(samples) < settings.LLM_HEDGE_MIN_SAMPLES:
+            return settings.LLM_HEDGE_INITIAL_DELAY_SECONDS
+        ordered = sorted(samples)
+        rank = max(1, math.ceil(settings.LLM_HEDGE_QUANTILE * len(ordered)))
+        return ordered[min(rank, len(ordered)) - 1]
+
+    def record_latency(self, provider: str, chain_name: str, seconds: float) -> None:
+        key = (provider, chain_name)
+        if key not in self._latencies:
+            self._latencies[key] = deque(maxlen=LATENCY_WINDOW)
+        self._latencies[key].append(seconds)
+
+    def record_success(self, provider: str) -> None:
+        self._failures[provider] = 0
+        self._demoted_until.pop(provider, None)
+
+    def record_failure(self, provider: str) -> None:
+        self._failures[provider] = self._failures.get(provider, 0) + 1
+        if self._failures[provider] >= DEMOTE_AFTER_FAILURES:
+            self._demoted_until[provider] = time.monotonic() + PROVIDER_COOLDOWN_SECONDS
+
+    def reset(self) -> None:
+        self._latencies.clear()
+        self._failures.clear()
+        self._demoted_until.clear()
+
+
+provider_pool = ProviderPool()
+
+
+def build_quiz_chain() -> "RunnableSerializable":
     """Chain that generates quiz JSON from article content."""
-    template_str = _load_prompt("quiz_prompt.txt")
-    prompt = PromptTemplate.from_template(
-        template_str
-        + "\n\nARTICLE TITLE:\n{title}\n\nSUMMARY:\n{summary}\n"
-    )
-    llm = _build_llm()
-    return prompt | llm
+    return chain_registry.get_chain(QUIZ_PROMPT)
 
 
-def build_related_topics_chain() -> RunnableSerializable:
+def build_related_topics_chain() -> "RunnableSerializable":
     """Chain that generates related topics JSON from article content."""
-    template_str = _load_prompt("related_topics_prompt.txt")
-    prompt = PromptTemplate.from_template(
-        template_str
-        + "\n\nARTICLE TITLE:\n{title}\n\nSUMMARY:\n{summary}\n"
-    )
-    llm = _build_llm()
-    return prompt | llm
+    return chain_registry.get_chain(TOPICS_PROMPT)
+
+
+def build_combined_chain(json_mode: bool = True) -> "RunnableSerializable":
+    """Chain that generates questions and related topics in a single call."""
+    return chain_registry.get_chain(COMBINED_PROMPT, json_mode=json_mode)
+
+
+def build_section_quiz_chain() -> "RunnableSerializable":
+    """Chain that generates quiz JSON from a chunk of article sections."""
+    return chain_registry.get_chain(SECTION_QUIZ_PROMPT)
+
+
+def _output_text(output: Any) -> str:
+    return output.content if hasattr(output, "content") else str(output)
 
 
 def _safe_json_parse(content: str) -> Dict[str, Any]:
-    """Attempt to parse JSON from an LLM response, stripping code fences if present."""
+    """Parse a JSON object from an LLM response, repairing common defects.
+
+    Strips code fences and any prose around the outermost ``{...}``, and drops
+    trailing commas. Raises ``LLMError`` if the result still is not an object.
+    """
     cleaned = content.strip()
     if cleaned.startswith("```"):
         cleaned = cleaned.strip("`")
         # Remove leading language hints like ```json
         if cleaned.startswith("json"):
             cleaned = cleaned[4:]
-    return json.loads(cleaned)
+    start, end = cleaned.find("{"), cleaned.rfind("}")
+    if start != -1 and end > start:
+        cleaned = cleaned[start : end + 1]
 
+    for candidate in (cleaned, _TRAILING_COMMA_RE.sub(r"\1", cleaned)):
+        try:
+            data = json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(data, dict):
+            return data
+    raise LLMError("LLM response is not a valid JSON object")
+
+
+def _validate_question(item: Any) -> Optional[MCQQuestion]:
+    """Validate one raw question; ``None`` if it is malformed or unanswerable."""
+    try:
+        question = MCQQuestion.model_validate(item)
+    except ValidationError:
+        return None
+    texts = [option.text.strip() for option in question.options]
+    if not question.question.strip() or len(texts) < 2 or len(set(texts)) != len(texts):
+        return None
+
+    answer = question.correct_answer.strip()
+    if answer not in texts:
+        # Tolerate case/whitespace drift but store the option's exact text.
+        folded = [text.casefold() for text in texts]
+        if answer.casefold() not in folded:
+            return None
+        answer = texts[folded.index(answer.casefold())]
+    return question.model_copy(update={"correct_answer": answer})
+
+
+def _question_key(question: MCQQuestion) -> str:
+    return " ".join(question.question.casefold().split())
+
+
+def _collect_questions(
+    items: Any, questions: Optional[List[MCQQuestion]] = None
+) -> List[MCQQuestion]:
+    """Append the valid, not yet seen questions from ``items`` to ``questions``."""
+    questions = list(questions or [])
+    seen = {_question_key(question) for question in questions}
+    for item in items if isinstance(items, list) else []:
+        question = _validate_question(item)
+        if question is not None and _question_key(question) not in seen:
+            seen.add(_question_key(question))
+            questions.append(question)
+    return questions
 
-def generate_quiz_and_topics(article: ScrapedArticleContent) -> Dict[str, Any]:
-    """Call Gemini via LangChain to generate quiz questions and related topics."""
-    quiz_chain = build_quiz_chain()
-    topics_chain = build_related_topics_chain()
 
-    common_input = {
-    "title": article.title,
-    "summary": article.summary or "",
+def _collect_topics(items: Any) -> List[str]:
+    topics: List[str] = []
+    for item in items if isinstance(items, list) else []:
+        if isinstance(item, str) and item.strip() and item.strip() not in topics:
+            topics.append(item.strip())
+    return topics
+
+
+def _common_input(article: ScrapedArticleContent) -> Dict[str, str]:
+    return {
+        "title": article.title,
+        "summary": article.summary or "",
     }
 
 
+def _wrap_provider_error(exc: Exception) -> Exception:
+    if isinstance(exc, (LLMError, RateLimitTimeout)):
+        return exc
+    # Google SDK errors can only occur once something has imported the SDK.
+    google_errors = sys.modules.get("google.api_core.exceptions")
+    if google_errors and isinstance(exc, google_errors.GoogleAPIError):  # pragma: no cover
+        return LLMError(
+            f"Gemini API call failed: {exc.message if hasattr(exc, 'message') else str(exc)}"
+        )
+    return LLMError(f"Unexpected error while calling the LLM provider: {exc}")
+
+
+def _record_usage(chain_name: str, usage: Optional[Dict[str, Any]]) -> None:
+    if usage:
+        LLM_TOKENS.inc(usage.get("input_tokens", 0), chain=chain_name, kind="input")
+        LLM_TOKENS.inc(usage.get("output_tokens", 0), chain=chain_name, kind="output")
+
+
+async def _call_provider(
+    provider: str,
+    chain_name: str,
+    prompt_name: str,
+    chain_input: Dict[str, Any],
+    json_mode: bool,
+    retries: int,
+) -> Any:
+    """One call of a chain on one backend, through that backend's rate limiter.
 
+    Records latency (including time queued), outcome and token usage.
+    """
+    chain = chain_registry.get_chain(prompt_name, json_mode=json_mode, provider=provider)
+    started = time.monotonic()
     try:
-        quiz_output = quiz_chain.invoke(common_input)
-        topics_output = topics_chain.invoke(common_input)
-    except GoogleAPIError as exc:  # pragma: no cover - external service
-        raise LLMError(
-            f"Gemini API call failed: {exc.message if hasattr(exc, 'message') else str(exc)}"
-        ) from exc
-    except Exception as exc:  # pragma: no cover
-        raise LLMError(f"Unexpected error while calling Groq: {exc}") from exc
+        output = await limited_call(
+            llm_limiter(provider),
+            lambda: chain.ainvoke(chain_input),
+            retries=retries,
+            operation=f"llm_{chain_name}",
+        )
+    except asyncio.CancelledError:
+        # Not recorded as a latency: a lost race ends at the winner's time, and
+        # counting it would keep pushing the hedging deadline up.
+        LLM_CALLS.inc(chain=chain_name, outcome="cancelled")
+        raise
+    except Exception:
+        LLM_CALLS.inc(chain=chain_name, outcome="error")
+        provider_pool.record_failure(provider)
+        raise
+    LLM_CALLS.inc(chain=chain_name, outcome="ok")
+    provider_pool.record_success(provider)
+    provider_pool.record_latency(provider, chain_name, time.monotonic() - started)
+    _record_usage(chain_name, getattr(output, "usage_metadata", None))
+    return output
 
-    quiz_json = _safe_json_parse(
-        quiz_output.content if hasattr(quiz_output, "content") else str(quiz_output)
-    )
-    topics_json = _safe_json_parse(
-        topics_output.content if hasattr(topics_output, "content") else str(topics_output)
-    )
 
-    quiz = QuizData.model_validate(quiz_json)
-    related_topics: List[str] = topics_json.get("topics", [])
+async def _ainvoke(
+    chain_name: str,
+    prompt_name: str,
+    chain_input: Dict[str, Any],
+    json_mode: bool = False,
+    accept: Optional[Callable[[Any], bool]] = None,
+) -> Any:
+    """Run the ``prompt_name`` chain, hedged and failed over across the backends.
+
+    The preferred backend is asked first. If it has not answered by its
+    hedging deadline (see ``ProviderPool.hedge_delay``) the next backend is
+    asked as well, and a call that fails, or whose output ``accept`` rejects,
+    is replaced by one on the next backend straight away. The first accepted
+    output wins and the calls still running are cancelled. If no output is
+    accepted the first one received is returned; if every call failed the
+    first error is raised.
+    """
+    providers = provider_pool.order()
+    primary = providers[0]
+    remaining = providers[1:]
+    # With another backend to fail over to, a throttled one is not retried.
+    retries = 0 if remaining else settings.LLM_THROTTLE_RETRIES
+    running: Dict[asyncio.Task, str] = {}
+    hedged = not settings.LLM_HEDGE_ENABLED
+    fallback: Any = None
+    error: Optional[Exception] = None
+
+    def launch(provider: str) -> None:
+        task = asyncio.ensure_future(
+            _call_provider(provider, chain_name, prompt_name, chain_input, json_mode, retries)
+        )
+        running[task] = provider
+
+    with stage(f"llm_{chain_name}"):
+        started = time.monotonic()
+        launch(primary)
+        try:
+            while running:
+                timeout = None
+                if not hedged and remaining and list(running.values()) == [primary]:
+                    delay = provider_pool.hedge_delay(primary, chain_name)
+                    timeout = max(started + delay - time.monotonic(), 0.0)
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    hedged = True
+                    LLM_HEDGES.inc(chain=chain_name, event="hedge")
+                    launch(remaining.pop(0))
+                    continue
+
+                for task in done:
+                    provider = running.pop(task)
+                    try:
+                        output = task.result()
+                    except Exception as exc:
+                        error = error or exc
+                    else:
+                        if accept is None or accept(output):
+                            if provider != primary:
+                                LLM_HEDGES.inc(chain=chain_name, event="backup_won")
+                            return output
+                        if fallback is None:
+                            fallback = output
+                    if remaining and not running:
+                        LLM_HEDGES.inc(chain=chain_name, event="failover")
+                        launch(remaining.pop(0))
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    if fallback is not None:
+        return fallback
+    raise error
+
+
+def _output_data(output: Any) -> Dict[str, Any]:
+    try:
+        return _safe_json_parse(_output_text(output))
+    except LLMError:
+        return {}
+
+
+def _accept_quiz(output: Any) -> bool:
+    return len(_collect_questions(_output_data(output).get("questions"))) >= MIN_QUESTIONS
+
+
+def _accept_topics(output: Any) -> bool:
+    return bool(_collect_topics(_output_data(output).get("topics")))
+
+
+def _accept_combined(output: Any) -> bool:
+    questions, topics = _combined_parts(output)
+    return len(questions) >= MIN_QUESTIONS and bool(topics)
+
 
+def _accept_section_quiz(output: Any) -> bool:
+    return bool(_collect_questions(_output_data(output).get("questions")))
+
+
+async def _reask_questions(
+    common_input: Dict[str, str], questions: List[MCQQuestion]
+) -> List[MCQQuestion]:
+    """Ask the quiz-only chain again and merge its valid, new questions."""
+    LLM_REASKS.inc(part="questions")
+    output = await _ainvoke("quiz", QUIZ_PROMPT, common_input, accept=_accept_quiz)
+    return _collect_questions(_output_data(output).get("questions"), questions)
+
+
+async def _reask_topics(common_input: Dict[str, str]) -> List[str]:
+    LLM_REASKS.inc(part="topics")
+    output = await _ainvoke("topics", TOPICS_PROMPT, common_input, accept=_accept_topics)
+    return _collect_topics(_output_data(output).get("topics"))
+
+
+async def _complete_result(
+    common_input: Dict[str, str], questions: List[MCQQuestion], topics: List[str]
+) -> Dict[str, Any]:
+    """Re-ask only the part that came back short, then build the result.
+
+    Questions are re-asked when fewer than ``MIN_QUESTIONS`` survived
+    validation, topics when none did. Re-asked questions are appended so
+    anything already streamed keeps its position.
+    """
+    reask_questions = len(questions) < MIN_QUESTIONS
+    try:
+        if reask_questions and not topics:
+            questions, topics = await asyncio.gather(
+                _reask_questions(common_input, questions), _reask_topics(common_input)
+            )
+        elif reask_questions:
+            questions = await _reask_questions(common_input, questions)
+        elif not topics:
+            topics = await _reask_topics(common_input)
+    except Exception as exc:  # pragma: no cover - external service
+        raise _wrap_provider_error(exc) from exc
+
+    if not questions:
+        raise LLMError("LLM did not return any valid quiz questions")
     return {
-        "quiz": quiz,
-        "related_topics": related_topics,
+        "quiz": QuizData(questions=questions),
+        "related_topics": topics,
     }
 
 
+def _split_parts(quiz_output: Any, topics_output: Any) -> Tuple[List[MCQQuestion], List[str]]:
+    """Leniently extract questions and topics from the two split-mode outputs."""
+    parts: List[Dict[str, Any]] = []
+    for output in (quiz_output, topics_output):
+        try:
+            parts.append(_safe_json_parse(_output_text(output)))
+        except LLMError:
+            parts.append({})
+    return _collect_questions(parts[0].get("questions")), _collect_topics(parts[1].get("topics"))
+
+
+def _combined_parts(output: Any) -> Tuple[List[MCQQuestion], List[str]]:
+    try:
+        data = _safe_json_parse(_output_text(output))
+    except LLMError:
+        return [], []
+    return _collect_questions(data.get("questions")), _collect_topics(data.get("topics"))
+
+
+def _use_combined() -> bool:
+    return settings.LLM_GENERATION_MODE == "combined"
+
+
+def _section_chunks(article: ScrapedArticleContent) -> List[SectionChunk]:
+    """Chunks to generate from in ``sections`` scope; empty in ``summary`` scope."""
+    if settings.LLM_CONTENT_SCOPE != "sections":
+        return []
+    return plan_chunks(
+        article.sections,
+        token_budget=settings.LLM_SECTION_TOKEN_BUDGET,
+        chunk_tokens=settings.LLM_SECTION_CHUNK_TOKENS,
+        max_chunks=settings.LLM_SECTION_MAX_CHUNKS,
+    )
+
+
+def _difficulty(question: MCQQuestion) -> str:
+    difficulty = (question.difficulty or "").strip().casefold()
+    return difficulty if difficulty in DIFFICULTIES else "medium"
+
+
+def _reduce_questions(
+    per_chunk: List[List[MCQQuestion]], limit: int = MAX_QUESTIONS
+) -> List[MCQQuestion]:
+    """Merge per-chunk questions into one quiz of at most ``limit`` questions.
+
+    Chunks are interleaved so each contributes, near-duplicates of earlier
+    questions are dropped (as the question bank defines them, see
+    ``app.services.dedup``), and difficulties are taken in turn so the quiz
+    stays balanced. The result is ordered from easy to hard.
+    """
+    interleaved: List[MCQQuestion] = []
+    for rank in range(max((len(questions) for questions in per_chunk), default=0)):
+        interleaved.extend(questions[rank] for questions in per_chunk if rank < len(questions))
+    kept = _collect_questions(interleaved)
+    if kept:
+        kept = dedupe_quiz(
+            LSHIndex(), QuizData(questions=kept), settings.QUESTION_DEDUP_THRESHOLD, reject=True
+        ).quiz.questions
+
+    buckets: Dict[str, List[MCQQuestion]] = {difficulty: [] for difficulty in DIFFICULTIES}
+    for question in kept:
+        buckets[_difficulty(question)].append(question)
+
+    selected: List[MCQQuestion] = []
+    while len(selected) < limit and any(buckets.values()):
+        for difficulty in DIFFICULTIES:
+            if buckets[difficulty] and len(selected) < limit:
+                selected.append(buckets[difficulty].pop(0))
+    return sorted(selected, key=lambda question: DIFFICULTIES.index(_difficulty(question)))
+
+
+async def _map_sections(title: str, chunks: List[SectionChunk]) -> List[List[MCQQuestion]]:
+    """Generate questions for every chunk, at most ``LLM_SECTION_CONCURRENCY`` at a time.
+
+    A failed chunk only loses its questions; if every chunk fails the first
+    error is raised.
+    """
+    semaphore = asyncio.Semaphore(max(settings.LLM_SECTION_CONCURRENCY, 1))
+    # Ask for a little more than an even share so the reduce step can choose.
+    per_chunk = -(-MAX_QUESTIONS // len(chunks)) + 1
+
+    async def generate(chunk: SectionChunk) -> List[MCQQuestion]:
+        chunk_input = {"title": title, "sections": chunk.text, "questions_per_chunk": per_chunk}
+        async with semaphore:
+            output = await _ainvoke(
+                "section_quiz", SECTION_QUIZ_PROMPT, chunk_input, accept=_accept_section_quiz
+            )
+        return _collect_questions(_output_data(output).get("questions"))
+
+    results = await asyncio.gather(*(generate(chunk) for chunk in chunks), return_exceptions=True)
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if len(errors) == len(results):
+        raise errors[0]
+    return [result for result in results if not isinstance(result, BaseException)]
+
+
+async def _agenerate_from_sections(
+    article: ScrapedArticleContent, chunks: List[SectionChunk]
+) -> Dict[str, Any]:
+    """Map the chunks to questions concurrently, reduce them, and add topics.
+
+    The related-topics chain runs alongside the chunk calls, so with enough
+    concurrency the whole step takes about as long as the slowest call.
+    """
+    common_input = _common_input(article)
+    try:
+        with stage("llm_sections"):
+            per_chunk, topics_output = await asyncio.gather(
+                _map_sections(article.title, chunks),
+                _ainvoke("topics", TOPICS_PROMPT, common_input, accept=_accept_topics),
+            )
+    except Exception as exc:  # pragma: no cover - external service
+        raise _wrap_provider_error(exc) from exc
+
+    topics = _collect_topics(_output_data(topics_output).get("topics"))
+    return await _complete_result(common_input, _reduce_questions(per_chunk), topics)
+
+
+def generate_quiz_and_topics(article: ScrapedArticleContent) -> Dict[str, Any]:
+    """Blocking wrapper around ``agenerate_quiz_and_topics`` for scripts."""
+    return asyncio.run(agenerate_quiz_and_topics(article))
+
+
+async def agenerate_quiz_and_topics(article: ScrapedArticleContent) -> Dict[str, Any]:
+    """Generate quiz questions and related topics for ``article``.
+
+    In ``combined`` mode (``LLM_GENERATION_MODE``) one JSON-mode call returns
+    both; in ``split`` mode the quiz and related-topics chains run
+    concurrently. Either way, invalid parts are dropped and re-asked. In
+    ``sections`` scope (``LLM_CONTENT_SCOPE``) questions come from chunks of
+    the article's sections instead of its summary.
+    """
+    chunks = _section_chunks(article)
+    if chunks:
+        return await _agenerate_from_sections(article, chunks)
+    common_input = _common_input(article)
+
+    try:
+        if _use_combined():
+            output = await _ainvoke(
+                "combined", COMBINED_PROMPT, common_input, json_mode=True, accept=_accept_combined
+            )
+            questions, topics = _combined_parts(output)
+        else:
+            quiz_output, topics_output = await asyncio.gather(
+                _ainvoke("quiz", QUIZ_PROMPT, common_input, accept=_accept_quiz),
+                _ainvoke("topics", TOPICS_PROMPT, common_input, accept=_accept_topics),
+            )
+            questions, topics = _split_parts(quiz_output, topics_output)
+    except Exception as exc:  # pragma: no cover - external service
+        raise _wrap_provider_error(exc) from exc
+
+    return await _complete_result(common_input, questions, topics)
+
+
+async def _stream_questions(
+    chain_name: str,
+    prompt_name: str,
+    common_input: Dict[str, str],
+    on_question: Callable[[MCQQuestion], Awaitable[None]],
+) -> Tuple[str, List[MCQQuestion]]:
+    """Stream one completion, reporting each valid question as it completes.
+
+    Returns the full completion text and the streamed questions. Streams are
+    neither retried nor hedged once a question has been sent, but a backend
+    that fails before sending any is replaced by the next one.
+    """
+    providers = provider_pool.order()
+    for attempt, provider in enumerate(providers):
+        chain = chain_registry.get_chain(prompt_name, provider=provider)
+        limiter = llm_limiter(provider)
+        parser = JsonArrayStreamParser("questions")
+        chunks: List[str] = []
+        questions: List[MCQQuestion] = []
+        usage = {"input_tokens": 0, "output_tokens": 0}
+        try:
+            with stage(f"llm_{chain_name}"):
+                async with limiter.slot():
+                    async for chunk in chain.astream(common_input):
+                        text = _output_text(chunk)
+                        chunks.append(text)
+                        for key, value in (getattr(chunk, "usage_metadata", None) or {}).items():
+                            if key in usage:
+                                usage[key] += value
+                        for item in parser.feed(text):
+                            collected = _collect_questions([item], questions)
+                            if len(collected) > len(questions):
+                                questions = collected
+                                await on_question(questions[-1])
+        except Exception as exc:
+            LLM_CALLS.inc(chain=chain_name, outcome="error")
+            provider_pool.record_failure(provider)
+            delay = throttle_delay(exc)
+            if delay is not None:
+                limiter.throttled(delay)
+            if questions or attempt == len(providers) - 1:
+                raise
+            LLM_HEDGES.inc(chain=chain_name, event="failover")
+            continue
+        limiter.succeeded()
+        provider_pool.record_success(provider)
+        LLM_CALLS.inc(chain=chain_name, outcome="ok")
+        _record_usage(chain_name, usage)
+        return "".join(chunks), questions
+    raise LLMError("No LLM provider configured")
+
+
+async def astream_quiz_and_topics(
+    article: ScrapedArticleContent,
+    on_question: Callable[[MCQQuestion], Awaitable[None]],
+) -> Dict[str, Any]:
+    """Like ``agenerate_quiz_and_topics`` but streams the quiz completion.
+
+    Each question is validated and handed to ``on_question`` as soon as its
+    JSON object is complete. In ``split`` mode the related-topics chain runs
+    alongside; in ``combined`` mode the topics follow the questions in the
+    same completion (streamed without JSON mode, relying on repair instead).
+    Questions re-asked afterwards are reported through ``on_question`` too.
+    In ``sections`` scope the merged quiz is only known once every chunk has
+    answered, so its questions are reported together at the end.
+    """
+    chunks = _section_chunks(article)
+    if chunks:
+        result = await _agenerate_from_sections(article, chunks)
+        for question in result["quiz"].questions:
+            await on_question(question)
+        return result
+    common_input = _common_input(article)
+    combined = _use_combined()
+    topics_task = None
+    if not combined:
+        topics_task = asyncio.ensure_future(
+            _ainvoke("topics", TOPICS_PROMPT, common_input, accept=_accept_topics)
+        )
+
+    try:
+        output, questions = await _stream_questions(
+            "combined" if combined else "quiz",
+            COMBINED_PROMPT if combined else QUIZ_PROMPT,
+            common_input,
+            on_question,
+        )
+        topics_output = await topics_task if topics_task is not None else None
+    except Exception as exc:  # pragma: no cover - external service
+        raise _wrap_provider_error(exc) from exc
+    finally:
+        if topics_task is not None and not topics_task.done():
+            topics_task.cancel()
+
+    if combined:
+        parsed_questions, topics = _combined_parts(output)
+    else:
+        parsed_questions, topics = _split_parts(output, topics_output)
+    if not questions:
+        # The incremental parser found nothing usable; fall back to the repaired
+        # full completion.
+        questions = parsed_questions
+        for question in questions:
+            await on_question(question)
+
+    streamed = len(questions)
+    result = await _complete_result(common_input, questions, topics)
+    for question in result["quiz"].questions[streamed:]:
+        await on_question(question)
+    return result
@@ -0,0 +1,259 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels[name]) for name in self.labelnames), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {value:g}" for key, value in items
+        ]
+
+
+class Gauge(Counter):
+    """Value that can go up and down, with optional labels."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts..., +Inf count], sum
+        self._values: Dict[LabelValues, Tuple[List[int], float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        lines: List[str] = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                labels = _format_labels(self.labelnames, key, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {total:g}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+_registry: List = []
+
+
+def _register(metric):
+    _registry.append(metric)
+    return metric
+
+
+def render_metrics() -> str:
+    """All registered metrics in the Prometheus text exposition format."""
+    lines: List[str] = []
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.help_text}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+REQUEST_SECONDS = _register(
+    Histogram("wikiquiz_request_seconds", "HTTP request latency.", ["method", "route", "status"])
+)
+STAGE_SECONDS = _register(
+    Histogram("wikiquiz_stage_seconds", "Time spent in each pipeline stage.", ["stage"])
+)
+CACHE_REQUESTS = _register(
+    Counter("wikiquiz_cache_requests_total", "Cache lookups by cache and result.", ["cache", "result"])
+)
+LLM_CALLS = _register(
+    Counter("wikiquiz_llm_calls_total", "LLM chain calls by chain and outcome.", ["chain", "outcome"])
+)
+LLM_TOKENS = _register(
+    Counter("wikiquiz_llm_tokens_total", "LLM tokens by chain and kind.", ["chain", "kind"])
+)
+LLM_HEDGES = _register(
+    Counter(
+        "wikiquiz_llm_hedges_total",
+        "Hedged and failed-over LLM calls, and calls won by a backup backend.",
+        ["chain", "event"],
+    )
+)
+LLM_REASKS = _register(
+    Counter("wikiquiz_llm_reasks_total", "Re-asks after invalid LLM output.", ["part"])
+)
+QUESTION_DEDUP = _register(
+    Counter(
+        "wikiquiz_question_dedup_total",
+        "Generated questions by near-duplicate check result (new, merged, rejected).",
+        ["result"],
+    )
+)
+RETRIES = _register(
+    Counter("wikiquiz_retries_total", "Retried attempts by operation.", ["operation"])
+)
+LIMITER_QUEUE_DEPTH = _register(
+    Gauge("wikiquiz_limiter_queue_depth", "Calls waiting for an outbound rate limiter.", ["limiter"])
+)
+LIMITER_IN_FLIGHT = _register(
+    Gauge("wikiquiz_limiter_in_flight", "Outbound calls currently running.", ["limiter"])
+)
+LIMITER_WINDOW = _register(
+    Gauge("wikiquiz_limiter_window", "Current adaptive concurrency limit.", ["limiter"])
+)
+LIMITER_WAIT_SECONDS = _register(
+    Histogram("wikiquiz_limiter_wait_seconds", "Time spent queued for an outbound call.", ["limiter"])
+)
+LIMITER_EVENTS = _register(
+    Counter(
+        "wikiquiz_limiter_events_total",
+        "Throttling responses and calls rejected at their deadline.",
+        ["limiter", "event"],
+    )
+)
+DB_POOL_WAIT_SECONDS = _register(
+    Histogram(
+        "wikiquiz_db_pool_wait_seconds",
+        "Time spent waiting for a pooled database connection.",
+        buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+    )
+)
+
+
+# ---------------------------
+# Per-request traces
+# ---------------------------
+
+
+class RequestTrace:
+    """Stage timings recorded while serving one request, in order."""
+
+    def __init__(self) -> None:
+        self.stages: List[Tuple[str, float]] = []
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stages.append((stage, seconds))
+
+    def breakdown(self) -> str:
+        with self._lock:
+            stages = list(self.stages)
+        return " ".join(f"{stage}={seconds:.3f}s" for stage, seconds in stages)
+
+
+# Tasks and ``asyncio.to_thread`` copy the context, so stages run anywhere on
+# behalf of a request land in its trace.
+_current_trace: contextvars.ContextVar[Optional[RequestTrace]] = contextvars.ContextVar(
+    "wikiquiz_request_trace", default=None
+)
+
+
+def start_trace() -> Tuple[RequestTrace, contextvars.Token]:
+    trace = RequestTrace()
+    return trace, _current_trace.set(trace)
+
+
+def end_trace(token: contextvars.Token) -> None:
+    _current_trace.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block into ``wikiquiz_stage_seconds`` and the current request trace."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(name, elapsed)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def record_retry(operation: str):
+    """A tenacity ``before_sleep`` hook counting retries of ``operation``."""
+
+    def before_sleep(retry_state) -> None:
+        RETRIES.inc(operation=operation)
+
+    return before_sleep
@@ -0,0 +1,128 @@
+"""Question bank: the questions of every stored quiz, normalized into ``questions``.
+
+Each persisted quiz adds its questions to the bank, once per distinct question
+text per article and leaving out near-duplicates of banked questions (see
+``app.services.dedup``), and new quizzes of a requested size and difficulty mix are
+assembled from the bank in one query instead of calling the LLM.
+"""
+import hashlib
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from sqlalchemy import Select, case, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.models.question_model import Question
+from app.services.dedup import encode_signature
+from app.schemas.quiz_schema import MCQOption, MCQQuestion, QuizData
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+def question_text_hash(text: str) -> str:
+    """SHA-256 of ``text`` lower-cased with whitespace collapsed (as in migration 0008)."""
+    return hashlib.sha256(" ".join(text.split()).lower().encode("utf-8")).hexdigest()
+
+
+def normalize_difficulty(difficulty: Any) -> str:
+    value = str(difficulty or "").strip().lower()
+    return value if value in DIFFICULTIES else "medium"
+
+
+def question_rows(
+    article_id: int, quiz_id: int, questions: Iterable[Tuple[MCQQuestion, Sequence[int]]]
+) -> List[Dict[str, Any]]:
+    """``questions`` rows for new questions of a stored quiz, given with their signatures."""
+    rows: Dict[str, Dict[str, Any]] = {}
+    for question, signature in questions:
+        text_hash = question_text_hash(question.question)
+        rows.setdefault(
+            text_hash,
+            {
+                "article_id": article_id,
+                "quiz_id": quiz_id,
+                "difficulty": normalize_difficulty(question.difficulty),
+                "text_hash": text_hash,
+                "question": question.question,
+                "options": [option.text for option in question.options],
+                "correct_answer": question.correct_answer,
+                "explanation": question.explanation,
+                "signature": encode_signature(signature),
+            },
+        )
+    return list(rows.values())
+
+
+def insert_questions_stmt(rows: List[Dict[str, Any]]):
+    """Add ``rows`` to the bank, skipping questions the article already has."""
+    return (
+        pg_insert(Question)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[Question.article_id, Question.text_hash])
+    )
+
+
+def allocate(count: int, mix: Mapping[str, float]) -> Dict[str, int]:
+    """Split ``count`` questions over the difficulties in proportion to ``mix``.
+
+    ``mix`` holds relative weights; an empty or all-zero mix splits evenly.
+    Rounding goes to the largest remainders, so the parts add up to ``count``.
+    """
+    weights = {difficulty: max(float(mix.get(difficulty, 0.0)), 0.0) for difficulty in DIFFICULTIES}
+    total = sum(weights.values())
+    if total <= 0:
+        weights = dict.fromkeys(DIFFICULTIES, 1.0)
+        total = float(len(DIFFICULTIES))
+    shares = {difficulty: count * weight / total for difficulty, weight in weights.items()}
+    counts = {difficulty: int(share) for difficulty, share in shares.items()}
+    by_remainder = sorted(DIFFICULTIES, key=lambda d: (counts[d] - shares[d], DIFFICULTIES.index(d)))
+    for difficulty in by_remainder[: count - sum(counts.values())]:
+        counts[difficulty] += 1
+    return counts
+
+
+def sample_questions_stmt(article_id: int, counts: Mapping[str, int]) -> Select:
+    """Random bank questions of an article, ``counts[difficulty]`` of each difficulty.
+
+    Where the bank runs short of one difficulty the rest is made up from the
+    others, so up to ``sum(counts)`` rows come back.
+    """
+    ranked = (
+        select(
+            Question.question,
+            Question.options,
+            Question.correct_answer,
+            Question.explanation,
+            Question.difficulty,
+            func.row_number()
+            .over(partition_by=Question.difficulty, order_by=func.random())
+            .label("position"),
+        )
+        .where(Question.article_id == article_id)
+        .subquery()
+    )
+    wanted = case(
+        {difficulty: counts.get(difficulty, 0) for difficulty in DIFFICULTIES},
+        value=ranked.c.difficulty,
+        else_=0,
+    )
+    return (
+        select(ranked)
+        .order_by(ranked.c.position > wanted, func.random())
+        .limit(sum(counts.values()))
+    )
+
+
+def bank_quiz(rows: Sequence[Mapping[str, Any]]) -> QuizData:
+    """Quiz of sampled bank ``rows``, ordered from easy to hard."""
+    questions = [
+        MCQQuestion(
+            question=row["question"],
+            options=[MCQOption(text=text) for text in row["options"]],
+            correct_answer=row["correct_answer"],
+            explanation=row["explanation"],
+            difficulty=row["difficulty"],
+        )
+        for row in rows
+    ]
+    questions.sort(key=lambda question: DIFFICULTIES.index(normalize_difficulty(question.difficulty)))
+    return QuizData(questions=questions)
@@ -1,104 +1,670 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+import json
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
-from sqlalchemy import select
+from sqlalchemy import Select, cast, func, literal, select, union_all, update
+from sqlalchemy.dialects.postgresql import REGCONFIG, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.config import get_settings
+from app.models.article_alias_model import ArticleAlias
 from app.models.article_model import Article
 from app.models.quiz_model import Quiz
 from app.schemas.article_schema import ArticleCreate, ArticleInDB, ScrapedArticleContent
-from app.schemas.quiz_schema import GenerateQuizRequest, QuizData
+from app.schemas.quiz_schema import AssembleQuizRequest, GenerateQuizRequest, MCQQuestion, QuizData
 from app.services.entity_extractor import extract_entities
-from app.services.llm_service import generate_quiz_and_topics
-from app.services.scraper_service import InvalidWikipediaURLError, scrape_wikipedia_article
+from app.services.html_store import store_html
+from app.services import response_cache
+from app.services.dedup import ArticleIndexes, DedupResult, dedupe_quiz, question_signature
+from app.services.metrics import QUESTION_DEDUP, record_cache, stage
+from app.services.question_bank import (
+    allocate,
+    bank_quiz,
+    insert_questions_stmt,
+    question_rows,
+    sample_questions_stmt,
+)
+from app.services.rate_limiter import RateLimitTimeout
+from app.services.llm_service import LLMError, agenerate_quiz_and_topics, astream_quiz_and_topics
+from app.services.scraper_service import (
+    InvalidWikipediaURLError,
+    content_hash,
+    fetch_latest_revision,
+    normalize_article_url,
+    resolve_canonical_url,
+    scrape_wikipedia_article,
+)
+from app.services.singleflight import GenerationLockTimeout, SingleFlight, pg_advisory_lock
+
+settings = get_settings()
+
+# Text search configuration of the generated search_vector columns.
+SEARCH_CONFIG = "english"
+
+# Process-wide registry of in-flight generations, keyed on article URLs.
+_generation_flight = SingleFlight()
+# Near-duplicate indexes of the article's banked questions.
+_article_indexes = ArticleIndexes(settings.QUESTION_DEDUP_CACHE_ARTICLES)
+
+# Receives the name of each pipeline stage as it starts (used by background jobs).
+ProgressCallback = Callable[[str], Awaitable[None]]
+# Receives each question as soon as the LLM has produced and validated it.
+QuestionCallback = Callable[[MCQQuestion], Awaitable[None]]
+
+
+class GeneratedQuiz(NamedTuple):
+    """A scraped article and its generated quiz, ready to be written."""
+
+    scraped: ScrapedArticleContent
+    quiz: QuizData
+    related_topics: List[str]
+    aliases: Set[str]
+
+
+async def _report(progress: Optional[ProgressCallback], stage: str) -> None:
+    if progress is not None:
+        await progress(stage)
 
 
 class QuizService:
     """High-level orchestration for scraping, generating, and persisting quizzes."""
 
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: Optional[Session] = None, async_db: Optional[AsyncSession] = None) -> None:
+        # Generation and writes use ``db``; read paths use ``async_db`` when given.
         self.db = db
+        self.async_db = async_db
 
     # ---------------------------
     # Core workflow
     # ---------------------------
 
-    def generate_quiz(self, payload: GenerateQuizRequest) -> Dict[str, Any]:
-        """Generate or fetch a quiz for the given article URL."""
-        # Cache: if we already have this URL, just return its latest quiz
-        existing_article = self._get_article_by_url(str(payload.url))
-        if existing_article:
-            latest_quiz = (
-                self.db.execute(
-                    select(Quiz)
-                    .where(Quiz.article_id == existing_article.id)
-                    .order_by(Quiz.id.desc())
+    async def generate_quiz(
+        self,
+        payload: GenerateQuizRequest,
+        progress: Optional[ProgressCallback] = None,
+        on_question: Optional[QuestionCallback] = None,
+        refresh: bool = False,
+    ) -> Dict[str, Any]:
+        """Generate or fetch a quiz for the given article URL.
+
+        Blocking work (database access, parsing) runs in worker threads so the
+        event loop stays free while HTTP fetches and LLM calls are awaited.
+        Concurrent requests for the same article share a single generation;
+        only the leader reports ``progress`` and streams to ``on_question``.
+        With ``refresh`` (or once ``ARTICLE_REFRESH_TTL_SECONDS`` has passed)
+        a known article is checked against its live revision and its quiz is
+        regenerated only if the article's content changed.
+        """
+        try:
+            url = normalize_article_url(str(payload.url))
+        except InvalidWikipediaURLError as e:
+            raise ValueError(str(e)) from e
+
+        # Cache: if we already know this URL (or an alias of it), return its latest quiz
+        cached = await self._get_cached_response(url)
+        if cached:
+            if not (refresh or _is_stale(cached["article"])):
+                return cached
+            article_url = cached["article"]["url"]
+            return await _generation_flight.do(
+                article_url, lambda: self._refresh(article_url, cached, progress, on_question)
+            )
+
+        return await _generation_flight.do(
+            url, lambda: self._resolve_and_generate(url, progress, on_question)
+        )
+
+    async def get_current_quiz(self, url: str) -> Optional[Dict[str, Any]]:
+        """Latest quiz for an already normalized ``url``, unless it is unknown or due a refresh check."""
+        cached = await self._get_cached_response(url)
+        if cached and not _is_stale(cached["article"]):
+            return cached
+        return None
+
+    async def _refresh(
+        self,
+        url: str,
+        cached: Dict[str, Any],
+        progress: Optional[ProgressCallback],
+        on_question: Optional[QuestionCallback],
+    ) -> Dict[str, Any]:
+        """Re-check a known article; regenerate only if its content changed."""
+        await _report(progress, "checking_revision")
+        with stage("check_revision"):
+            revision_id = await fetch_latest_revision(url)
+        if revision_id is not None and revision_id == cached["article"].get("revision_id"):
+            return await self._mark_checked(cached, revision_id, None)
+        return await self._generate_exclusive(url, {url}, progress, on_question, previous=cached)
+
+    async def _mark_checked(
+        self, cached: Dict[str, Any], revision_id: Optional[int], content_hash: Optional[str]
+    ) -> Dict[str, Any]:
+        """Record that ``cached`` is still current as of now and return it updated."""
+        article = dict(cached["article"])
+        article["checked_at"] = datetime.utcnow()
+        if revision_id is not None:
+            article["revision_id"] = revision_id
+        if content_hash is not None:
+            article["content_hash"] = content_hash
+        await asyncio.to_thread(
+            self._touch_article,
+            article["id"],
+            article.get("revision_id"),
+            article.get("content_hash"),
+            article["checked_at"],
+        )
+        response = {**cached, "article": article}
+        await asyncio.to_thread(self._cache_latest, response, {article["url"]})
+        return response
+
+    async def _resolve_and_generate(
+        self,
+        url: str,
+        progress: Optional[ProgressCallback],
+        on_question: Optional[QuestionCallback],
+    ) -> Dict[str, Any]:
+        """Resolve redirects to the canonical article, then generate once per canonical URL."""
+        await _report(progress, "resolving")
+        with stage("resolve_url"):
+            canonical_url = await resolve_canonical_url(url)
+        aliases = {url, canonical_url}
+        if canonical_url == url:
+            # Already the leader for this key; joining its flight would wait on itself.
+            return await self._generate_exclusive(url, aliases, progress, on_question)
+        cached = await self._get_cached_response(canonical_url, aliases=aliases)
+        if cached:
+            return cached
+
+        return await _generation_flight.do(
+            canonical_url,
+            lambda: self._generate_exclusive(canonical_url, aliases, progress, on_question),
+        )
+
+    async def _generate_exclusive(
+        self,
+        url: str,
+        aliases: Set[str],
+        progress: Optional[ProgressCallback],
+        on_question: Optional[QuestionCallback],
+        reuse_cached: bool = True,
+        previous: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Run the generation as the single leader for ``url``.
+
+        With ``reuse_cached`` off, a quiz another process stored while this
+        one waited for the lock does not stand in for a new generation. When
+        refreshing ``previous``, only a quiz newer than it does.
+        """
+        if settings.GENERATION_LOCK_MODE != "postgres":
+            return await self._generate(url, aliases, progress, on_question, previous=previous)
+
+        await _report(progress, "waiting_for_lock")
+        async with pg_advisory_lock(
+            url,
+            poll_interval=settings.GENERATION_LOCK_POLL_SECONDS,
+            timeout=settings.GENERATION_LOCK_TIMEOUT_SECONDS,
+        ):
+            # Another process may have finished while we waited for the lock.
+            cached = await self._get_cached_response(url, aliases=aliases) if reuse_cached else None
+            if cached and (previous is None or cached["id"] != previous["id"]):
+                return cached
+            return await self._generate(url, aliases, progress, on_question, previous=previous)
+
+    async def _get_cached_response(
+        self, url: str, aliases: Optional[Set[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Latest quiz for ``url``, from the response cache or the database.
+
+        New ``aliases`` still go through the database so they get recorded.
+        """
+        with stage("cache_lookup"):
+            if not aliases:
+                body = await asyncio.to_thread(response_cache.get_latest_quiz_body, url)
+                record_cache("response", hit=body is not None)
+                if body is not None:
+                    return json.loads(body)
+
+            if self.async_db is not None and not aliases:
+                existing_article, latest_quiz = await self._aget_cached_quiz(url)
+            else:
+                existing_article, latest_quiz = await asyncio.to_thread(
+                    self._get_cached_quiz, url, aliases
                 )
-                .scalars()
-                .first()
+        record_cache("quiz_db", hit=bool(existing_article and latest_quiz))
+        if existing_article and latest_quiz:
+            response = self._build_quiz_response(existing_article, latest_quiz)
+            await asyncio.to_thread(
+                self._cache_latest, response, (aliases or set()) | {url}
             )
-            if latest_quiz:
-                return self._build_quiz_response(existing_article, latest_quiz)
+            return response
+        return None
+
+    def _cache_latest(self, response: Dict[str, Any], urls: Set[str]) -> None:
+        response_cache.put_latest_quiz(
+            sorted(urls),
+            response["article"]["id"],
+            response["id"],
+            response_cache.encode_response(response),
+        )
+
+    async def _generate(
+        self,
+        url: str,
+        aliases: Set[str],
+        progress: Optional[ProgressCallback],
+        on_question: Optional[QuestionCallback],
+        previous: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        with stage("find_article"):
+            existing_article = await asyncio.to_thread(self._find_article, url)
 
         # Scrape article
+        await _report(progress, "scraping")
         try:
-            scraped: ScrapedArticleContent = scrape_wikipedia_article(str(payload.url))
+            scraped: ScrapedArticleContent = await scrape_wikipedia_article(url)
         except InvalidWikipediaURLError as e:
             raise ValueError(str(e)) from e
 
+        # Refreshing: a new revision that leaves summary and sections unchanged
+        # (typo fixes elsewhere, infobox or category edits) keeps the quiz.
+        if previous is not None and scraped.content_hash == _article_content_hash(
+            previous["article"]
+        ):
+            return await self._mark_checked(previous, scraped.revision_id, scraped.content_hash)
+
         # Enrich with entities
-        scraped.entities = extract_entities(scraped.text)
+        await _report(progress, "extracting_entities")
+        with stage("extract_entities"):
+            scraped.entities = await asyncio.to_thread(extract_entities, scraped.text)
 
-        # Call LLM for quiz and topics
-        llm_result = generate_quiz_and_topics(scraped)
+        # Call LLM for quiz and topics (both chains run concurrently)
+        await _report(progress, "generating")
+        if on_question is not None:
+            llm_result = await astream_quiz_and_topics(scraped, on_question)
+        else:
+            llm_result = await agenerate_quiz_and_topics(scraped)
         quiz: QuizData = llm_result["quiz"]
         related_topics: List[str] = llm_result["related_topics"]
 
         # Persist article (or reuse existing) and quiz
-        article_model = existing_article or self._create_article(scraped)
-        quiz_model = self._create_quiz(article_model.id, quiz, related_topics)
+        await _report(progress, "saving")
+        with stage("persist"):
+            article_model, quiz_model = await asyncio.to_thread(
+                self._persist, existing_article, scraped, quiz, related_topics, aliases
+            )
 
-        return self._build_quiz_response(article_model, quiz_model)
+        response = self._build_quiz_response(article_model, quiz_model)
+        # The new quiz replaces the article's cached "latest" entry.
+        await asyncio.to_thread(self._cache_latest, response, aliases | {article_model.url})
+        return response
+
+    async def assemble_quiz(self, payload: AssembleQuizRequest) -> Dict[str, Any]:
+        """Build and store a new quiz for an article from its question bank.
+
+        ``payload.count`` questions are sampled at random in the proportions of
+        ``payload.difficulty_mix``, made up from other difficulties where the
+        bank runs short of one. The LLM is only called when the article is
+        unknown or its bank holds fewer than ``count`` questions, at most once
+        per request, so the quiz can come back shorter than asked.
+        """
+        try:
+            url = normalize_article_url(str(payload.url))
+        except InvalidWikipediaURLError as e:
+            raise ValueError(str(e)) from e
+        counts = allocate(payload.count, payload.difficulty_mix)
+
+        with stage("find_article"):
+            article = await asyncio.to_thread(self._find_article, url)
+        if article is None:
+            generated = await self.generate_quiz(GenerateQuizRequest(url=url))
+            article_id = generated["article"]["id"]
+        else:
+            article_id = article.id
+
+        with stage("sample_bank"):
+            rows = await asyncio.to_thread(self._sample_bank, article_id, counts)
+        if len(rows) < payload.count and article is not None:
+            # Too few questions banked: one more generation adds fresh ones.
+            # The article already has a quiz, so skip the cached-response
+            # shortcut, but keep the cross-process lock of a normal generation.
+            await _generation_flight.do(
+                article.url,
+                lambda: self._generate_exclusive(
+                    article.url, {article.url}, None, None, reuse_cached=False
+                ),
+            )
+            with stage("sample_bank"):
+                rows = await asyncio.to_thread(self._sample_bank, article_id, counts)
+        if not rows:
+            raise ValueError("No questions are available for this article.")
+
+        with stage("persist"):
+            article_model, quiz_model = await asyncio.to_thread(
+                self._insert_assembled_quiz, article_id, bank_quiz(rows)
+            )
+        response = self._build_quiz_response(article_model, quiz_model)
+        await asyncio.to_thread(self._cache_latest, response, {url, article_model.url})
+        return response
+
+    async def stream_quiz(
+        self, payload: GenerateQuizRequest, refresh: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Generate (or fetch) a quiz, yielding events as soon as they are available.
+
+        Events are ``stage`` (pipeline progress), ``question`` (one validated
+        question, in order), then a final ``complete`` carrying the persisted
+        quiz id, article and related topics, or ``error``. Cache hits and
+        requests that join another in-flight generation get all questions at
+        once when the quiz is ready.
+        """
+        events: asyncio.Queue = asyncio.Queue()
+
+        async def progress(stage: str) -> None:
+            await events.put({"event": "stage", "stage": stage})
+
+        async def on_question(question: MCQQuestion) -> None:
+            await events.put({"event": "question", "question": question.model_dump()})
+
+        task = asyncio.create_task(
+            self.generate_quiz(payload, progress=progress, on_question=on_question, refresh=refresh)
+        )
+        task.add_done_callback(lambda _: events.put_nowait(None))
+        streamed = 0
+        try:
+            while (event := await events.get()) is not None:
+                if event["event"] == "question":
+                    event["index"] = streamed
+                    streamed += 1
+                yield event
+
+            try:
+                result = task.result()
+            except (ValueError, LLMError, GenerationLockTimeout, RateLimitTimeout) as e:
+                yield {"event": "error", "detail": str(e)}
+                return
+
+            for index, question in enumerate(result["quiz"]["questions"][streamed:], start=streamed):
+                yield {"event": "question", "index": index, "question": question}
+            yield {
+                "event": "complete",
+                "id": result["id"],
+                "article": result["article"],
+                "related_topics": result["related_topics"],
+            }
+        finally:
+            if not task.done():
+                task.cancel()
 
     # ---------------------------
     # Persistence helpers
     # ---------------------------
 
     def _get_article_by_url(self, url: str) -> Optional[Article]:
-        stmt = select(Article).where(Article.url == url)
-        return self.db.execute(stmt).scalars().first()
-
-    def _create_article(self, scraped: ScrapedArticleContent) -> Article:
-        article_in = ArticleCreate(
-            url=scraped.url,
-            title=scraped.title,
-            summary=scraped.summary,
-            sections={"sections": scraped.sections},
-            entities=scraped.entities.model_dump(),
-            raw_html=scraped.raw_html,
+        return self.db.execute(_article_by_url_stmt(url)).scalars().first()
+
+    async def _aget_article_by_url(self, url: str) -> Optional[Article]:
+        return (await self.async_db.execute(_article_by_url_stmt(url))).scalars().first()
+
+    def _get_latest_quiz(self, article_id: int) -> Optional[Quiz]:
+        return self.db.execute(_latest_quiz_stmt(article_id)).scalars().first()
+
+    async def _aget_latest_quiz(self, article_id: int) -> Optional[Quiz]:
+        return (await self.async_db.execute(_latest_quiz_stmt(article_id))).scalars().first()
+
+    def _find_article(self, url: str) -> Optional[Article]:
+        stmt = (
+            select(Article)
+            .join(ArticleAlias, ArticleAlias.article_id == Article.id)
+            .where(ArticleAlias.alias == url)
         )
-        article = Article(
-            url=str(article_in.url),
-            title=article_in.title,
-            summary=article_in.summary,
-            sections=article_in.sections,
-            entities=article_in.entities,
-            raw_html=article_in.raw_html,
+        article = self.db.execute(stmt).scalars().first()
+        # Rows written before aliases existed are only reachable by their URL.
+        return article or self._get_article_by_url(url)
+
+    def _get_cached_quiz(
+        self, url: str, aliases: Optional[Set[str]] = None
+    ) -> Tuple[Optional[Article], Optional[Quiz]]:
+        """Look up an article and its latest quiz by any known URL variant.
+
+        The common case is a single indexed query through ``article_aliases``.
+        When ``aliases`` is given and the article is found, those variants are
+        recorded so the next lookup by any of them hits directly.
+        """
+        row = self.db.execute(_cached_quiz_stmt(url)).first()
+        if row:
+            article, quiz = row
+        else:
+            article = self._get_article_by_url(url)
+            if not article:
+                return None, None
+            quiz = self._get_latest_quiz(article.id)
+
+        if aliases:
+            self._record_aliases(article.id, aliases)
+            self.db.commit()
+        return article, quiz
+
+    async def _aget_cached_quiz(self, url: str) -> Tuple[Optional[Article], Optional[Quiz]]:
+        """Read-only async variant of ``_get_cached_quiz``."""
+        row = (await self.async_db.execute(_cached_quiz_stmt(url))).first()
+        if row:
+            return row[0], row[1]
+        article = await self._aget_article_by_url(url)
+        if not article:
+            return None, None
+        return article, await self._aget_latest_quiz(article.id)
+
+    def _record_aliases(self, article_id: int, aliases: Set[str]) -> None:
+        self._record_alias_rows({alias: article_id for alias in aliases})
+
+    def _record_alias_rows(self, article_ids: Mapping[str, int]) -> None:
+        """Map each alias to its article id, keeping aliases that already exist."""
+        stmt = (
+            pg_insert(ArticleAlias)
+            .values(
+                [{"alias": alias, "article_id": article_ids[alias]} for alias in sorted(article_ids)]
+            )
+            .on_conflict_do_nothing(index_elements=[ArticleAlias.alias])
         )
-        self.db.add(article)
-        self.db.commit()
-        self.db.refresh(article)
-        return article
-
-    def _create_quiz(self, article_id: int, quiz: QuizData, related_topics: List[str]) -> Quiz:
-        quiz_model = Quiz(
-            article_id=article_id,
-            quiz_data=quiz.model_dump(),
-            related_topics=related_topics,
+        self.db.execute(stmt)
+
+    def _persist(
+        self,
+        existing_article: Optional[Article],
+        scraped: ScrapedArticleContent,
+        quiz: QuizData,
+        related_topics: List[str],
+        aliases: Set[str],
+    ) -> Tuple[Article, Quiz]:
+        """Write the article, its new quiz and its aliases in one transaction.
+
+        The article is upserted on its URL (an already known article keeps
+        its row and URL and gets the freshly scraped content), so concurrent
+        writers cannot lose the race on the unique constraint.
+        """
+        try:
+            with stage("db_upsert_article"):
+                article_model = self._upsert_article(scraped, existing_article)
+            with stage("dedup"):
+                deduped = self._dedupe({article_model.id: quiz})[article_model.id]
+            with stage("db_insert_quiz"):
+                quiz_model = self._insert_quiz(article_model, deduped.quiz, related_topics)
+                self._add_to_bank(question_rows(article_model.id, quiz_model.id, deduped.novel))
+                self._record_aliases(article_model.id, aliases | {article_model.url})
+            with stage("db_commit"):
+                self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        self._forget_cached_quizzes([article_model.id])
+        return article_model, quiz_model
+
+    def _touch_article(
+        self,
+        article_id: int,
+        revision_id: Optional[int],
+        content_hash: Optional[str],
+        checked_at: datetime,
+    ) -> None:
+        stmt = (
+            update(Article)
+            .where(Article.id == article_id)
+            .values(revision_id=revision_id, content_hash=content_hash, checked_at=checked_at)
         )
-        self.db.add(quiz_model)
+        self.db.execute(stmt)
         self.db.commit()
-        self.db.refresh(quiz_model)
-        return quiz_model
+        self._forget_cached_quizzes([article_id])
+
+    def _forget_cached_quizzes(self, article_ids: Sequence[int]) -> None:
+        """Drop the cached bodies of every quiz of ``article_ids`` after their articles changed."""
+        if not settings.RESPONSE_CACHE_ENABLED:
+            return
+        quiz_ids = self.db.scalars(select(Quiz.id).where(Quiz.article_id.in_(article_ids))).all()
+        response_cache.forget_quiz_bodies(quiz_ids)
+
+    def _upsert_article(
+        self, scraped: ScrapedArticleContent, existing_article: Optional[Article]
+    ) -> Article:
+        values = _article_values(scraped, existing_article.url if existing_article else None)
+        stmt = _upsert_articles_stmt([values])
+        return self.db.scalars(stmt, execution_options={"populate_existing": True}).one()
+
+    def _insert_quiz(self, article: Article, quiz: QuizData, related_topics: List[str]) -> Quiz:
+        stmt = pg_insert(Quiz).values(**_quiz_values(article, quiz, related_topics)).returning(Quiz)
+        return self.db.scalars(stmt).one()
+
+    def _dedupe(self, quizzes: Mapping[int, QuizData]) -> Dict[int, DedupResult]:
+        """Check new quizzes, by article id, for near-duplicates of banked questions."""
+        mode = settings.QUESTION_DEDUP_MODE
+        if mode == "off":
+            return {
+                article_id: DedupResult(
+                    quiz, [(question, question_signature(question)) for question in quiz.questions], 0
+                )
+                for article_id, quiz in quizzes.items()
+            }
+        indexes = _article_indexes.get_many(self.db, quizzes)
+        results = {}
+        for article_id, quiz in quizzes.items():
+            result = dedupe_quiz(
+                indexes[article_id], quiz, settings.QUESTION_DEDUP_THRESHOLD, reject=mode == "reject"
+            )
+            QUESTION_DEDUP.inc(len(result.novel), result="new")
+            if result.duplicates:
+                QUESTION_DEDUP.inc(
+                    result.duplicates, result="rejected" if mode == "reject" else "merged"
+                )
+            results[article_id] = result
+        return results
+
+    def _add_to_bank(self, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            self.db.execute(insert_questions_stmt(rows))
+
+    def _sample_bank(self, article_id: int, counts: Mapping[str, int]) -> List[Mapping[str, Any]]:
+        return list(self.db.execute(sample_questions_stmt(article_id, counts)).mappings().all())
+
+    def _insert_assembled_quiz(self, article_id: int, quiz: QuizData) -> Tuple[Article, Quiz]:
+        """Store a quiz assembled from the bank, with the latest quiz's related topics."""
+        try:
+            article = self.db.get(Article, article_id)
+            latest = self._get_latest_quiz(article_id)
+            related_topics = (latest.related_topics or []) if latest else []
+            quiz_model = self._insert_quiz(article, quiz, related_topics)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return article, quiz_model
+
+    def persist_batch(self, items: Sequence[GeneratedQuiz]) -> List[Dict[str, Any]]:
+        """Write many new quizzes in one transaction, one statement per table.
+
+        Items resolving to the same article URL are written once (the last
+        wins). Returns the quiz response of each item, in order; they are also
+        placed in the response cache.
+        """
+        by_url: Dict[str, Tuple[Dict[str, Any], GeneratedQuiz]] = {}
+        item_urls = []
+        for item in items:
+            values = _article_values(item.scraped)
+            by_url[values["url"]] = (values, item)
+            item_urls.append(values["url"])
+        if not by_url:
+            return []
+
+        try:
+            with stage("db_upsert_article"):
+                stmt = _upsert_articles_stmt([values for values, _ in by_url.values()])
+                articles = {
+                    article.url: article
+                    for article in self.db.scalars(
+                        stmt, execution_options={"populate_existing": True}
+                    ).all()
+                }
+            with stage("dedup"):
+                deduped = self._dedupe(
+                    {articles[url].id: item.quiz for url, (_, item) in by_url.items()}
+                )
+            with stage("db_insert_quiz"):
+                quiz_rows = []
+                alias_rows = {}
+                for url, (_, item) in by_url.items():
+                    article = articles[url]
+                    quiz_rows.append(
+                        _quiz_values(article, deduped[article.id].quiz, item.related_topics)
+                    )
+                    for alias in item.aliases | {url}:
+                        alias_rows.setdefault(alias, article.id)
+                quizzes = {
+                    quiz.article_id: quiz
+                    for quiz in self.db.scalars(pg_insert(Quiz).values(quiz_rows).returning(Quiz)).all()
+                }
+                bank_rows = []
+                for url in by_url:
+                    article_id = articles[url].id
+                    bank_rows.extend(
+                        question_rows(article_id, quizzes[article_id].id, deduped[article_id].novel)
+                    )
+                self._add_to_bank(bank_rows)
+                self._record_alias_rows(alias_rows)
+            with stage("db_commit"):
+                self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        self._forget_cached_quizzes([article.id for article in articles.values()])
+
+        responses = {}
+        for url, (_, item) in by_url.items():
+            article = articles[url]
+            responses[url] = self._build_quiz_response(article, quizzes[article.id])
+            self._cache_latest(responses[url], item.aliases | {url})
+        return [responses[url] for url in item_urls]
+
+    def cached_urls(self, urls: Sequence[str]) -> Set[str]:
+        """The URLs in ``urls`` that already belong to a known article."""
+        found: Set[str] = set()
+        for start in range(0, len(urls), 1000):
+            chunk = list(urls[start : start + 1000])
+            found.update(self.db.scalars(select(ArticleAlias.alias).where(ArticleAlias.alias.in_(chunk))))
+            found.update(self.db.scalars(select(Article.url).where(Article.url.in_(chunk))))
+        return found
 
     # ---------------------------
     # Response builders
@@ -112,10 +678,14 @@ class QuizService:
             summary=article.summary,
             sections=article.sections,
             entities=article.entities,
+            revision_id=article.revision_id,
+            content_hash=article.content_hash,
+            checked_at=article.checked_at,
             created_at=article.created_at,
         )
         quiz_data = QuizData.model_validate(quiz.quiz_data)
         return {
+            "id": quiz.id,
             "article": article_schema.model_dump(),
             "quiz": quiz_data.model_dump(),
             "related_topics": quiz.related_topics or [],
@@ -125,50 +695,261 @@ class QuizService:
     # History helpers
     # ---------------------------
 
-    def list_quizzes(self) -> List[Dict[str, Any]]:
-        stmt = (
-            select(Quiz, Article)
-            .join(Article, Quiz.article_id == Article.id)
-            .order_by(Quiz.id.desc())
-        )
-        rows = self.db.execute(stmt).all()
-        results: List[Dict[str, Any]] = []
-        for quiz, article in rows:
-            results.append(
-                {
-                    "id": quiz.id,
-                    "article_id": article.id,
-                    "article_title": article.title,
-                    "article_url": article.url,
-                    "created_at": article.created_at,
-                }
-            )
-        return results
+    def list_quizzes(
+        self,
+        *,
+        after_id: Optional[int] = None,
+        limit: int = 20,
+        title_prefix: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """Return one page of quiz summaries, newest first.
+
+        Uses keyset pagination on ``Quiz.id``: pass the returned
+        ``next_cursor`` as ``after_id`` to fetch the following page.
+        """
+        stmt = _list_quizzes_stmt(after_id, limit, title_prefix, created_from, created_to)
+        return _quiz_page(self.db.execute(stmt).mappings().all(), limit)
+
+    async def alist_quizzes(
+        self,
+        *,
+        after_id: Optional[int] = None,
+        limit: int = 20,
+        title_prefix: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """Async variant of ``list_quizzes``."""
+        stmt = _list_quizzes_stmt(after_id, limit, title_prefix, created_from, created_to)
+        return _quiz_page((await self.async_db.execute(stmt)).mappings().all(), limit)
+
+    def search_quizzes(self, query: str, *, offset: int = 0, limit: int = 20) -> Dict[str, Any]:
+        """Return one page of quizzes matching ``query``, best match first.
+
+        ``query`` uses web search syntax (``"quoted phrases"``, ``or``,
+        ``-excluded``) and is matched against article titles and summaries
+        and against question texts. Pass the returned ``next_offset`` as
+        ``offset`` to fetch the following page.
+        """
+        stmt = _search_quizzes_stmt(query, offset, limit)
+        return _search_page(self.db.execute(stmt).mappings().all(), offset, limit)
+
+    async def asearch_quizzes(self, query: str, *, offset: int = 0, limit: int = 20) -> Dict[str, Any]:
+        """Async variant of ``search_quizzes``."""
+        stmt = _search_quizzes_stmt(query, offset, limit)
+        return _search_page((await self.async_db.execute(stmt)).mappings().all(), offset, limit)
+
+    def get_quiz_body(self, quiz_id: int) -> Optional[bytes]:
+        """Serialized quiz response, served from the response cache when possible."""
+        body = response_cache.get_quiz_body(quiz_id)
+        record_cache("response", hit=body is not None)
+        if body is None:
+            result = self.get_quiz_by_id(quiz_id)
+            if result is None:
+                return None
+            body = response_cache.encode_response(result)
+            response_cache.put_quiz_body(quiz_id, body)
+        return body
+
+    async def aget_quiz_body(self, quiz_id: int) -> Optional[bytes]:
+        """Async variant of ``get_quiz_body``."""
+        body = response_cache.get_quiz_body(quiz_id)
+        record_cache("response", hit=body is not None)
+        if body is None:
+            result = await self.aget_quiz_by_id(quiz_id)
+            if result is None:
+                return None
+            body = response_cache.encode_response(result)
+            response_cache.put_quiz_body(quiz_id, body)
+        return body
 
     def get_quiz_by_id(self, quiz_id: int) -> Optional[Dict[str, Any]]:
-        stmt = (
-            select(Quiz, Article)
-            .join(Article, Quiz.article_id == Article.id)
-            .where(Quiz.id == quiz_id)
+        row = self.db.execute(_quiz_by_id_stmt(quiz_id)).first()
+        return self._build_quiz_response(row[1], row[0]) if row else None
+
+    async def aget_quiz_by_id(self, quiz_id: int) -> Optional[Dict[str, Any]]:
+        row = (await self.async_db.execute(_quiz_by_id_stmt(quiz_id))).first()
+        return self._build_quiz_response(row[1], row[0]) if row else None
+
+
+def _article_values(scraped: ScrapedArticleContent, url: Optional[str] = None) -> Dict[str, Any]:
+    """Column values of the ``articles`` row for ``scraped``, stored under ``url``.
+
+    An already known article keeps its own URL; new ones use the scraped URL.
+    """
+    article_in = ArticleCreate(
+        url=url or scraped.url,
+        title=scraped.title,
+        summary=scraped.summary,
+        sections={"sections": scraped.sections},
+        entities=scraped.entities.model_dump(),
+        raw_html=scraped.raw_html,
+        revision_id=scraped.revision_id,
+        content_hash=scraped.content_hash,
+    )
+    raw_html_compressed, raw_html_ref = store_html(article_in.raw_html)
+    return {
+        "url": str(article_in.url),
+        "title": article_in.title,
+        "summary": article_in.summary,
+        "sections": article_in.sections,
+        "entities": article_in.entities,
+        "raw_html_compressed": raw_html_compressed,
+        "raw_html_ref": raw_html_ref,
+        "revision_id": article_in.revision_id,
+        "content_hash": article_in.content_hash,
+        "checked_at": datetime.utcnow(),
+    }
+
+
+def _quiz_values(article: Article, quiz: QuizData, related_topics: List[str]) -> Dict[str, Any]:
+    return {
+        "article_id": article.id,
+        "quiz_data": quiz.model_dump(),
+        "related_topics": related_topics,
+        "revision_id": article.revision_id,
+        "content_hash": article.content_hash,
+    }
+
+
+def _article_content_hash(article: Dict[str, Any]) -> str:
+    """Stored content hash of a serialized article, or one computed from its content."""
+    if article.get("content_hash"):
+        return article["content_hash"]
+    # Rows scraped before hashes were stored.
+    sections = (article.get("sections") or {}).get("sections", [])
+    return content_hash(article.get("summary"), sections)
+
+
+def _is_stale(article: Dict[str, Any]) -> bool:
+    """Whether the refresh TTL has passed since ``article`` was last checked."""
+    ttl = settings.ARTICLE_REFRESH_TTL_SECONDS
+    if not ttl:
+        return False
+    checked_at = article.get("checked_at") or article.get("created_at")
+    if isinstance(checked_at, str):
+        checked_at = datetime.fromisoformat(checked_at)
+    return checked_at is None or (datetime.utcnow() - checked_at).total_seconds() >= ttl
+
+
+# ---------------------------
+# Query builders (shared by the sync and async paths)
+# ---------------------------
+
+
+def _upsert_articles_stmt(rows: List[Dict[str, Any]]):
+    """Insert ``rows`` into ``articles``, overwriting the content of known URLs."""
+    insert_stmt = pg_insert(Article).values(rows)
+    return insert_stmt.on_conflict_do_update(
+        index_elements=[Article.url],
+        set_={column: insert_stmt.excluded[column] for column in rows[0] if column != "url"},
+    ).returning(Article)
+
+
+def _article_by_url_stmt(url: str) -> Select:
+    return select(Article).where(Article.url == url)
+
+
+def _latest_quiz_stmt(article_id: int) -> Select:
+    return select(Quiz).where(Quiz.article_id == article_id).order_by(Quiz.id.desc()).limit(1)
+
+
+def _cached_quiz_stmt(url: str) -> Select:
+    """Article and latest quiz for ``url`` through ``article_aliases``."""
+    return (
+        select(Article, Quiz)
+        .select_from(ArticleAlias)
+        .join(Article, ArticleAlias.article_id == Article.id)
+        .join(Quiz, Quiz.article_id == Article.id)
+        .where(ArticleAlias.alias == url)
+        .order_by(Quiz.id.desc())
+        .limit(1)
+    )
+
+
+def _quiz_by_id_stmt(quiz_id: int) -> Select:
+    return select(Quiz, Article).join(Article, Quiz.article_id == Article.id).where(Quiz.id == quiz_id)
+
+
+def _list_quizzes_stmt(
+    after_id: Optional[int],
+    limit: int,
+    title_prefix: Optional[str],
+    created_from: Optional[datetime],
+    created_to: Optional[datetime],
+) -> Select:
+    stmt = (
+        select(
+            Quiz.id,
+            Quiz.article_id,
+            Article.title.label("article_title"),
+            Article.url.label("article_url"),
+            Article.created_at,
         )
-        row = self.db.execute(stmt).first()
-        if not row:
-            return None
-        quiz, article = row
-        quiz_data = QuizData.model_validate(quiz.quiz_data)
-        article_schema = ArticleInDB(
-            id=article.id,
-            url=article.url,
-            title=article.title,
-            summary=article.summary,
-            sections=article.sections,
-            entities=article.entities,
-            created_at=article.created_at,
+        .join(Article, Quiz.article_id == Article.id)
+        .order_by(Quiz.id.desc())
+        .limit(limit + 1)
+    )
+    if after_id is not None:
+        stmt = stmt.where(Quiz.id < after_id)
+    if title_prefix:
+        stmt = stmt.where(
+            func.lower(Article.title).startswith(title_prefix.lower(), autoescape=True)
         )
-        return {
-            "id": quiz.id,
-            "article": article_schema.model_dump(),
-            "quiz": quiz_data.model_dump(),
-            "related_topics": quiz.related_topics or [],
-        }
+    if created_from is not None:
+        stmt = stmt.where(Article.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(Article.created_at < created_to)
+    return stmt
+
+
+def _quiz_page(rows: Sequence[Mapping[str, Any]], limit: int) -> Dict[str, Any]:
+    items = [dict(row) for row in rows]
+    next_cursor = items[limit - 1]["id"] if len(items) > limit else None
+    return {"items": items[:limit], "next_cursor": next_cursor}
+
+
+def _search_quizzes_stmt(query: str, offset: int, limit: int) -> Select:
+    """Quizzes whose article or questions match ``query``, ranked.
+
+    Each side is a GIN index scan on its ``search_vector``; a quiz matching
+    on both sides gets the sum of the two ranks.
+    """
+    tsquery = func.websearch_to_tsquery(cast(literal(SEARCH_CONFIG), REGCONFIG), query)
+    article_matches = (
+        select(Quiz.id.label("quiz_id"), func.ts_rank(Article.search_vector, tsquery).label("rank"))
+        .join(Article, Quiz.article_id == Article.id)
+        .where(Article.search_vector.bool_op("@@")(tsquery))
+    )
+    question_matches = select(
+        Quiz.id.label("quiz_id"), func.ts_rank(Quiz.search_vector, tsquery).label("rank")
+    ).where(Quiz.search_vector.bool_op("@@")(tsquery))
+    matches = union_all(article_matches, question_matches).subquery()
+    ranked = (
+        select(matches.c.quiz_id, func.sum(matches.c.rank).label("rank"))
+        .group_by(matches.c.quiz_id)
+        .subquery()
+    )
+    return (
+        select(
+            Quiz.id,
+            Quiz.article_id,
+            Article.title.label("article_title"),
+            Article.url.label("article_url"),
+            Article.created_at,
+            ranked.c.rank,
+        )
+        .join(ranked, ranked.c.quiz_id == Quiz.id)
+        .join(Article, Quiz.article_id == Article.id)
+        .order_by(ranked.c.rank.desc(), Quiz.id.desc())
+        .offset(offset)
+        .limit(limit + 1)
+    )
+
 
+def _search_page(rows: Sequence[Mapping[str, Any]], offset: int, limit: int) -> Dict[str, Any]:
+    items = [dict(row) for row in rows]
+    next_offset = offset + limit if len(items) > limit else None
+    return {"items": items[:limit], "next_offset": next_offset}
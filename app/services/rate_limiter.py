@@ -0,0 +1,257 @@
+"""Adaptive governors for outbound calls to Wikipedia and the LLM providers.
+
+Each upstream gets an ``AdaptiveLimiter``. A token bucket caps its request
+rate and an AIMD window caps its concurrency: the window grows by about one
+slot per window of successful calls and halves when the upstream throttles
+(HTTP 429 or 503), while ``Retry-After`` holds back every new call until it
+has passed. Callers queue with a deadline instead of failing immediately, so
+bursts are smoothed out at the provider's ceiling rather than all being
+throttled together.
+"""
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from app.config import get_settings
+from app.services.metrics import (
+    LIMITER_EVENTS,
+    LIMITER_IN_FLIGHT,
+    LIMITER_QUEUE_DEPTH,
+    LIMITER_WAIT_SECONDS,
+    LIMITER_WINDOW,
+    RETRIES,
+)
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+THROTTLE_STATUSES = {429, 503}
+# Pause after a throttling response that carries no usable Retry-After.
+DEFAULT_BACKOFF_SECONDS = 1.0
+
+
+class RateLimitTimeout(RuntimeError):
+    """Raised when a call could not start before its queueing deadline."""
+
+    def __init__(self, limiter: str, retry_after: float) -> None:
+        super().__init__(f"Too many pending requests to {limiter}; try again later.")
+        self.retry_after = retry_after
+
+
+class AdaptiveLimiter:
+    """Token bucket plus AIMD concurrency window for one upstream.
+
+    Meant to be used from one event loop at a time; moving to a new loop
+    (e.g. a later ``asyncio.run``) drops waiters and in-flight counts left
+    over from the old one.
+    """
+
+    def __init__(self, name: str, rate: float, max_concurrency: int, min_concurrency: int = 1) -> None:
+        self.name = name
+        self.rate = rate
+        self.burst = max(rate, 1.0)
+        self.max_concurrency = max(max_concurrency, 1)
+        self.min_concurrency = max(min(min_concurrency, self.max_concurrency), 1)
+        self.window = float(self.max_concurrency)
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        LIMITER_WINDOW.set(self.window, limiter=name)
+
+    @asynccontextmanager
+    async def slot(self, timeout: Optional[float] = None) -> AsyncIterator[None]:
+        """Hold one call slot for the duration of the block."""
+        await self.acquire(timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, timeout: Optional[float] = None) -> None:
+        """Wait for a free slot; raise ``RateLimitTimeout`` if none frees up in time.
+
+        ``timeout`` defaults to ``RATE_LIMIT_QUEUE_TIMEOUT_SECONDS``. Calls that
+        are known to be unable to start in time fail without waiting.
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._in_flight = 0
+            self._waiters.clear()
+
+        started = time.monotonic()
+        deadline = started + (settings.RATE_LIMIT_QUEUE_TIMEOUT_SECONDS if timeout is None else timeout)
+        queued = False
+        LIMITER_QUEUE_DEPTH.inc(limiter=self.name)
+        try:
+            while True:
+                now = time.monotonic()
+                delay = self._start_delay(now)
+                # Newcomers do not overtake calls that are already queued.
+                if delay == 0 and (queued or not self._waiters):
+                    break
+                if now + (0.0 if math.isinf(delay) else delay) >= deadline:
+                    LIMITER_EVENTS.inc(limiter=self.name, event="rejected")
+                    retry_after = DEFAULT_BACKOFF_SECONDS if math.isinf(delay) else delay
+                    raise RateLimitTimeout(self.name, max(retry_after, DEFAULT_BACKOFF_SECONDS))
+
+                if delay == 0:
+                    # Free now, but earlier callers go first.
+                    self._wake()
+                queued = True
+                waiter = loop.create_future()
+                self._waiters.append(waiter)
+                try:
+                    await asyncio.wait_for(waiter, timeout=min(delay or math.inf, deadline - now))
+                except asyncio.TimeoutError:
+                    pass
+                finally:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+        finally:
+            LIMITER_QUEUE_DEPTH.inc(-1, limiter=self.name)
+
+        if self.rate > 0:
+            self._tokens -= 1
+        self._in_flight += 1
+        LIMITER_IN_FLIGHT.set(self._in_flight, limiter=self.name)
+        LIMITER_WAIT_SECONDS.observe(time.monotonic() - started, limiter=self.name)
+        if self._waiters:
+            # Let the next caller in line see whether there is room for it too.
+            self._wake()
+
+    def release(self) -> None:
+        self._in_flight = max(self._in_flight - 1, 0)
+        LIMITER_IN_FLIGHT.set(self._in_flight, limiter=self.name)
+        self._wake()
+
+    def succeeded(self) -> None:
+        """Additive increase: about one more slot per window of successful calls."""
+        if self.window < self.max_concurrency:
+            self.window = min(self.window + 1.0 / self.window, float(self.max_concurrency))
+            LIMITER_WINDOW.set(self.window, limiter=self.name)
+            self._wake()
+
+    def throttled(self, retry_after: Optional[float] = None) -> None:
+        """Multiplicative decrease, and no new calls until ``retry_after`` has passed."""
+        now = time.monotonic()
+        LIMITER_EVENTS.inc(limiter=self.name, event="throttled")
+        # Responses to calls started before the pause belong to the same event.
+        if now >= self._paused_until:
+            self.window = max(self.window / 2, float(self.min_concurrency))
+            LIMITER_WINDOW.set(self.window, limiter=self.name)
+        pause = DEFAULT_BACKOFF_SECONDS if retry_after is None else retry_after
+        self._paused_until = max(self._paused_until, now + pause)
+
+    def _start_delay(self, now: float) -> float:
+        """Seconds until a call may start; ``inf`` while the window is full."""
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self._in_flight >= int(self.window):
+            return math.inf
+        if self.rate <= 0:
+            return 0.0
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+        return 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+    def _wake(self) -> None:
+        # Woken in queue order, so the oldest waiter re-checks first.
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+
+def retry_after_delay(status_code: Optional[int], retry_after: Optional[str]) -> Optional[float]:
+    """Back-off in seconds for a throttling status, or ``None`` for any other status.
+
+    ``retry_after`` is the raw header: delay-seconds or an HTTP date.
+    """
+    if status_code not in THROTTLE_STATUSES:
+        return None
+    if not retry_after:
+        return DEFAULT_BACKOFF_SECONDS
+    try:
+        return max(float(retry_after), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return DEFAULT_BACKOFF_SECONDS
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def throttle_delay(exc: BaseException) -> Optional[float]:
+    """Back-off for a provider error that signals throttling, else ``None``."""
+    response = getattr(exc, "response", None)
+    status_code = getattr(exc, "status_code", None) or getattr(response, "status_code", None)
+    headers = getattr(response, "headers", None)
+    return retry_after_delay(status_code, headers.get("retry-after") if headers else None)
+
+
+async def limited_call(
+    limiter: AdaptiveLimiter,
+    call: Callable[[], Awaitable[T]],
+    retries: int = 0,
+    operation: Optional[str] = None,
+) -> T:
+    """Run ``call`` in a slot of ``limiter`` and feed its outcome back to it.
+
+    Throttled calls are retried up to ``retries`` times; each retry queues
+    again and so waits out the ``Retry-After`` pause.
+    """
+    attempt = 0
+    while True:
+        async with limiter.slot():
+            try:
+                result = await call()
+            except Exception as exc:
+                delay = throttle_delay(exc)
+                if delay is None:
+                    raise
+                limiter.throttled(delay)
+                if attempt >= retries:
+                    raise
+            else:
+                limiter.succeeded()
+                return result
+        attempt += 1
+        if operation:
+            RETRIES.inc(operation=operation)
+
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(name: str, rate: float, max_concurrency: int) -> AdaptiveLimiter:
+    """The process-wide limiter called ``name``, created with these limits on first use."""
+    with _limiters_lock:
+        if name not in _limiters:
+            _limiters[name] = AdaptiveLimiter(name, rate, max_concurrency)
+        return _limiters[name]
+
+
+def http_limiter(host: str) -> AdaptiveLimiter:
+    return get_limiter(
+        f"http:{host}", settings.HTTP_REQUESTS_PER_SECOND, settings.HTTP_PER_HOST_CONCURRENCY
+    )
+
+
+def llm_limiter(provider: Optional[str] = None) -> AdaptiveLimiter:
+    return get_limiter(
+        f"llm:{provider or settings.LLM_PROVIDER}",
+        settings.LLM_REQUESTS_PER_MINUTE / 60.0,
+        settings.LLM_MAX_CONCURRENCY,
+    )
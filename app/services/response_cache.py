@@ -0,0 +1,223 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import Response
+
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class CacheTier(ABC):
+    """Interface of one cache tier; values are opaque bytes."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]: ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+
+class MemoryTier(CacheTier):
+    """Bounded in-process LRU with a per-entry TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class SqliteTier(CacheTier):
+    """Cache table in a local SQLite file, shared by every process on the host."""
+
+    def __init__(self, path: str, ttl_seconds: float) -> None:
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        row = self._connection().execute(
+            "SELECT value FROM response_cache WHERE key = ? AND expires_at >= ?",
+            (key, time.time()),
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO response_cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, time.time() + self.ttl_seconds),
+        )
+
+    def delete(self, key: str) -> None:
+        self._connection().execute("DELETE FROM response_cache WHERE key = ?", (key,))
+
+
+class ResponseCache:
+    """Read-through cache over ordered tiers (fastest first).
+
+    A hit in a slower tier is copied into the faster ones. Writes and deletes
+    go to every tier. Failures of a tier are treated as misses so the cache
+    can never fail a request.
+    """
+
+    def __init__(self, tiers: List[CacheTier]) -> None:
+        self.tiers = tiers
+
+    def get(self, key: str) -> Optional[bytes]:
+        for index, tier in enumerate(self.tiers):
+            try:
+                value = tier.get(key)
+            except sqlite3.Error:
+                continue
+            if value is not None:
+                for faster in self.tiers[:index]:
+                    faster.set(key, value)
+                return value
+        return None
+
+    def set(self, key: str, value: bytes) -> None:
+        for tier in self.tiers:
+            try:
+                tier.set(key, value)
+            except sqlite3.Error:
+                continue
+
+    def delete(self, key: str) -> None:
+        for tier in self.tiers:
+            try:
+                tier.delete(key)
+            except sqlite3.Error:
+                continue
+
+
+def _build_cache() -> ResponseCache:
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return ResponseCache([])
+    tiers: List[CacheTier] = [
+        MemoryTier(settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TTL_SECONDS)
+    ]
+    if settings.RESPONSE_CACHE_SHARED_BACKEND == "sqlite":
+        tiers.append(
+            SqliteTier(settings.RESPONSE_CACHE_SQLITE_PATH, settings.RESPONSE_CACHE_SHARED_TTL_SECONDS)
+        )
+    return ResponseCache(tiers)
+
+
+response_cache = _build_cache()
+
+
+# ---------------------------
+# Quiz response keys
+# ---------------------------
+#
+# quiz:<id>             serialized quiz response; it embeds the article, so
+#                       it is dropped whenever the article row changes
+# alias:<url>           id of the article the URL belongs to (never changes)
+# latest:<article_id>   id of the article's newest quiz (replaced on quiz write)
+#
+# Invalidation reaches the shared tier and this process' memory tier; other
+# processes may serve their in-memory copy for up to RESPONSE_CACHE_TTL_SECONDS.
+
+
+def encode_response(response: Dict[str, Any]) -> bytes:
+    """Serialize a quiz response once, in the form it is sent to clients."""
+    return json.dumps(jsonable_encoder(response), separators=(",", ":")).encode("utf-8")
+
+
+def get_quiz_body(quiz_id: int) -> Optional[bytes]:
+    return response_cache.get(f"quiz:{quiz_id}")
+
+
+def get_latest_quiz_body(url: str) -> Optional[bytes]:
+    """Serialized newest quiz for the article known under ``url``, if cached."""
+    article_id = response_cache.get(f"alias:{url}")
+    if article_id is None:
+        return None
+    quiz_id = response_cache.get(f"latest:{article_id.decode()}")
+    if quiz_id is None:
+        return None
+    return response_cache.get(f"quiz:{quiz_id.decode()}")
+
+
+def put_quiz_body(quiz_id: int, body: bytes) -> None:
+    response_cache.set(f"quiz:{quiz_id}", body)
+
+
+def forget_quiz_bodies(quiz_ids: Iterable[int]) -> None:
+    for quiz_id in quiz_ids:
+        response_cache.delete(f"quiz:{quiz_id}")
+
+
+def put_latest_quiz(urls: List[str], article_id: int, quiz_id: int, body: bytes) -> None:
+    """Cache ``body`` as the newest quiz of ``article_id``, reachable from ``urls``.
+
+    Called whenever a quiz is written, which replaces the article's previous
+    ``latest`` pointer.
+    """
+    put_quiz_body(quiz_id, body)
+    response_cache.set(f"latest:{article_id}", str(quiz_id).encode())
+    for url in urls:
+        response_cache.set(f"alias:{url}", str(article_id).encode())
+
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def json_response(body: bytes, if_none_match: Optional[str] = None) -> Response:
+    """Serve pre-serialized JSON with an ``ETag``, or ``304`` if the client has it."""
+    etag = etag_for(body)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    client_tags = {tag.strip().removeprefix("W/") for tag in (if_none_match or "").split(",")}
+    if etag in client_tags or "*" in client_tags:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
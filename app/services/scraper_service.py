@@ -1,13 +1,41 @@
-from typing import List, Tuple
+import asyncio
+import hashlib
+import json
+import re
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, unquote, urlsplit
 
-import requests
-from bs4 import BeautifulSoup
-from tenacity import retry, stop_after_attempt, wait_exponential
+import httpx
+from tenacity import retry, retry_if_not_exception_type, stop_after_attempt, wait_exponential
 
+from app.config import get_settings
 from app.schemas.article_schema import EntitySummary, ScrapedArticleContent
+from app.services import http_client
+from app.services.metrics import record_retry, stage
+from app.services.rate_limiter import RateLimitTimeout
+
+if TYPE_CHECKING:
+    # Imported on first parse; not needed to serve stored quizzes.
+    from bs4 import BeautifulSoup
+
+try:  # Optional fast parser backend.
+    from app.services import lxml_parser
+except ImportError:  # pragma: no cover - depends on environment
+    lxml_parser = None
+
+settings = get_settings()
 
 
 WIKIPEDIA_DOMAIN = "wikipedia.org"
+HEADERS = {
+    "User-Agent": "WikiQuizApp/1.0 (+https://github.com/your-org/wiki-quiz-app)",
+}
+
+# Host labels that select a presentation of the site rather than a language edition.
+_NON_LANGUAGE_LABELS = {"m", "www", "zero"}
+_EXCLUDED_NAMESPACES = ("Special:", "Talk:", "Help:")
+# Characters MediaWiki leaves unescaped in article paths.
+_TITLE_SAFE_CHARS = ":/(),'!*@$;"
 
 
 class InvalidWikipediaURLError(ValueError):
@@ -22,18 +50,131 @@ def validate_wikipedia_url(url: str) -> None:
         raise InvalidWikipediaURLError("URL must be a standard article, not a special page.")
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=4))
-def fetch_html(url: str) -> str:
-    """Fetch raw HTML from the given URL with basic retries."""
-    headers = {
-        "User-Agent": "WikiQuizApp/1.0 (+https://github.com/your-org/wiki-quiz-app)",
-    }
-    response = requests.get(url, headers=headers, timeout=10)
-    response.raise_for_status()
-    return response.text
+def _normalize_title(title: str) -> str:
+    """Apply MediaWiki title normalization: spaces for underscores, first letter upper."""
+    title = " ".join(title.replace("_", " ").split())
+    return title[:1].upper() + title[1:]
+
+
+def _split_wikipedia_url(url: str) -> Tuple[str, str]:
+    """Return ``(language, normalized title)`` for a Wikipedia article URL."""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host != WIKIPEDIA_DOMAIN and not host.endswith("." + WIKIPEDIA_DOMAIN):
+        raise InvalidWikipediaURLError("URL must be a Wikipedia article (contain 'wikipedia.org').")
+
+    labels = [
+        label
+        for label in host[: -len(WIKIPEDIA_DOMAIN)].split(".")
+        if label and label not in _NON_LANGUAGE_LABELS
+    ]
+    language = labels[0] if labels else "en"
+
+    if parts.path.startswith("/wiki/"):
+        raw_title = unquote(parts.path[len("/wiki/"):])
+    else:
+        # e.g. /w/index.php?title=X&oldid=123
+        raw_title = parse_qs(parts.query).get("title", [""])[0]
+
+    title = _normalize_title(raw_title)
+    if not title:
+        raise InvalidWikipediaURLError("URL must point to a Wikipedia article.")
+    if title.startswith(_EXCLUDED_NAMESPACES):
+        raise InvalidWikipediaURLError("URL must be a standard article, not a special page.")
+    return language, title
+
+
+def _article_url(language: str, title: str) -> str:
+    path_title = quote(title.replace(" ", "_"), safe=_TITLE_SAFE_CHARS)
+    return f"https://{language}.{WIKIPEDIA_DOMAIN}/wiki/{path_title}"
+
+
+def normalize_article_url(url: str) -> str:
+    """Normalize an article URL so equivalent spellings share one cache key.
+
+    Resolves the language edition, drops mobile hosts, fragments and query
+    strings (``oldid`` etc.), and normalizes title encoding and casing. This is
+    purely local; see ``resolve_canonical_url`` for redirect resolution.
+    """
+    return _article_url(*_split_wikipedia_url(url))
+
+
+def title_to_url(title: str, language: str = "en") -> str:
+    """Normalized article URL for a page title, e.g. from a category listing."""
+    return _article_url(language, _normalize_title(title))
+
+
+async def resolve_canonical_url(url: str) -> str:
+    """Resolve MediaWiki redirects (e.g. ``USA`` -> ``United States``) to a canonical URL.
+
+    Falls back to the locally normalized URL if the API is unavailable, so a
+    flaky lookup only costs a cache miss rather than failing the request.
+    """
+    language, title = _split_wikipedia_url(url)
+    try:
+        payload = await http_client.get_json(
+            f"https://{language}.{WIKIPEDIA_DOMAIN}/w/api.php",
+            params={
+                "action": "query",
+                "titles": title,
+                "redirects": 1,
+                "format": "json",
+                "formatversion": 2,
+            },
+            headers=HEADERS,
+        )
+        pages = payload.get("query", {}).get("pages", [])
+    except (httpx.HTTPError, ValueError, RateLimitTimeout):
+        pages = []
+
+    if pages and not pages[0].get("missing") and not pages[0].get("invalid"):
+        title = pages[0].get("title", title)
+    return _article_url(language, title)
+
+
+async def fetch_latest_revision(url: str) -> Optional[int]:
+    """Current revision id of the article via the MediaWiki API, or ``None``.
 
+    One small uncached API call, far cheaper than fetching the page.
+    """
+    language, title = _split_wikipedia_url(url)
+    try:
+        payload = await http_client.get_json(
+            f"https://{language}.{WIKIPEDIA_DOMAIN}/w/api.php",
+            params={
+                "action": "query",
+                "prop": "revisions",
+                "rvprop": "ids",
+                "titles": title,
+                "format": "json",
+                "formatversion": 2,
+            },
+            headers=HEADERS,
+        )
+        return int(payload["query"]["pages"][0]["revisions"][0]["revid"])
+    except (httpx.HTTPError, ValueError, KeyError, IndexError, TypeError, RateLimitTimeout):
+        return None
 
-def _extract_title(soup: BeautifulSoup) -> str:
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=1, max=4),
+    # The request already waited its turn in the rate limiter's queue.
+    retry=retry_if_not_exception_type(RateLimitTimeout),
+    before_sleep=record_retry("fetch_html"),
+)
+async def fetch_html(url: str) -> str:
+    """Fetch raw HTML from the given URL with basic retries.
+
+    Goes through the shared pooled client, so unchanged pages are revalidated
+    with a conditional GET and served from the local HTTP cache, and requests
+    are paced by the per-host rate limiter (a retry after a 429 waits out its
+    ``Retry-After``).
+    """
+    return await http_client.get_text(url, headers=HEADERS)
+
+
+def _extract_title(soup: "BeautifulSoup") -> str:
     title_el = soup.find(id="firstHeading")
     if title_el and title_el.get_text(strip=True):
         return title_el.get_text(strip=True)
@@ -42,7 +183,7 @@ def _extract_title(soup: BeautifulSoup) -> str:
     return "Untitled Article"
 
 
-def _extract_summary_and_sections(soup: BeautifulSoup) -> Tuple[str, List[dict], str]:
+def _extract_summary_and_sections(soup: "BeautifulSoup") -> Tuple[str, List[dict], str]:
     """Extract the lead summary, sections, and full plain text."""
     content_div = soup.find("div", id="mw-content-text")
     if not content_div:
@@ -72,14 +213,50 @@ def _extract_summary_and_sections(soup: BeautifulSoup) -> Tuple[str, List[dict],
     return summary, sections, full_text
 
 
-def scrape_wikipedia_article(url: str) -> ScrapedArticleContent:
-    """Validate and scrape a Wikipedia article into structured content."""
-    validate_wikipedia_url(url)
-    raw_html = fetch_html(url)
-    soup = BeautifulSoup(raw_html, "html.parser")
+def _parse_with_soup(raw_html: str) -> Tuple[str, str, List[dict], str]:
+    from bs4 import BeautifulSoup
 
+    soup = BeautifulSoup(raw_html, "html.parser")
     title = _extract_title(soup)
     summary, sections, full_text = _extract_summary_and_sections(soup)
+    return title, summary, sections, full_text
+
+
+# Parser backends by name. Every backend returns ``(title, summary, sections,
+# full_text)`` and must produce identical output for the same page; see
+# benchmarks/bench_parser.py for the parity check over the fixture corpus.
+PARSER_BACKENDS: Dict[str, Callable[[str], Tuple[str, str, List[dict], str]]] = {
+    "html.parser": _parse_with_soup,
+}
+if lxml_parser is not None:
+    PARSER_BACKENDS["lxml"] = lxml_parser.parse_article_html
+
+
+def get_parser_backend(name: str | None = None) -> Callable[[str], Tuple[str, str, List[dict], str]]:
+    """Return the configured parser backend, falling back to BeautifulSoup."""
+    return PARSER_BACKENDS.get(name or settings.ARTICLE_PARSER, _parse_with_soup)
+
+
+# Article pages embed their revision in the RLCONF script block.
+_REVISION_ID_RE = re.compile(r'"wgRevisionId"\s*:\s*(\d+)')
+
+
+def extract_revision_id(raw_html: str) -> Optional[int]:
+    match = _REVISION_ID_RE.search(raw_html)
+    return int(match.group(1)) if match else None
+
+
+def content_hash(summary: Optional[str], sections: List[Dict[str, Any]]) -> str:
+    """Stable hash of the parts of an article that quizzes are generated from."""
+    payload = json.dumps(
+        {"summary": summary or "", "sections": sections}, sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def parse_article(url: str, raw_html: str) -> ScrapedArticleContent:
+    """Parse fetched article HTML into structured content."""
+    title, summary, sections, full_text = get_parser_backend()(raw_html)
 
     # Entities will be filled by a separate service; placeholder here.
     entities = EntitySummary(people=[], organizations=[], locations=[])
@@ -92,5 +269,16 @@ def scrape_wikipedia_article(url: str) -> ScrapedArticleContent:
         text=full_text,
         raw_html=raw_html,
         entities=entities,
+        revision_id=extract_revision_id(raw_html),
+        content_hash=content_hash(summary, sections),
     )
 
+
+async def scrape_wikipedia_article(url: str) -> ScrapedArticleContent:
+    """Validate and scrape a Wikipedia article into structured content."""
+    validate_wikipedia_url(url)
+    with stage("fetch_html"):
+        raw_html = await fetch_html(url)
+    # Parsing is CPU-bound; keep it off the event loop.
+    with stage("parse_html"):
+        return await asyncio.to_thread(parse_article, url, raw_html)
@@ -0,0 +1,112 @@
+"""Select and pack article sections into token-budgeted chunks for the LLM.
+
+Sections are ranked by entity density (distinct entities from
+``extract_entities`` per 100 tokens), the densest are kept up to a total
+token budget, and the survivors are packed, in article order, into chunks
+that each fit one prompt.
+"""
+import re
+from typing import Any, Dict, List, NamedTuple
+
+from app.services.entity_extractor import extract_entities
+
+# Back-matter headings that hold lists and citations rather than prose.
+SKIPPED_SECTIONS = {
+    "see also",
+    "notes",
+    "references",
+    "citations",
+    "sources",
+    "bibliography",
+    "further reading",
+    "external links",
+}
+
+# Sections shorter than this rarely carry enough facts for a question.
+MIN_SECTION_TOKENS = 40
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+_EDIT_LINK_RE = re.compile(r"\[\s*edit\s*\]", re.IGNORECASE)
+
+
+class SectionChunk(NamedTuple):
+    titles: List[str]
+    text: str
+    tokens: int
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English text)."""
+    return (len(text) + 3) // 4
+
+
+def entity_density(content: str) -> float:
+    """Distinct entities per 100 tokens of ``content``."""
+    entities = extract_entities(content)
+    count = len(entities.people) + len(entities.organizations) + len(entities.locations)
+    return 100.0 * count / max(estimate_tokens(content), 1)
+
+
+def _truncate(content: str, max_tokens: int) -> str:
+    """Cut ``content`` to ``max_tokens`` at a sentence boundary where possible."""
+    if estimate_tokens(content) <= max_tokens:
+        return content
+    kept: List[str] = []
+    used = 0
+    for sentence in _SENTENCE_END_RE.split(content.strip()):
+        cost = estimate_tokens(sentence + " ")
+        if used + cost > max_tokens:
+            break
+        kept.append(sentence)
+        used += cost
+    return " ".join(kept) if kept else content[: max_tokens * 4]
+
+
+def select_sections(
+    sections: List[Dict[str, Any]], token_budget: int, max_section_tokens: int
+) -> List[Dict[str, Any]]:
+    """The densest sections fitting ``token_budget``, in article order.
+
+    Each section is first truncated to ``max_section_tokens``.
+    """
+    candidates = []
+    for position, section in enumerate(sections):
+        title = " ".join(_EDIT_LINK_RE.sub("", str(section.get("title") or "")).split())
+        content = str(section.get("content") or "").strip()
+        if title.casefold() in SKIPPED_SECTIONS or estimate_tokens(content) < MIN_SECTION_TOKENS:
+            continue
+        content = _truncate(content, max_section_tokens)
+        candidates.append((entity_density(content), position, title, content))
+
+    selected = []
+    used = 0
+    for _, position, title, content in sorted(candidates, key=lambda c: (-c[0], c[1])):
+        cost = estimate_tokens(content)
+        if used + cost > token_budget:
+            continue
+        selected.append((position, title, content))
+        used += cost
+    return [{"title": title, "content": content} for _, title, content in sorted(selected)]
+
+
+def plan_chunks(
+    sections: List[Dict[str, Any]], token_budget: int, chunk_tokens: int, max_chunks: int
+) -> List[SectionChunk]:
+    """Pack the selected sections into at most ``max_chunks`` prompt-sized chunks."""
+    budget = min(token_budget, chunk_tokens * max_chunks)
+    chunks: List[SectionChunk] = []
+    titles: List[str] = []
+    parts: List[str] = []
+    used = 0
+    for section in select_sections(sections, budget, chunk_tokens):
+        part = f"## {section['title']}\n{section['content']}"
+        cost = estimate_tokens(part)
+        if parts and used + cost > chunk_tokens:
+            chunks.append(SectionChunk(titles, "\n\n".join(parts), used))
+            titles, parts, used = [], [], 0
+        titles.append(section["title"])
+        parts.append(part)
+        used += cost
+    if parts:
+        chunks.append(SectionChunk(titles, "\n\n".join(parts), used))
+    return chunks[:max_chunks]
@@ -0,0 +1,112 @@
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.database import engine
+from app.services.metrics import stage
+
+
+class GenerationLockTimeout(RuntimeError):
+    """Raised when waiting for another worker's generation takes too long."""
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into a single execution.
+
+    The first caller for a key becomes the leader and runs the work; callers
+    arriving while it is in flight await the leader's result instead. If the
+    leader is cancelled (e.g. its client disconnected) a waiting follower
+    takes over as the new leader.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._calls
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        while key in self._calls:
+            future = self._calls[key]
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    continue
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        # Avoid "exception was never retrieved" warnings when nobody is waiting.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+
+def _advisory_lock_id(key: str) -> int:
+    """Map a string key onto Postgres' signed 64-bit advisory lock space."""
+    digest = hashlib.sha256(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+def _try_lock(conn: Connection, lock_id: int) -> bool:
+    return bool(conn.execute(text("SELECT pg_try_advisory_lock(:id)"), {"id": lock_id}).scalar())
+
+
+def _unlock(conn: Connection, lock_id: int) -> None:
+    conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": lock_id})
+
+
+@asynccontextmanager
+async def pg_advisory_lock(
+    key: str,
+    *,
+    poll_interval: float,
+    timeout: float,
+) -> AsyncIterator[None]:
+    """Hold a session-level Postgres advisory lock for ``key``.
+
+    The lock is polled with ``pg_try_advisory_lock`` so waiting does not pin
+    a worker thread. A dedicated autocommit connection holds the lock for the
+    duration of the block.
+    """
+    lock_id = _advisory_lock_id(key)
+    conn = await asyncio.to_thread(
+        lambda: engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+    )
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    locked = False
+    try:
+        with stage("wait_for_lock"):
+            while not (locked := await asyncio.to_thread(_try_lock, conn, lock_id)):
+                if loop.time() >= deadline:
+                    raise GenerationLockTimeout(
+                        "Timed out waiting for another worker to finish generating this quiz."
+                    )
+                await asyncio.sleep(poll_interval)
+        yield
+    finally:
+        try:
+            if locked:
+                await asyncio.to_thread(_unlock, conn, lock_id)
+        except Exception:
+            # Never hand a connection that may still hold the lock back to the pool.
+            conn.invalidate()
+        await asyncio.to_thread(conn.close)
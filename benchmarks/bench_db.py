@@ -0,0 +1,117 @@
+"""Compare the sync (threadpool) and async (asyncpg) database read paths.
+
+Runs the history-page and quiz-detail queries of ``QuizService`` against the
+configured Postgres at a given concurrency. The sync path goes through a
+thread pool capped like FastAPI's (40 threads by default), the async path
+runs on the event loop. Needs some quizzes in the database, e.g. after
+``benchmarks.load_test``. Results are stored under benchmarks/results/.
+
+Usage:
+    python -m benchmarks.bench_db [--requests 2000] [--concurrency 200] [--threads 40]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List
+
+from app.database import AsyncSessionLocal, SessionLocal, async_engine
+from app.services.quiz_service import QuizService
+from benchmarks.reporting import save_result, summarize
+
+
+async def run_phase(
+    name: str, call: Callable[[int], Awaitable[object]], total: int, concurrency: int
+) -> Dict[str, float]:
+    latencies: List[float] = []
+    counter = iter(range(total))
+
+    async def worker() -> None:
+        for index in counter:
+            start = time.perf_counter()
+            await call(index)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, total))))
+    summary = summarize(latencies)
+    summary["throughput_rps"] = total / (time.perf_counter() - started)
+    print(
+        f"{name:28} {summary['throughput_rps']:9.1f} req/s  p50 {summary['p50_ms']:7.1f}  "
+        f"p95 {summary['p95_ms']:7.1f}  p99 {summary['p99_ms']:7.1f} ms"
+    )
+    return summary
+
+
+def sync_history(index: int) -> object:
+    with SessionLocal() as db:
+        return QuizService(db).list_quizzes(limit=20)
+
+
+def sync_detail(quiz_id: int) -> object:
+    with SessionLocal() as db:
+        return QuizService(db).get_quiz_by_id(quiz_id)
+
+
+async def async_history(index: int) -> object:
+    async with AsyncSessionLocal() as db:
+        return await QuizService(async_db=db).alist_quizzes(limit=20)
+
+
+async def async_detail(quiz_id: int) -> object:
+    async with AsyncSessionLocal() as db:
+        return await QuizService(async_db=db).aget_quiz_by_id(quiz_id)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    quiz_ids = [item["id"] for item in (await async_history(0))["items"]]
+    if not quiz_ids:
+        raise SystemExit("No quizzes in the database; generate some first.")
+
+    loop = asyncio.get_running_loop()
+    pool = ThreadPoolExecutor(max_workers=args.threads)
+
+    def in_thread(fn):
+        return lambda index: loop.run_in_executor(pool, fn, index)
+
+    def by_id(fn):
+        return lambda index: fn(quiz_ids[index % len(quiz_ids)])
+
+    results = {}
+    try:
+        for name, call in (
+            ("sync history", in_thread(sync_history)),
+            ("async history", async_history),
+            ("sync quiz detail", in_thread(by_id(sync_detail))),
+            ("async quiz detail", by_id(async_detail)),
+        ):
+            results[name.replace(" ", "_")] = await run_phase(
+                name, call, args.requests, args.concurrency
+            )
+    finally:
+        pool.shutdown()
+        await async_engine.dispose()
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=40, help="sync path thread pool size")
+    parser.add_argument("--no-save", action="store_true", help="do not store the results")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if not args.no_save:
+        save_result(
+            "db",
+            results,
+            {"requests": args.requests, "concurrency": args.concurrency, "threads": args.threads},
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""Tail latency of quiz generation with one LLM backend vs a hedged pool.
+
+Runs ``agenerate_quiz_and_topics`` against fake backends whose calls take
+``--latency`` seconds, except for a ``--tail-probability`` share that takes
+``--tail-latency``. Compares a single backend, two backends with hedging, and
+two backends where the first also fails ``--failure-probability`` of its
+calls. Reports p50/p95/p99 and LLM calls per generation (the hedging cost).
+Results are stored under benchmarks/results/.
+
+Usage:
+    python -m benchmarks.bench_hedging [--requests 400] [--concurrency 16]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from typing import Dict, List
+
+from app.config import get_settings
+from app.schemas.article_schema import EntitySummary, ScrapedArticleContent
+from app.services.llm_service import agenerate_quiz_and_topics, chain_registry, provider_pool
+from app.services.metrics import LLM_CALLS
+from benchmarks.reporting import save_result, summarize
+
+settings = get_settings()
+
+
+def fake_spec(args: argparse.Namespace, seed: int, failure_probability: float = 0.0) -> str:
+    return (
+        f"fake?latency_seconds={args.latency}&tail_probability={args.tail_probability}"
+        f"&tail_latency_seconds={args.tail_latency}&failure_probability={failure_probability}"
+        f"&seed={seed}"
+    )
+
+
+def article(index: int) -> ScrapedArticleContent:
+    return ScrapedArticleContent(
+        url=f"https://en.wikipedia.org/wiki/Article_{index}",
+        title=f"Article {index}",
+        summary="Benchmark article.",
+        sections=[],
+        text="",
+        raw_html="",
+        entities=EntitySummary(),
+    )
+
+
+def llm_calls() -> float:
+    outcomes = ("ok", "error", "cancelled")
+    return sum(LLM_CALLS.value(chain="combined", outcome=outcome) for outcome in outcomes)
+
+
+async def run_scenario(name: str, providers: str, args: argparse.Namespace) -> Dict[str, float]:
+    settings.LLM_PROVIDERS = providers
+    chain_registry.clear()
+    provider_pool.reset()
+    latencies: List[float] = []
+    counter = iter(range(args.requests))
+    calls_before = llm_calls()
+
+    async def worker() -> None:
+        for index in counter:
+            start = time.perf_counter()
+            await agenerate_quiz_and_topics(article(index))
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(min(args.concurrency, args.requests))))
+    summary = summarize(latencies)
+    summary["llm_calls_per_request"] = (llm_calls() - calls_before) / args.requests
+    print(
+        f"{name:10} p50 {summary['p50_ms']:7.1f}  p95 {summary['p95_ms']:7.1f}  "
+        f"p99 {summary['p99_ms']:7.1f} ms  {summary['llm_calls_per_request']:.2f} calls/request"
+    )
+    return summary
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    settings.LLM_GENERATION_MODE = "combined"
+    settings.LLM_CONTENT_SCOPE = "summary"
+    settings.LLM_HEDGE_INITIAL_DELAY_SECONDS = args.initial_hedge_delay
+    scenarios = {
+        "single": fake_spec(args, seed=1),
+        "hedged": f"{fake_spec(args, seed=1)},{fake_spec(args, seed=2)}",
+        "failover": (
+            f"{fake_spec(args, seed=1, failure_probability=args.failure_probability)},"
+            f"{fake_spec(args, seed=2)}"
+        ),
+    }
+    results = {}
+    for name, providers in scenarios.items():
+        results[name] = await run_scenario(name, providers, args)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.05, help="typical call latency (s)")
+    parser.add_argument("--tail-latency", type=float, default=1.0, help="slow call latency (s)")
+    parser.add_argument("--tail-probability", type=float, default=0.05)
+    parser.add_argument("--failure-probability", type=float, default=0.1)
+    parser.add_argument(
+        "--initial-hedge-delay", type=float, default=0.2, help="hedging deadline until p95 is known (s)"
+    )
+    parser.add_argument("--no-save", action="store_true", help="do not store the results")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if not args.no_save:
+        config = {key: value for key, value in vars(args).items() if key != "no_save"}
+        save_result("hedging", results, config)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
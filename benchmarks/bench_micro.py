@@ -0,0 +1,89 @@
+"""Micro-benchmarks of the CPU-bound steps of quiz generation.
+
+Times, per fixture page: section extraction from a parsed BeautifulSoup tree
+(``_extract_summary_and_sections``), each parser backend end to end, entity
+extraction, and lenient parsing of LLM replies (clean, fenced, and with
+trailing commas). Results are stored under benchmarks/results/.
+
+Usage:
+    python -m benchmarks.bench_micro [--repeat 50] [--fixtures benchmarks/fixtures]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from bs4 import BeautifulSoup
+
+from app.services.entity_extractor import extract_entities
+from app.services.fake_llm import fake_reply
+from app.services.llm_service import ARTICLE_SUFFIX, COMBINED_PROMPT, _load_prompt, _safe_json_parse
+from app.services.scraper_service import PARSER_BACKENDS, _extract_summary_and_sections
+from benchmarks.bench_parser import DEFAULT_FIXTURES, load_corpus
+from benchmarks.reporting import save_result, summarize
+
+
+def sample(fn: Callable[[], object], repeat: int) -> List[float]:
+    """Wall time in milliseconds of ``repeat`` calls, after one warm-up call."""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def llm_replies(title: str) -> Dict[str, str]:
+    prompt = _load_prompt(COMBINED_PROMPT) + ARTICLE_SUFFIX.format(title=title, summary="")
+    clean = json.dumps(fake_reply(prompt, questions=10, topics=8), indent=2)
+    return {
+        "clean": clean,
+        "fenced": f"Here is the quiz:\n```json\n{clean}\n```",
+        "trailing_commas": clean.replace("\n  ]", ",\n  ]"),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES)
+    parser.add_argument("--no-save", action="store_true", help="do not store the results")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.fixtures)
+    if not corpus:
+        print(f"No fixtures found in {args.fixtures}")
+        return 1
+
+    results: Dict[str, Dict[str, float]] = {}
+    for page, html in corpus.items():
+        soup = BeautifulSoup(html, "html.parser")
+        full_text = _extract_summary_and_sections(soup)[2]
+        cases = {
+            "extract_summary_and_sections": lambda: _extract_summary_and_sections(soup),
+            "extract_entities": lambda: extract_entities(full_text),
+        }
+        for name, backend in PARSER_BACKENDS.items():
+            cases[f"parse[{name}]"] = lambda backend=backend: backend(html)
+        for name, fn in cases.items():
+            results[f"{page}:{name}"] = summarize(sample(fn, args.repeat))
+
+    for variant, reply in llm_replies("Alan Turing").items():
+        results[f"safe_json_parse[{variant}]"] = summarize(
+            sample(lambda reply=reply: _safe_json_parse(reply), args.repeat)
+        )
+
+    print(f"{'case':60} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for key, summary in results.items():
+        print(f"{key:60} {summary['p50_ms']:9.3f} {summary['p95_ms']:9.3f} {summary['p99_ms']:9.3f}")
+
+    if not args.no_save:
+        save_result("micro", results, {"repeat": args.repeat, "pages": sorted(corpus)})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
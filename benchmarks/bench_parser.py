@@ -0,0 +1,79 @@
+"""Compare article parser backends over the saved-page fixture corpus.
+
+Checks that every backend produces identical output for every page, then
+reports the per-page parse time of each backend.
+
+Usage:
+    python -m benchmarks.bench_parser [--repeat 20] [--fixtures benchmarks/fixtures]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from app.services.scraper_service import PARSER_BACKENDS
+
+DEFAULT_FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def load_corpus(fixtures_dir: Path) -> dict:
+    return {path.name: path.read_text(encoding="utf-8") for path in sorted(fixtures_dir.glob("*.html"))}
+
+
+def check_parity(corpus: dict) -> bool:
+    reference_name = "html.parser"
+    reference = PARSER_BACKENDS[reference_name]
+    ok = True
+    for name, backend in PARSER_BACKENDS.items():
+        if name == reference_name:
+            continue
+        for page, html in corpus.items():
+            if backend(html) != reference(html):
+                print(f"MISMATCH: {name} differs from {reference_name} on {page}")
+                ok = False
+    return ok
+
+
+def time_backend(backend, html: str, repeat: int) -> float:
+    """Median wall time in milliseconds of parsing ``html`` once."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        backend(html)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.fixtures)
+    if not corpus:
+        print(f"No fixtures found in {args.fixtures}")
+        return 1
+
+    parity = check_parity(corpus)
+    backends = list(PARSER_BACKENDS)
+    print(f"{'page':40} {'KB':>7} " + " ".join(f"{name + ' ms':>15}" for name in backends))
+    totals = {name: 0.0 for name in backends}
+    for page, html in corpus.items():
+        timings = {name: time_backend(PARSER_BACKENDS[name], html, args.repeat) for name in backends}
+        for name, value in timings.items():
+            totals[name] += value
+        print(
+            f"{page:40} {len(html) / 1024:7.1f} "
+            + " ".join(f"{timings[name]:15.2f}" for name in backends)
+        )
+    print(f"{'TOTAL':40} {'':7} " + " ".join(f"{totals[name]:15.2f}" for name in backends))
+    if "lxml" in totals and totals["lxml"]:
+        print(f"lxml speedup: {totals['html.parser'] / totals['lxml']:.1f}x")
+    print("parity: OK" if parity else "parity: FAILED")
+    return 0 if parity else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""Cold start of the API: import time of ``app.main`` and time to first response.
+
+Each run starts a fresh interpreter, so nothing is warm but the OS page cache.
+Two measurements:
+
+- ``import``: ``python -X importtime -c "import app.main"``, with the
+  modules that took longest (cumulative) in the last run, and whether any
+  LLM dependency (LangChain, Groq, Google) was loaded at import.
+- ``first_response``: from spawning ``uvicorn app.main:app`` until ``--path``
+  answers 200, polled every millisecond. Job workers are disabled (they are
+  not needed to serve requests and poll the database).
+
+Results are stored under benchmarks/results/.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 10] [--path /health] [--top 15]
+"""
+import argparse
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from benchmarks.reporting import save_result, summarize
+
+LLM_MODULE_PREFIXES = ("langchain", "langsmith", "groq", "google")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int]]:
+    """``(module, cumulative microseconds)`` per line of ``-X importtime`` output."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|", 2)
+        if cumulative.strip().isdigit():
+            modules.append((name.strip(), int(cumulative)))
+    return modules
+
+
+def measure_import(env: Dict[str, str]) -> List[Tuple[str, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_response(env: Dict[str, str], path: str, timeout: float) -> float:
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with {server.returncode}")
+            try:
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+                connection.request("GET", path)
+                status = connection.getresponse().status
+                connection.close()
+                if status == 200:
+                    return (time.perf_counter() - started) * 1000
+            except OSError:
+                pass
+            time.sleep(0.001)
+        raise RuntimeError(f"{path} did not answer within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--path", default="/health", help="endpoint polled until it answers 200")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds to wait for the server")
+    parser.add_argument("--no-save", action="store_true", help="do not store the results")
+    args = parser.parse_args()
+
+    env = dict(os.environ, JOB_WORKERS="0")
+    import_ms: List[float] = []
+    modules: List[Tuple[str, int]] = []
+    for _ in range(args.runs):
+        modules = measure_import(env)
+        import_ms.append(dict(modules)["app.main"] / 1000)
+    response_ms = [measure_first_response(env, args.path, args.timeout) for _ in range(args.runs)]
+
+    print("slowest imports (cumulative, last run):")
+    for name, cumulative in sorted(modules, key=lambda item: -item[1])[: args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    llm_modules = sorted(
+        {name.split(".")[0] for name, _ in modules if name.startswith(LLM_MODULE_PREFIXES)}
+    )
+    print(f"LLM modules loaded at import: {', '.join(llm_modules) or 'none'}")
+
+    results = {"import": summarize(import_ms), "first_response": summarize(response_ms)}
+    results["import"]["llm_modules_loaded"] = len(llm_modules)
+    for key, summary in results.items():
+        print(f"{key:15} p50 {summary['p50_ms']:7.1f}  p95 {summary['p95_ms']:7.1f} ms")
+    if not args.no_save:
+        config = {key: value for key, value in vars(args).items() if key != "no_save"}
+        save_result("startup", results, config)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
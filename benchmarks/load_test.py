@@ -0,0 +1,146 @@
+"""End-to-end load test of a running API server.
+
+Start the server offline, against a local Postgres, with the fake LLM and
+the recorded pages:
+
+    LLM_PROVIDER=fake HTTP_CACHE_ENABLED=false \\
+        uvicorn benchmarks.replay_app:app --workers 4
+
+then run:
+
+    python -m benchmarks.load_test [--base-url http://localhost:8000] [--requests 500] [--concurrency 32]
+
+Phases: one cold ``POST /generate-quiz`` per fixture article (full pipeline;
+use a fresh database to measure it), then repeated ``POST /generate-quiz``
+cache hits, ``GET /quizzes`` pages and ``GET /generate-quiz/{id}``. Reports
+throughput, errors and p50/p95/p99 per phase and stores them under
+benchmarks/results/.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+from benchmarks.bench_parser import DEFAULT_FIXTURES
+from benchmarks.reporting import save_result, summarize
+
+
+def article_urls(fixtures_dir: Path) -> List[str]:
+    return [
+        f"https://en.wikipedia.org/wiki/{path.stem}" for path in sorted(fixtures_dir.glob("*.html"))
+    ]
+
+
+async def run_phase(
+    name: str,
+    request: Callable[[int], Awaitable[httpx.Response]],
+    total: int,
+    concurrency: int,
+) -> Dict[str, float]:
+    """Issue ``total`` requests with at most ``concurrency`` in flight."""
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in counter:
+            start = time.perf_counter()
+            try:
+                response = await request(index)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, total))))
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(latencies)
+    summary.update({"errors": errors, "throughput_rps": total / elapsed})
+    print(
+        f"{name:32} {total:6d} req {summary['throughput_rps']:9.1f} req/s  "
+        f"p50 {summary['p50_ms']:8.1f}  p95 {summary['p95_ms']:8.1f}  "
+        f"p99 {summary['p99_ms']:8.1f} ms  errors {errors}"
+    )
+    return summary
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    urls = article_urls(args.fixtures)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout, limits=limits
+    ) as client:
+        results: Dict[str, Dict[str, float]] = {}
+        quiz_ids: List[int] = []
+
+        async def generate(index: int) -> httpx.Response:
+            response = await client.post("/generate-quiz", json={"url": urls[index % len(urls)]})
+            if response.status_code == 200:
+                quiz_ids.append(response.json()["id"])
+            return response
+
+        results["generate_cold"] = await run_phase(
+            "POST /generate-quiz (cold)", generate, len(urls), args.concurrency
+        )
+        results["generate_cached"] = await run_phase(
+            "POST /generate-quiz (cached)", generate, args.requests, args.concurrency
+        )
+
+        first_page = (await client.get("/quizzes", params={"limit": 20})).json()
+        cursors = [None] + ([first_page["next_cursor"]] if first_page.get("next_cursor") else [])
+
+        async def history(index: int) -> httpx.Response:
+            params = {"limit": 20}
+            cursor = random.choice(cursors)
+            if cursor:
+                params["after_id"] = cursor
+            return await client.get("/quizzes", params=params)
+
+        results["history"] = await run_phase("GET /quizzes", history, args.requests, args.concurrency)
+
+        ids = sorted(set(quiz_ids)) or [item["id"] for item in first_page.get("items", [])]
+        if ids:
+
+            async def detail(index: int) -> httpx.Response:
+                return await client.get(f"/generate-quiz/{ids[index % len(ids)]}")
+
+            results["quiz_detail"] = await run_phase(
+                "GET /generate-quiz/{id}", detail, args.requests, args.concurrency
+            )
+        return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=500, help="requests per warm phase")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES)
+    parser.add_argument("--no-save", action="store_true", help="do not store the results")
+    args = parser.parse_args()
+
+    if not article_urls(args.fixtures):
+        print(f"No fixtures found in {args.fixtures}")
+        return 1
+    results = asyncio.run(run(args))
+    if not args.no_save:
+        save_result(
+            "load",
+            results,
+            {"base_url": args.base_url, "requests": args.requests, "concurrency": args.concurrency},
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
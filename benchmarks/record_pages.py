@@ -0,0 +1,34 @@
+"""Save real Wikipedia pages into the fixture corpus.
+
+Usage:
+    python -m benchmarks.record_pages https://en.wikipedia.org/wiki/Alan_Turing ...
+"""
+import asyncio
+import sys
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from app.services.http_client import close_http_client
+from app.services.scraper_service import fetch_html, normalize_article_url
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+async def record(urls) -> None:
+    FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    try:
+        for url in urls:
+            canonical = normalize_article_url(url)
+            name = unquote(urlsplit(canonical).path.rsplit("/", 1)[-1]).replace("/", "_")
+            html = await fetch_html(canonical)
+            (FIXTURES_DIR / f"{name}.html").write_text(html, encoding="utf-8")
+            print(f"saved {name}.html ({len(html) / 1024:.0f} KB)")
+    finally:
+        await close_http_client()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    asyncio.run(record(sys.argv[1:]))
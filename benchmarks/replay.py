@@ -0,0 +1,54 @@
+"""Serve Wikipedia from the saved-page fixture corpus instead of the network.
+
+``install()`` routes the app's HTTP client through ``replay_transport``, so
+benchmarks and load tests run fully offline. To run the API server this way:
+
+    REPLAY_DIR=benchmarks/fixtures uvicorn benchmarks.replay_app:app
+"""
+import re
+from pathlib import Path
+from typing import Any, Dict
+from urllib.parse import unquote
+
+import httpx
+
+from app.services import http_client
+from benchmarks.bench_parser import DEFAULT_FIXTURES
+
+_REPLAY_REVISION_RE = re.compile(r'"wgRevisionId"\s*:\s*(\d+)')
+
+
+def replay_transport(root: str) -> httpx.MockTransport:
+    """Transport answering from saved pages instead of the network.
+
+    ``/wiki/<Title>`` is served from ``<root>/<Title>.html``; MediaWiki API
+    title queries echo the requested title, i.e. every title is canonical,
+    and revision queries return the ``wgRevisionId`` of the saved page.
+    """
+    root_path = Path(root)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = unquote(request.url.path)
+        if path.startswith("/wiki/"):
+            page = root_path / (path[len("/wiki/") :].replace("/", "_") + ".html")
+            if page.is_file():
+                return httpx.Response(
+                    200, text=page.read_text(encoding="utf-8"), headers={"Content-Type": "text/html"}
+                )
+            return httpx.Response(404, text="Not found")
+        if path.endswith("/api.php"):
+            title = request.url.params.get("titles", "")
+            page_info: Dict[str, Any] = {"title": title.replace("_", " ")}
+            if request.url.params.get("prop") == "revisions":
+                page = root_path / (title.replace(" ", "_").replace("/", "_") + ".html")
+                match = page.is_file() and _REPLAY_REVISION_RE.search(page.read_text(encoding="utf-8"))
+                page_info["revisions"] = [{"revid": int(match.group(1))}] if match else []
+            return httpx.Response(200, json={"query": {"pages": [page_info]}})
+        return httpx.Response(404, text="Not found")
+
+    return httpx.MockTransport(handler)
+
+
+def install(root: Path = DEFAULT_FIXTURES) -> None:
+    """Serve all outgoing HTTP of this process from the pages under ``root``."""
+    http_client.install_transport(replay_transport(str(root)))
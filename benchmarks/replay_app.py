@@ -0,0 +1,12 @@
+"""The API app with Wikipedia served from saved pages (see benchmarks/replay.py).
+
+Pages are read from ``REPLAY_DIR`` (default: the fixture corpus).
+"""
+import os
+
+from benchmarks.bench_parser import DEFAULT_FIXTURES
+from benchmarks.replay import install
+
+install(os.environ.get("REPLAY_DIR") or DEFAULT_FIXTURES)
+
+from app.main import app  # noqa: E402,F401
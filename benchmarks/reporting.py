@@ -0,0 +1,91 @@
+"""Latency summaries and stored benchmark results.
+
+Each run is written to ``benchmarks/results/<name>-<timestamp>.json`` together
+with the git revision, and compared against the previous run of the same
+benchmark so regressions show up in the output.
+"""
+import json
+import math
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Flag a metric as a regression when it got this much slower than last run.
+REGRESSION_THRESHOLD = 0.10
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of ``samples`` (``q`` in 0..100)."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(samples_ms),
+        "mean_ms": sum(samples_ms) / len(samples_ms),
+        "p50_ms": percentile(samples_ms, 50),
+        "p95_ms": percentile(samples_ms, 95),
+        "p99_ms": percentile(samples_ms, 99),
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def latest_result(name: str) -> Optional[dict]:
+    runs = sorted(RESULTS_DIR.glob(f"{name}-*.json"))
+    return json.loads(runs[-1].read_text(encoding="utf-8")) if runs else None
+
+
+def save_result(name: str, results: Dict[str, Dict[str, float]], config: dict) -> Path:
+    """Store a run and print how its p50/p95 compare with the previous one."""
+    previous = latest_result(name)
+    now = datetime.now(timezone.utc)
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = RESULTS_DIR / f"{name}-{now.strftime('%Y%m%dT%H%M%S%fZ')}.json"
+    path.write_text(
+        json.dumps(
+            {
+                "benchmark": name,
+                "created_at": now.isoformat(),
+                "git_revision": _git_revision(),
+                "config": config,
+                "results": results,
+            },
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    print(f"\nsaved {path.relative_to(RESULTS_DIR.parent.parent)}")
+    if previous:
+        compare(previous, results)
+    return path
+
+
+def compare(previous: dict, results: Dict[str, Dict[str, float]]) -> None:
+    print(f"compared with {previous['created_at']} ({previous.get('git_revision') or 'unknown'}):")
+    for key, current in results.items():
+        before = previous["results"].get(key)
+        if not before:
+            continue
+        changes = []
+        for metric in ("p50_ms", "p95_ms"):
+            if before.get(metric):
+                change = current[metric] / before[metric] - 1
+                flag = "  REGRESSION" if change > REGRESSION_THRESHOLD else ""
+                changes.append(f"{metric} {change:+.0%}{flag}")
+        print(f"  {key:40} " + ", ".join(changes))
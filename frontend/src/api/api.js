@@ -7,13 +7,39 @@ export const apiClient = axios.create({
   timeout: 15000,
 });
 
-export const generateQuiz = async (url) => {
-  const response = await apiClient.post("/generate-quiz", { url });
-  return response.data;
+const JOB_POLL_INTERVAL_MS = 1000;
+const JOB_TIMEOUT_MS = 5 * 60 * 1000;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Generation can take longer than a single request timeout, so it runs as a
+// background job: submit it, poll its status, then load the finished quiz.
+// A quiz that already exists comes back with the submission, without a job.
+export const generateQuiz = async (url, { onProgress } = {}) => {
+  const { data: created } = await apiClient.post("/jobs", { url });
+  if (created.quiz) return created.quiz;
+  const deadline = Date.now() + JOB_TIMEOUT_MS;
+
+  while (Date.now() < deadline) {
+    const { data: job } = await apiClient.get(`/jobs/${created.job_id}`);
+    if (onProgress) onProgress(job.stage);
+    if (job.status === "succeeded") {
+      return fetchQuizDetail(job.quiz_id);
+    }
+    if (job.status === "failed") {
+      const error = new Error(job.error || "Quiz generation failed.");
+      error.response = { data: { detail: job.error || "Quiz generation failed." } };
+      throw error;
+    }
+    await sleep(JOB_POLL_INTERVAL_MS);
+  }
+  throw new Error("Timed out waiting for quiz generation.");
 };
 
-export const fetchQuizzes = async () => {
-  const response = await apiClient.get("/quizzes");
+export const fetchQuizzes = async ({ afterId, limit = 20 } = {}) => {
+  const params = { limit };
+  if (afterId) params.after_id = afterId;
+  const response = await apiClient.get("/quizzes", { params });
   return response.data;
 };
 
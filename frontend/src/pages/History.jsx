@@ -1,31 +1,34 @@
-import { useEffect, useState } from "react";
+import { useCallback, useEffect, useState } from "react";
 import { fetchQuizzes, fetchQuizDetail } from "../api/api.js";
 import QuizModal from "../components/QuizModal.jsx";
 
 const History = () => {
   const [items, setItems] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState("");
   const [selectedQuiz, setSelectedQuiz] = useState(null);
   const [modalOpen, setModalOpen] = useState(false);
 
-  useEffect(() => {
-    const load = async () => {
-      setLoading(true);
-      setError("");
-      try {
-        const data = await fetchQuizzes();
-        setItems(data);
-      } catch (err) {
-        console.error(err);
-        setError("Failed to load history.");
-      } finally {
-        setLoading(false);
-      }
-    };
-    load();
+  const loadPage = useCallback(async (afterId) => {
+    setLoading(true);
+    setError("");
+    try {
+      const data = await fetchQuizzes({ afterId });
+      setItems((prev) => (afterId ? [...prev, ...data.items] : data.items));
+      setNextCursor(data.next_cursor);
+    } catch (err) {
+      console.error(err);
+      setError("Failed to load history.");
+    } finally {
+      setLoading(false);
+    }
   }, []);
 
+  useEffect(() => {
+    loadPage(null);
+  }, [loadPage]);
+
   const openDetail = async (id) => {
     try {
       const data = await fetchQuizDetail(id);
@@ -106,6 +109,17 @@ const History = () => {
           </tbody>
         </table>
       </div>
+      {nextCursor && (
+        <div className="flex justify-center">
+          <button
+            onClick={() => loadPage(nextCursor)}
+            disabled={loading}
+            className="rounded-md bg-slate-800 px-4 py-1.5 text-xs text-slate-100 hover:bg-slate-700 disabled:opacity-50"
+          >
+            {loading ? "Loading..." : "Load more"}
+          </button>
+        </div>
+      )}
 
       <QuizModal
         isOpen={modalOpen}
@@ -0,0 +1,56 @@
+"""Initial schema: articles and quizzes.
+
+This matches what ``Base.metadata.create_all`` produced in the original app,
+before migrations were introduced. Such databases should be stamped with
+``alembic stamp 0001`` and then upgraded.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "articles",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("url", sa.String(length=500), nullable=False),
+        sa.Column("title", sa.String(length=500), nullable=False),
+        sa.Column("summary", sa.Text(), nullable=True),
+        sa.Column("sections", postgresql.JSONB(), nullable=True),
+        sa.Column("entities", postgresql.JSONB(), nullable=True),
+        sa.Column("raw_html", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_articles_id", "articles", ["id"])
+    op.create_index("ix_articles_url", "articles", ["url"], unique=True)
+
+    op.create_table(
+        "quizzes",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("article_id", sa.Integer(), nullable=False),
+        sa.Column("quiz_data", postgresql.JSONB(), nullable=False),
+        sa.Column("related_topics", postgresql.JSONB(), nullable=True),
+        sa.ForeignKeyConstraint(["article_id"], ["articles.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_quizzes_id", "quizzes", ["id"])
+    op.create_index("ix_quizzes_article_id", "quizzes", ["article_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("quizzes")
+    op.drop_table("articles")
@@ -0,0 +1,42 @@
+"""Article aliases: every URL an article was requested under.
+
+Databases created at startup by app versions that already had aliases
+(and were then stamped 0001) have the table; it is only created where
+missing.
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0001a"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("article_aliases"):
+        return
+    op.create_table(
+        "article_aliases",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("alias", sa.String(length=500), nullable=False),
+        sa.Column("article_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["article_id"], ["articles.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_article_aliases_id", "article_aliases", ["id"])
+    op.create_index("ix_article_aliases_alias", "article_aliases", ["alias"], unique=True)
+    op.create_index("ix_article_aliases_article_id", "article_aliases", ["article_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("article_aliases")
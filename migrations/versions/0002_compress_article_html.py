@@ -0,0 +1,114 @@
+"""Store article HTML compressed and out of the default row load.
+
+Adds ``raw_html_compressed`` / ``raw_html_ref``, backfills the compressed
+column from the uncompressed ``raw_html`` column in batches, then drops
+``raw_html``. Existing bodies are always zlib-compressed into the database;
+the storage settings only apply to articles written afterwards.
+
+The codecs are copied from ``app.services.html_store`` as of this revision,
+so replaying it does not depend on later application code or settings.
+Downgrading reads disk-stored bodies from ``-x html_blob_dir=...`` (default
+``data/html``).
+
+Revision ID: 0002
+Revises: 0001a
+Create Date: 2026-10-18
+
+"""
+import zlib
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 200
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _compress(html: str) -> bytes:
+    return zlib.compress(html.encode("utf-8"), 6)
+
+
+def _decompress(blob: bytes) -> str:
+    if blob.startswith(_ZSTD_MAGIC):
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress(blob).decode("utf-8")
+    return zlib.decompress(blob).decode("utf-8")
+
+
+def _load(blob: Optional[bytes], ref: Optional[str], blob_dir: Path) -> str:
+    if ref:
+        return _decompress((blob_dir / ref[:2] / ref).read_bytes())
+    if blob is None:
+        return ""
+    return _decompress(blob)
+
+
+def _require_online() -> None:
+    # Compression happens in Python, so this revision cannot be rendered as plain SQL.
+    if op.get_context().as_sql:
+        raise RuntimeError("Revision 0002 rewrites article bodies and must be run online.")
+
+
+def upgrade() -> None:
+    _require_online()
+    op.add_column("articles", sa.Column("raw_html_compressed", sa.LargeBinary(), nullable=True))
+    op.add_column("articles", sa.Column("raw_html_ref", sa.String(length=64), nullable=True))
+
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text(
+                "SELECT id, raw_html FROM articles WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        for article_id, raw_html in rows:
+            conn.execute(
+                sa.text("UPDATE articles SET raw_html_compressed = :blob WHERE id = :id"),
+                {"blob": _compress(raw_html or ""), "id": article_id},
+            )
+        last_id = rows[-1][0]
+
+    op.drop_column("articles", "raw_html")
+
+
+def downgrade() -> None:
+    _require_online()
+    op.add_column("articles", sa.Column("raw_html", sa.Text(), nullable=True))
+
+    blob_dir = Path(context.get_x_argument(as_dictionary=True).get("html_blob_dir", "data/html"))
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text(
+                "SELECT id, raw_html_compressed, raw_html_ref FROM articles "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        for article_id, blob, ref in rows:
+            conn.execute(
+                sa.text("UPDATE articles SET raw_html = :html WHERE id = :id"),
+                {"html": _load(blob, ref, blob_dir), "id": article_id},
+            )
+        last_id = rows[-1][0]
+
+    op.alter_column("articles", "raw_html", nullable=False)
+    op.drop_column("articles", "raw_html_ref")
+    op.drop_column("articles", "raw_html_compressed")
@@ -0,0 +1,31 @@
+"""Indexes backing the paginated, filtered history listing.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_articles_created_at", "articles", ["created_at"])
+    op.create_index(
+        "ix_articles_title_lower_prefix",
+        "articles",
+        [sa.text("lower(title) text_pattern_ops")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_articles_title_lower_prefix", table_name="articles")
+    op.drop_index("ix_articles_created_at", table_name="articles")
@@ -0,0 +1,35 @@
+"""Track the MediaWiki revision and content hash of articles and quizzes.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows keep NULLs: their first refresh hashes the stored
+    # summary/sections instead, so they are not regenerated needlessly.
+    op.add_column("articles", sa.Column("revision_id", sa.BigInteger(), nullable=True))
+    op.add_column("articles", sa.Column("content_hash", sa.String(length=64), nullable=True))
+    op.add_column("articles", sa.Column("checked_at", sa.DateTime(), nullable=True))
+    op.add_column("quizzes", sa.Column("revision_id", sa.BigInteger(), nullable=True))
+    op.add_column("quizzes", sa.Column("content_hash", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("quizzes", "content_hash")
+    op.drop_column("quizzes", "revision_id")
+    op.drop_column("articles", "checked_at")
+    op.drop_column("articles", "content_hash")
+    op.drop_column("articles", "revision_id")
@@ -0,0 +1,27 @@
+"""Group generation jobs queued by one batch request.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("generation_jobs", sa.Column("batch_id", sa.String(length=32), nullable=True))
+    op.create_index("ix_generation_jobs_batch_id", "generation_jobs", ["batch_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_generation_jobs_batch_id", table_name="generation_jobs")
+    op.drop_column("generation_jobs", "batch_id")
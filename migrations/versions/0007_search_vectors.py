@@ -0,0 +1,60 @@
+"""Generated tsvector columns and GIN indexes for full-text search.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+
+Adding a stored generated column rewrites the table, so expect this to take
+a while (and hold an exclusive lock) on large databases.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "articles",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(summary, '')), 'B')",
+                persisted=True,
+            ),
+        ),
+    )
+    op.add_column(
+        "quizzes",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', "
+                "jsonb_path_query_array(quiz_data, '$.questions[*].question')), 'C')",
+                persisted=True,
+            ),
+        ),
+    )
+    op.create_index(
+        "ix_articles_search_vector", "articles", ["search_vector"], postgresql_using="gin"
+    )
+    op.create_index(
+        "ix_quizzes_search_vector", "quizzes", ["search_vector"], postgresql_using="gin"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_quizzes_search_vector", table_name="quizzes")
+    op.drop_index("ix_articles_search_vector", table_name="articles")
+    op.drop_column("quizzes", "search_vector")
+    op.drop_column("articles", "search_vector")
@@ -0,0 +1,79 @@
+"""Normalized question bank, backfilled from existing quizzes.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mirrors services.question_bank: the text hash is the SHA-256 of the
+# lower-cased question with whitespace collapsed, unknown difficulties count
+# as "medium", and the oldest quiz asking a question is its source.
+BACKFILL = r"""
+INSERT INTO questions (
+    article_id, quiz_id, difficulty, text_hash, question, options, correct_answer,
+    explanation, created_at
+)
+SELECT
+    quizzes.article_id,
+    quizzes.id,
+    CASE
+        WHEN lower(btrim(item ->> 'difficulty')) IN ('easy', 'medium', 'hard')
+        THEN lower(btrim(item ->> 'difficulty'))
+        ELSE 'medium'
+    END,
+    encode(
+        sha256(convert_to(lower(btrim(regexp_replace(item ->> 'question', '\s+', ' ', 'g'))), 'UTF8')),
+        'hex'
+    ),
+    item ->> 'question',
+    (SELECT jsonb_agg(option ->> 'text') FROM jsonb_array_elements(item -> 'options') AS option),
+    item ->> 'correct_answer',
+    item ->> 'explanation',
+    now()
+FROM quizzes
+CROSS JOIN LATERAL jsonb_array_elements(quizzes.quiz_data -> 'questions') WITH ORDINALITY AS q(item, position)
+WHERE btrim(coalesce(item ->> 'question', '')) <> ''
+  AND item ->> 'correct_answer' IS NOT NULL
+  AND jsonb_typeof(item -> 'options') = 'array'
+  AND jsonb_array_length(item -> 'options') > 0
+ORDER BY quizzes.id, q.position
+ON CONFLICT (article_id, text_hash) DO NOTHING
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "questions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("article_id", sa.Integer(), nullable=False),
+        sa.Column("quiz_id", sa.Integer(), nullable=True),
+        sa.Column("difficulty", sa.String(length=16), nullable=False),
+        sa.Column("text_hash", sa.String(length=64), nullable=False),
+        sa.Column("question", sa.Text(), nullable=False),
+        sa.Column("options", postgresql.JSONB(), nullable=False),
+        sa.Column("correct_answer", sa.Text(), nullable=False),
+        sa.Column("explanation", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["article_id"], ["articles.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["quiz_id"], ["quizzes.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("article_id", "text_hash", name="uq_questions_article_text_hash"),
+    )
+    op.create_index("ix_questions_quiz_id", "questions", ["quiz_id"])
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    op.drop_table("questions")
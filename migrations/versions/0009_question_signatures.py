@@ -0,0 +1,27 @@
+"""MinHash signatures of banked questions, for near-duplicate detection.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows stay NULL; their signatures are computed from the question
+    # and answer when their article's index is first loaded.
+    op.add_column("questions", sa.Column("signature", sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("questions", "signature")
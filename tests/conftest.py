@@ -0,0 +1,5 @@
+import os
+
+# Settings are read at import; the tests only ever use the fake LLM backend.
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("LLM_PROVIDER", "fake")
@@ -0,0 +1,124 @@
+"""Hedging, failover and demotion of LLM backends, on fake providers."""
+import asyncio
+import time
+
+import pytest
+
+from app.services import llm_service
+from app.services.llm_service import (
+    COMBINED_PROMPT,
+    DEMOTE_AFTER_FAILURES,
+    PROVIDER_COOLDOWN_SECONDS,
+    _accept_combined,
+    _ainvoke,
+    chain_registry,
+    provider_pool,
+    settings,
+)
+from app.services.metrics import LLM_CALLS, LLM_HEDGES
+
+ARTICLE = {"title": "Alan Turing", "summary": "An English mathematician."}
+SLOW = "fake?latency_seconds=2"
+FAST = "fake?latency_seconds=0.01"
+FAILING = "fake?latency_seconds=0.01&failure_probability=1"
+
+
+@pytest.fixture
+def providers(monkeypatch):
+    """Configure ``LLM_PROVIDERS`` for one test, with fresh clients and pool state."""
+
+    def configure(*specs: str, hedge_delay: float = 10.0) -> None:
+        monkeypatch.setattr(settings, "LLM_PROVIDERS", ",".join(specs))
+        monkeypatch.setattr(settings, "LLM_HEDGE_INITIAL_DELAY_SECONDS", hedge_delay)
+        chain_registry.clear()
+        provider_pool.reset()
+
+    yield configure
+    chain_registry.clear()
+    provider_pool.reset()
+
+
+def invoke():
+    return asyncio.run(_ainvoke("combined", COMBINED_PROMPT, ARTICLE, accept=_accept_combined))
+
+
+def count(metric, **labels) -> float:
+    return metric.value(chain="combined", **labels)
+
+
+def test_backup_wins_when_primary_misses_hedge_deadline(providers):
+    providers(SLOW, FAST, hedge_delay=0.05)
+    hedges, won = count(LLM_HEDGES, event="hedge"), count(LLM_HEDGES, event="backup_won")
+    cancelled = count(LLM_CALLS, outcome="cancelled")
+
+    started = time.monotonic()
+    output = invoke()
+
+    assert time.monotonic() - started < 1.0
+    assert _accept_combined(output)
+    assert count(LLM_HEDGES, event="hedge") == hedges + 1
+    assert count(LLM_HEDGES, event="backup_won") == won + 1
+    # The slow primary is cancelled once the backup has answered.
+    assert count(LLM_CALLS, outcome="cancelled") == cancelled + 1
+
+
+def test_no_hedge_when_primary_answers_in_time(providers):
+    providers(FAST, SLOW, hedge_delay=1.0)
+    hedges, ok = count(LLM_HEDGES, event="hedge"), count(LLM_CALLS, outcome="ok")
+
+    assert _accept_combined(invoke())
+    assert count(LLM_HEDGES, event="hedge") == hedges
+    assert count(LLM_CALLS, outcome="ok") == ok + 1
+
+
+def test_failover_on_error_without_waiting_for_deadline(providers):
+    providers(FAILING, FAST, hedge_delay=10.0)
+    failovers, errors = count(LLM_HEDGES, event="failover"), count(LLM_CALLS, outcome="error")
+
+    started = time.monotonic()
+    output = invoke()
+
+    assert time.monotonic() - started < 1.0
+    assert _accept_combined(output)
+    assert count(LLM_HEDGES, event="failover") == failovers + 1
+    assert count(LLM_CALLS, outcome="error") == errors + 1
+
+
+def test_error_raised_when_every_backend_fails(providers):
+    providers(FAILING, FAILING)
+    with pytest.raises(Exception, match="Injected failure"):
+        invoke()
+
+
+def test_failing_backend_is_demoted_then_tried_first_again(providers):
+    providers(FAILING, FAST)
+    assert provider_pool.order() == ["fake", "fake#2"]
+
+    for _ in range(DEMOTE_AFTER_FAILURES):
+        invoke()
+    assert provider_pool.order() == ["fake#2", "fake"]
+
+    # While demoted the failing backend is not called at all.
+    errors = count(LLM_CALLS, outcome="error")
+    invoke()
+    assert count(LLM_CALLS, outcome="error") == errors
+
+
+def test_demotion_ends_after_cooldown(providers, monkeypatch):
+    providers(FAST, FAST)
+    for _ in range(DEMOTE_AFTER_FAILURES):
+        provider_pool.record_failure("fake")
+    assert provider_pool.order() == ["fake#2", "fake"]
+
+    now = time.monotonic()
+    monkeypatch.setattr(llm_service.time, "monotonic", lambda: now + PROVIDER_COOLDOWN_SECONDS + 1)
+    assert provider_pool.order() == ["fake", "fake#2"]
+
+
+def test_success_clears_failures(providers):
+    providers(FAST, FAST)
+    for _ in range(DEMOTE_AFTER_FAILURES - 1):
+        provider_pool.record_failure("fake")
+    provider_pool.record_success("fake")
+    provider_pool.record_failure("fake")
+    assert provider_pool.order() == ["fake", "fake#2"]